@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+# =========================
+# 1. 시계열 행렬 만들기
+# =========================
+# 계열(행) × 연도(열) 행렬로 바꿔 모든 계열의 지표를 한 번에 계산한다
+GROWTH_WINDOW = 5
+
+
+def series_matrix(df, keys, time_col, measure):
+    """long 형식 → (계열 키 DataFrame, 연도 배열, 값 행렬). 없는 연도는 NaN."""
+    wide = df.pivot_table(index=list(keys), columns=time_col, values=measure, aggfunc="sum", observed=True)
+    wide = wide.sort_index(axis=1)
+    return wide.index.to_frame(index=False), wide.columns.to_numpy(dtype=float), wide.to_numpy(dtype=float)
+
+
+# =========================
+# 2. 지표 계산 (행 단위 벡터 연산)
+# =========================
+def first_last(values):
+    # 각 행에서 처음·마지막으로 값이 있는 열 위치 (값이 하나도 없으면 -1)
+    present = ~np.isnan(values)
+    has_any = present.any(axis=1)
+    first = np.where(has_any, present.argmax(axis=1), -1)
+    last = np.where(has_any, values.shape[1] - 1 - present[:, ::-1].argmax(axis=1), -1)
+    return first, last
+
+
+def cagr(years, values):
+    # 연평균 성장률(%): 처음 값 → 마지막 값
+    first, last = first_last(values)
+    rows = np.arange(len(values))
+    start = values[rows, first]
+    end = values[rows, last]
+    span = years[last] - years[first]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = (np.power(end / start, 1 / span) - 1) * 100
+    return np.where((first >= 0) & (span > 0) & (start > 0), rate, np.nan)
+
+
+def window_growth(values, window=GROWTH_WINDOW):
+    # 최근 window개 연도의 처음 대비 마지막 증가율(%) (tail(window)와 같은 구간)
+    window = min(window, values.shape[1])
+    start = values[:, -window]
+    end = values[:, -1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = (end - start) / start * 100
+    return np.where(start != 0, growth, np.nan)
+
+
+def linear_trend(years, values):
+    # 결측을 뺀 최소제곱 직선: (연간 기울기, 절편)
+    present = ~np.isnan(values)
+    x = np.broadcast_to(years, values.shape)
+    n = present.sum(axis=1)
+    y = np.where(present, values, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_x = np.where(present, x, 0.0).sum(axis=1) / n
+        mean_y = y.sum(axis=1) / n
+        dx = np.where(present, x - mean_x[:, None], 0.0)
+        slope = (dx * (y - mean_y[:, None])).sum(axis=1) / (dx ** 2).sum(axis=1)
+    slope = np.where(n >= 2, slope, np.nan)
+    return slope, mean_y - slope * mean_x
+
+
+def trend_stats(years, values, window=GROWTH_WINDOW, horizon=1):
+    """CAGR, 최근 window년 증가율, 연간 기울기, horizon년 뒤 예측값을 계열별로 계산."""
+    slope, intercept = linear_trend(years, values)
+    target = years[-1] + horizon if len(years) else np.nan
+    _, last = first_last(values)
+    return pd.DataFrame({
+        "최근값": values[np.arange(len(values)), last],
+        "CAGR(%)": cagr(years, values),
+        f"최근{window}년 증가율(%)": window_growth(values, window),
+        "연간 기울기": slope,
+        f"{int(target) if len(years) else ''}년 예측": intercept + slope * target,
+    })
+
+
+def trend_table(df, keys, time_col, measure, window=GROWTH_WINDOW, horizon=1):
+    labels, years, values = series_matrix(df, keys, time_col, measure)
+    return pd.concat([labels, trend_stats(years, values, window, horizon)], axis=1)
+
+
+# =========================
+# 3. 상·하위 k개 (argpartition)
+# =========================
+def top_k_indices(values, k, largest=True):
+    """정렬 없이 argpartition으로 k개를 고른 뒤 그 k개만 정렬한다. NaN은 제외."""
+    values = np.asarray(values, dtype=float)
+    valid = np.flatnonzero(~np.isnan(values))
+    k = min(k, len(valid))
+    if k == 0:
+        return valid[:0]
+    keyed = -values[valid] if largest else values[valid]
+    if k < len(valid):
+        part = np.argpartition(keyed, k - 1)[:k]
+    else:
+        part = np.arange(len(valid))
+    return valid[part[np.argsort(keyed[part], kind="stable")]]
+
+
+def top_k(table, column, k=10, largest=True):
+    return table.iloc[top_k_indices(table[column].to_numpy(dtype=float), k, largest)].reset_index(drop=True)
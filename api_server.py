@@ -0,0 +1,301 @@
+"""final_project.py의 KPI·집계를 읽기 전용 JSON API로 제공한다.
+
+    # 표준 라이브러리 서버 (요청마다 스레드)
+    python api_server.py --port 8600
+
+    # ASGI 서버 (uvicorn 등): 모듈의 app을 사용
+    uvicorn api_server:app --port 8600
+
+    GET /api/kpis                총 진료인원 · 최다 질환 · 평균 등록률 · 예산 비중 · 기간
+    GET /api/trend               연도별 진료실인원
+    GET /api/regions?k=5         최신 연도 등록률 상·하위 k개 자치구
+    GET /api/datasets            데이터셋별 버전
+
+응답은 대시보드와 같은 집계 함수(project_charts.py)로 만들고, ETag는 응답에 쓰인 데이터셋 버전으로 정한다.
+If-None-Match가 같으면 304를 돌려주므로 자주 폴링해도 파일 상태 확인 비용만 든다.
+"""
+import os
+import sys
+import json
+import math
+import asyncio
+import hashlib
+import logging
+import argparse
+import threading
+from urllib.parse import parse_qs, urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from cache_utils import LRUCache
+from data_store import get_registry
+from project_charts import DATA_PATH, DATASETS, RATE_COL, ProjectData
+from refresh import RefreshService
+
+logger = logging.getLogger(__name__)
+
+
+# =========================
+# 1. JSON 변환
+# =========================
+def to_json_value(value):
+    # numpy 스칼라 → 파이썬 값, NaN → null
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def records(df):
+    return [{col: to_json_value(v) for col, v in row.items()} for row in df.to_dict("records")]
+
+
+# =========================
+# 2. 엔드포인트 (경로 → 사용 데이터셋, 응답 함수(ProjectData, 파라미터))
+# =========================
+def kpis(data, params):
+    kpi = data.overview
+    return {
+        "기간": [to_json_value(kpi["min_year"]), to_json_value(kpi["max_year"])],
+        "총 진료인원(명)": to_json_value(kpi["total_patients"]),
+        "최다 질환": to_json_value(kpi["top_disease"]),
+        "평균 등록률(%)": to_json_value(kpi["avg_reg_rate"]),
+        "정신건강증진 예산 비중(%)": to_json_value(kpi["mental_budget_ratio"]),
+    }
+
+
+def trend(data, params):
+    return records(data.group_trend)
+
+
+def regions(data, params):
+    region = data.region
+    year = region.latest_year(RATE_COL)
+    k = params["k"]
+    columns = ["지역코드", "지역명", RATE_COL]
+    return {
+        "연도": year,
+        "상위": records(region.top(RATE_COL, k, year)[columns].rename(columns={RATE_COL: "등록률"})),
+        "하위": records(region.bottom(RATE_COL, k, year)[columns].rename(columns={RATE_COL: "등록률"})),
+    }
+
+
+def datasets(data, params):
+    return {name: data.registry.version(name) for name in DATASETS}
+
+
+ENDPOINTS = {
+    "/api/kpis": (["상병그룹", "진료정보", "등록관리율", "예산"], kpis),
+    "/api/trend": (["상병그룹"], trend),
+    "/api/regions": (["등록관리율", "기관현황", "예산", "주관적건강"], regions),
+    "/api/datasets": (DATASETS, datasets),
+}
+
+
+def parse_params(path, query):
+    # 엔드포인트별 쿼리 파라미터 검증 (잘못된 값은 ValueError → 400)
+    params = {}
+    if path == "/api/regions":
+        k = query.get("k", ["5"])[0]
+        if not k.isdigit() or not 1 <= int(k) <= 25:
+            raise ValueError("k는 1~25 사이여야 합니다.")
+        params["k"] = int(k)
+    return params
+
+
+# =========================
+# 3. 요청 처리 (서버 종류와 무관)
+# =========================
+class DashboardAPI:
+    """경로·쿼리 → (상태 코드, 헤더, 본문). 응답 본문은 (경로, 파라미터, 데이터 버전) 키로 LRU 캐시한다."""
+
+    def __init__(self, registry=None, backend_name="pandas", data_path=DATA_PATH, max_entries=256):
+        self.backend_name = backend_name
+        self.data_path = data_path
+        self.data = ProjectData(registry, backend_name, data_path)
+        self.registry = self.data.registry
+        self.cache = LRUCache(max_entries=max_entries, sizeof=len)
+        self._data_version = self.registry.fingerprint(DATASETS)
+        self._lock = threading.Lock()
+
+    def project_data(self):
+        # 데이터셋 버전이 바뀌면 큐브·지역 차원·집계를 새로 만든다 (레지스트리 프레임은 공유)
+        version = self.registry.fingerprint(DATASETS)
+        with self._lock:
+            if version != self._data_version:
+                self.data = ProjectData(self.registry, self.backend_name, self.data_path)
+                self._data_version = version
+            return self.data
+
+    @staticmethod
+    def etag(path, params, version):
+        digest = hashlib.sha256(json.dumps([path, params, version], ensure_ascii=False).encode()).hexdigest()
+        return f'"{digest[:20]}"'
+
+    @staticmethod
+    def not_modified(if_none_match, etag):
+        if not if_none_match:
+            return False
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+
+    @staticmethod
+    def json_response(status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        return status, {"Content-Type": "application/json; charset=utf-8", **(headers or {})}, body
+
+    def handle(self, method, target, if_none_match=None):
+        if method not in ("GET", "HEAD"):
+            return self.json_response(405, {"error": "GET만 지원합니다."}, {"Allow": "GET, HEAD"})
+        url = urlsplit(target)
+        path = url.path.rstrip("/")
+        endpoint = ENDPOINTS.get(path)
+        if endpoint is None:
+            return self.json_response(404, {"error": "없는 경로입니다.", "paths": list(ENDPOINTS)})
+        try:
+            params = parse_params(path, parse_qs(url.query))
+        except ValueError as e:
+            return self.json_response(400, {"error": str(e)})
+
+        datasets_used, build = endpoint
+        version = self.registry.fingerprint(datasets_used)
+        etag = self.etag(path, params, version)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if self.not_modified(if_none_match, etag):
+            return 304, headers, b""
+
+        key = (path, tuple(sorted(params.items())), version)
+        body = self.cache.get(key)
+        if body is None:
+            try:
+                payload = build(self.project_data(), params)
+            except Exception as e:
+                logger.exception("%s 처리 실패", path)
+                return self.json_response(500, {"error": f"{type(e).__name__}: {e}"})
+            body = json.dumps({"data": payload, "version": dict(version)}, ensure_ascii=False).encode("utf-8")
+            self.cache.put(key, body)
+        return 200, {"Content-Type": "application/json; charset=utf-8", **headers}, body
+
+
+# =========================
+# 4. 표준 라이브러리 서버
+# =========================
+def make_handler(api, quiet=True):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def respond(self, method):
+            status, headers, body = api.handle(method, self.path, self.headers.get("If-None-Match"))
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if method != "HEAD":
+                self.wfile.write(body)
+
+        def do_GET(self):
+            self.respond("GET")
+
+        def do_HEAD(self):
+            self.respond("HEAD")
+
+        def do_POST(self):
+            self.respond("POST")
+
+        def log_message(self, format, *args):
+            if not quiet:
+                super().log_message(format, *args)
+
+    return Handler
+
+
+# =========================
+# 5. ASGI 앱 (uvicorn api_server:app)
+# =========================
+class ASGIApp:
+    """첫 요청 때 DashboardAPI를 만들고, 집계는 스레드에서 돌려 이벤트 루프를 막지 않는다."""
+
+    def __init__(self, factory):
+        self.factory = factory
+        self._api = None
+        self._lock = threading.Lock()
+
+    @property
+    def api(self):
+        with self._lock:
+            if self._api is None:
+                self._api = self.factory()
+            return self._api
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope["headers"]}
+        target = scope["path"] + ("?" + scope["query_string"].decode() if scope.get("query_string") else "")
+        status, response_headers, body = await asyncio.to_thread(
+            self.api.handle, scope["method"], target, headers.get("if-none-match")
+        )
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(k.lower().encode(), v.encode()) for k, v in response_headers.items()]
+                       + [(b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else body})
+
+
+def create_api():
+    api = DashboardAPI(get_registry(), os.environ.get("DASHBOARD_BACKEND", "pandas"))
+    # cleaned/ 변경은 대시보드와 같은 방식으로 반영 (바뀐 데이터셋의 버전 → ETag가 달라짐)
+    RefreshService(api.registry).start()
+    return api
+
+
+app = ASGIApp(create_api)
+
+
+# =========================
+# 6. 실행
+# =========================
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="대시보드 KPI·집계 JSON API (읽기 전용)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--backend", choices=["pandas", "duckdb"], default=os.environ.get("DASHBOARD_BACKEND", "pandas"))
+    parser.add_argument("--cache-entries", type=int, default=256, help="응답 캐시 최대 항목 수")
+    parser.add_argument("--verbose", action="store_true", help="요청 로그 출력")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    api = DashboardAPI(get_registry(), args.backend, max_entries=args.cache_entries)
+    RefreshService(api.registry).start()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(api, quiet=not args.verbose))
+    server.daemon_threads = True
+    print(f"API: http://{args.host}:{args.port}/api/kpis", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,421 @@
+"""합성 데이터로 로드·집계·차트 생성 시간과 최대 메모리를 측정한다.
+
+    python benchmark.py                          # 1×, 10× 배율
+    python benchmark.py --scales 1 10 100 1000   # 큰 배율까지
+    python benchmark.py --out bench.json --compare baseline.json   # 기준 대비 느려진 항목 확인
+
+결과는 JSON(환경 정보 + 항목별 중앙값 시간·최대 메모리)으로 저장한다.
+메모리: peak_mb는 tracemalloc(파이썬 할당만), rss_peak_mb는 상주 메모리 증가분(Arrow·DuckDB 할당 포함),
+arrow_peak_mb는 Arrow 메모리 풀의 최대 사용량.
+"""
+import gc
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import threading
+import tracemalloc
+import subprocess
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+import perf
+from data_store import DatasetRegistry, concat_rows, pa
+from rollup import index_levels
+
+# =========================
+# 1. 합성 데이터 (cleaned/ 스키마와 동일한 컬럼)
+# =========================
+DISEASE_CODES = ["F00-F09", "F10-F19", "F20-F29", "F30-F39", "F40-F48", "F50-F59",
+                 "F60-F69", "F70-F79", "F80-F89", "F90-F98", "F99"]
+AGES = ["0-4세", "5-9세", "10-14세", "15-19세", "20-24세", "25-29세", "30-34세",
+        "35-39세", "40-44세", "45-49세", "50-54세", "55-59세", "60-64세", "65세 이상"]
+ORG_COLUMNS = [
+    "광역정신건강복지센터 수", "기초정신건강복지센터 수", "중독관리통합지원센터 수", "주간재활시설 수",
+    "공동생활가정 수", "지역사회전환시설 수", "직업재활시설 수", "아동청소년정신건강지원시설 수",
+    "중독자재활시설 수", "종합시설 수",
+]
+ALCOHOL_AGES = ["20세-29세", "30세-39세", "40세-49세", "50세-59세", "60세-69세", "70세이상"]
+
+# 1× 기준 크기 (실제 cleaned/ 데이터와 비슷한 규모)
+BASE_GROUP_ROWS = 7_500
+BASE_DISEASES = 50
+BASE_DISTRICTS = 25
+MONTHS = pd.period_range("2010-01", "2022-12", freq="M").strftime("%Y%m")
+
+
+def regions(scale):
+    count = BASE_DISTRICTS * scale
+    codes = ["C01"] + [f"D{i:0{len(str(count))}d}" for i in range(1, count + 1)]
+    names = ["서울시"] + [f"구{i}" for i in range(1, count + 1)]
+    return codes, names
+
+
+def region_frame(years, scale):
+    codes, names = regions(scale)
+    frame = pd.DataFrame({
+        "연도": np.repeat(years, len(codes)),
+        "지역코드": np.tile(codes, len(years)),
+        "지역명": np.tile(names, len(years)),
+    })
+    return frame
+
+
+def make_group(rng, scale):
+    n = BASE_GROUP_ROWS * scale
+    return pd.DataFrame({
+        "주상병코드": rng.choice(DISEASE_CODES, n),
+        "진료년도": rng.choice([f"{y}년" for y in range(2010, 2022)], n),
+        "가입자구분": rng.choice(["지역", "직장"], n),
+        "성별": rng.choice(["남자", "여자"], n),
+        "연령": rng.choice(AGES, n),
+        "진료실인원(명)": rng.integers(1, 50_000, n),
+        "진료건수(건)": rng.integers(1, 200_000, n),
+        "총진료비(천원)": rng.integers(1, 5_000_000, n),
+    })
+
+
+def make_treatment(rng, scale):
+    diseases = BASE_DISEASES * scale
+    return pd.DataFrame({
+        "주상병코드": np.repeat([DISEASE_CODES[i % len(DISEASE_CODES)] for i in range(diseases)], len(MONTHS)),
+        "주상병명": np.repeat([f"질환{i}" for i in range(diseases)], len(MONTHS)),
+        "진료년월": np.tile(MONTHS, diseases),
+        "진료인원(명)": rng.integers(0, 50_000, diseases * len(MONTHS)),
+    })
+
+
+def make_registration(rng, scale):
+    frame = region_frame(range(2009, 2025), scale)
+    population = rng.integers(100_000, 700_000, len(frame))
+    estimated = population // 100
+    registered = (estimated * rng.uniform(0.02, 0.2, len(frame))).astype(int)
+    return frame.assign(**{
+        "주민등록인구": population,
+        "추계중증정신질환자수": estimated,
+        "정신건강복지센터 등록  중증정신질환자수": registered,
+        "추계중증정신질환자수 대비 정신건강복지센터 등록 중증정신질환자": (registered / estimated * 100).round(1),
+    })
+
+
+def make_institutions(rng, scale):
+    frame = region_frame(range(2017, 2025), scale)
+    counts = {col: rng.integers(0, 3, len(frame)) for col in ORG_COLUMNS}
+    return frame.assign(합계=sum(counts.values()), **counts)
+
+
+def make_budget(rng, scale):
+    frame = region_frame(range(2005, 2026), scale)
+    total = rng.integers(10_000_000, 50_000_000, len(frame))
+    health = total // 70
+    mental = (health * rng.uniform(0.1, 0.2, len(frame))).astype(int)
+    return frame.assign(**{
+        "서울시예산": total, "보건 예산": health, "정신건강증진 예산": mental,
+        "보건 예산 대비 정신건강증진 예산 비중": (mental / health * 100).round(1),
+    })
+
+
+def make_health(rng, scale):
+    frame = region_frame(range(2013, 2026, 2), scale)
+    good = rng.uniform(50, 70, len(frame)).round(1)
+    normal = rng.uniform(20, 35, len(frame)).round(1)
+    return frame.assign(좋은편=good, 보통=normal, 좋지않은편=(100 - good - normal).round(1), **{"모름/무응답": 0})
+
+
+def make_alcohol(rng, scale):
+    years = np.arange(2005, 2005 + 20 * scale)
+    deaths = rng.integers(900, 1200, len(years)).astype(float)
+    frame = pd.DataFrame({"연도": np.repeat(years, 2), "구분": np.tile(["사망자수", "비율"], len(years))})
+    frame["계"] = np.where(frame["구분"] == "사망자수", np.repeat(deaths, 2), 100.0)
+    for col in ALCOHOL_AGES:
+        frame[col] = rng.uniform(1, 30, len(frame)).round(2)
+    return frame
+
+
+GENERATORS = {
+    "상병그룹": make_group,
+    "진료정보": make_treatment,
+    "등록관리율": make_registration,
+    "기관현황": make_institutions,
+    "예산": make_budget,
+    "주관적건강": make_health,
+    "알코올사망": make_alcohol,
+}
+
+# 업로드 대시보드 5개 시트 (1× 행 수)
+EXCEL_MAX_ROWS = 1_048_575
+
+
+def make_workbook(rng, scale):
+    def rows(base):
+        return min(base * scale, EXCEL_MAX_ROWS)
+
+    days = pd.date_range("2000-01-01", periods=rows(365), freq="D")
+    months = pd.date_range("2000-01-01", periods=rows(12), freq="MS")
+    sheets = {
+        "바차트_히스토그램": pd.DataFrame({"월": months, "총 매출": rng.integers(1_000, 100_000, len(months))}),
+        "시계열차트": pd.DataFrame({"일자": days, "값": rng.normal(100, 15, len(days)).round(2)}),
+        "파이차트": pd.DataFrame({"항목": [f"항목{i}" for i in range(rows(10))], "비율": rng.integers(1, 100, rows(10))}),
+        "산점도": pd.DataFrame({"x": rng.normal(0, 1, rows(200)), "y": rng.normal(0, 1, rows(200))}),
+        "파레토차트": pd.DataFrame({
+            "품목": [f"SKU{i}" for i in range(rows(1_000))], "값": rng.pareto(1.2, rows(1_000)).round(3)
+        }),
+    }
+    buffer = BytesIO()
+    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+        for name, df in sheets.items():
+            df.to_excel(writer, sheet_name=name, index=False)
+    return buffer.getvalue()
+
+
+def write_dataset(folder, scale, seed=0):
+    rng = np.random.default_rng(seed)
+    os.makedirs(folder, exist_ok=True)
+    for name, make in GENERATORS.items():
+        make(rng, scale).to_csv(os.path.join(folder, name + ".csv"), index=False, encoding="utf-8-sig")
+    path = os.path.join(folder, "workbook.xlsx")
+    with open(path, "wb") as f:
+        f.write(make_workbook(rng, scale))
+    return path
+
+
+# =========================
+# 2. 측정 (시간 중앙값 + tracemalloc 최대 메모리 + RSS 최대 증가분)
+# =========================
+class RSSPeak:
+    """실행 중 상주 메모리(RSS)와 Arrow 메모리 풀 사용량을 주기적으로 읽어 시작 대비 최대 증가분을 기록한다.
+
+    tracemalloc은 pyarrow·DuckDB가 C++에서 직접 잡는 메모리를 보지 못하므로 함께 기록한다.
+    RSS는 이미 해제된 힙을 재사용하면 실제 사용량보다 작게 나올 수 있다 (Arrow 풀 값은 정확).
+    """
+
+    def __init__(self, interval=0.002):
+        self.interval = interval
+        self._stop = threading.Event()
+
+    def __enter__(self):
+        gc.collect()
+        self.start = self.peak = perf.rss_bytes()
+        self.arrow_start = self.arrow_peak = self._arrow_bytes()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    @staticmethod
+    def _arrow_bytes():
+        return pa.total_allocated_bytes() if pa is not None else 0
+
+    def _read(self):
+        self.peak = max(self.peak, perf.rss_bytes())
+        self.arrow_peak = max(self.arrow_peak, self._arrow_bytes())
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self._read()
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._read()
+
+    @property
+    def delta_mb(self):
+        return (self.peak - self.start) / 1024 / 1024
+
+    @property
+    def arrow_mb(self):
+        return (self.arrow_peak - self.arrow_start) / 1024 / 1024
+
+
+def measure(fn, repeat=3, setup=None):
+    # 시간은 tracemalloc 없이 repeat번 측정, 메모리는 RSS·tracemalloc을 따로 한 번씩 더 실행해 측정
+    times = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        started = time.perf_counter()
+        fn(state) if setup else fn()
+        times.append(time.perf_counter() - started)
+    state = setup() if setup else None
+    with RSSPeak() as rss:
+        fn(state) if setup else fn()
+    state = setup() if setup else None
+    tracemalloc.start()
+    try:
+        result = fn(state) if setup else fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "seconds": float(np.median(times)), "min_seconds": min(times), "runs": repeat,
+        "peak_mb": peak / 1024 / 1024, "rss_peak_mb": rss.delta_mb, "arrow_peak_mb": rss.arrow_mb,
+    }, result
+
+
+class Recorder:
+    def __init__(self, scale, repeat):
+        self.scale = scale
+        self.repeat = repeat
+        self.results = []
+
+    def run(self, name, fn, setup=None, **extra):
+        stats, result = measure(fn, self.repeat, setup)
+        stats.update(name=name, scale=self.scale, **extra)
+        self.results.append(stats)
+        print(f"  {name:<40} {stats['seconds'] * 1000:>10.1f} ms  peak {stats['peak_mb']:>8.1f} MB"
+              f"  rss +{stats['rss_peak_mb']:>8.1f} MB  arrow {stats['arrow_peak_mb']:>8.1f} MB", flush=True)
+        return result
+
+
+def check_update(updated, rebuilt):
+    # 증분 갱신한 큐브의 모든 집계본이 전체 재집계 결과와 값·dtype까지 같은지 확인
+    # (assert_frame_equal은 category 인덱스와 object 인덱스를 같다고 보므로 차원별 dtype은 따로 비교)
+    for dims, cuboid in rebuilt.cuboids.items():
+        result = updated._materialize(dims)
+        pd.testing.assert_frame_equal(result, cuboid, check_categorical=False)
+        index_dtypes = [level.dtype for level in index_levels(result.index)]
+        expected = [level.dtype for level in index_levels(cuboid.index)]
+        assert index_dtypes == expected, f"{dims} 인덱스 dtype 불일치: {index_dtypes} != {expected}"
+
+
+# =========================
+# 3. 벤치마크 항목
+# =========================
+def bench_scale(scale, workdir, repeat):
+    from project_charts import (
+        DATASETS, PROJECT_CHARTS, ProjectData, growth_tables, overview_kpis, region_rankings,
+        register_files, risk_frames, top_disease_trend
+    )
+    from homework_charts import HOMEWORK_CHARTS, parse_workbook
+
+    folder = os.path.join(workdir, f"x{scale}")
+    print(f"[{scale}×] 데이터 생성: {folder}", flush=True)
+    workbook_path = write_dataset(folder, scale)
+    rec = Recorder(scale, repeat)
+
+    # load_csv: 사이드카 없이(첫 로드) / 사이드카 있는 상태(재시작 후 로드)
+    parquet_dir = os.path.join(folder, ".parquet")
+    for name in DATASETS:
+        def fresh_registry():
+            shutil.rmtree(parquet_dir, ignore_errors=True)
+            return register_files(DatasetRegistry(), folder)
+        rec.run(f"load/{name}/cold", lambda registry: registry.get(name), setup=fresh_registry)
+        rec.run(f"load/{name}/warm", lambda registry: registry.get(name),
+                setup=lambda: register_files(DatasetRegistry(), folder))
+
+    # 탭별 집계 (큐브·지역 차원 생성 포함)
+    data = ProjectData(DatasetRegistry(), data_path=folder)
+    for name in DATASETS:
+        data.frame(name)
+    rec.run("build/cube", lambda: type(data.cube).from_frame(data.frame("상병그룹")))
+    rec.run("build/region", lambda: type(data.region).from_registry(data.frame))
+    rec.run("tab/overview", lambda: overview_kpis(data.backend, data.frame("예산")))
+    rec.run("tab/region", lambda: region_rankings(type(data.region).from_registry(data.frame)))
+    rec.run("tab/growth", lambda: growth_tables(data.cube, data.region))
+    rec.run("tab/trend", lambda: top_disease_trend(data.backend))
+    rec.run("tab/risk", lambda: risk_frames(data.frame("알코올사망"), data.frame("주관적건강")))
+    # 증분 갱신: int32 범위를 넘는 값이 더해져도 전체 재집계와 같아야 한다
+    group = data.frame("상병그룹")
+    appended = group.tail(100).assign(**{"총진료비(천원)": 2_000_000_000})
+    cube = rec.run("update/cube", lambda cube: cube.update(appended), setup=lambda: type(data.cube).from_frame(group))
+    check_update(cube, type(data.cube).from_frame(concat_rows(group, appended)))
+    rec.run("filter/cube", lambda: data.cube.rollup(
+        ["주상병코드", "진료년도"], {"성별": ("여자",), "연령": ("20-24세", "25-29세")}, (2015, 2020)
+    ))
+
+    # 차트 생성 / 직렬화 (차트 캐시에 저장되는 JSON)
+    max_points = 2400
+    for chart_id, (_, _, build) in PROJECT_CHARTS.items():
+        fig = rec.run(f"figure/{chart_id}/build", lambda: build(data, max_points))
+        spec = rec.run(f"figure/{chart_id}/to_json", fig.to_json)
+        rec.results[-1]["bytes"] = len(spec)
+
+    # load_excel: 업로드 파일 파싱 + 차트
+    with open(workbook_path, "rb") as f:
+        workbook = f.read()
+    sheets, _ = rec.run("excel/parse", lambda: parse_workbook(workbook, workbook_path), bytes=len(workbook))
+    options = {"line": {"max_points": max_points}, "pie": {"top_k": 20}, "pareto": {"top_k": 20}}
+    for chart_id, builder in HOMEWORK_CHARTS.items():
+        fig = rec.run(f"excel/{chart_id}/build", lambda: builder(sheets, "plotly_dark", **options.get(chart_id, {})))
+        spec = rec.run(f"excel/{chart_id}/to_json", fig.to_json)
+        rec.results[-1]["bytes"] = len(spec)
+    return rec.results
+
+
+# =========================
+# 4. 결과 파일 / 비교
+# =========================
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+    import plotly
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "plotly": plotly.__version__,
+    }
+
+
+def compare(results, baseline_path, threshold):
+    # (항목, 배율)이 같은 기준 결과보다 threshold배 이상 느린 항목
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["name"], r["scale"]): r for r in json.load(f)["results"]}
+    regressions = []
+    for r in results:
+        base = baseline.get((r["name"], r["scale"]))
+        # 1ms 미만 항목은 측정 오차가 커서 제외
+        if base and base["seconds"] >= 0.001 and r["seconds"] > base["seconds"] * threshold:
+            regressions.append({**r, "baseline_seconds": base["seconds"], "ratio": r["seconds"] / base["seconds"]})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="합성 데이터 벤치마크")
+    parser.add_argument("--scales", nargs="+", type=int, default=[1, 10], help="데이터 배율 (예: 1 10 100 1000)")
+    parser.add_argument("--repeat", type=int, default=3, help="항목별 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--out", default="benchmark_results.json")
+    parser.add_argument("--workdir", help="합성 데이터 폴더 (기본: 임시 폴더, 실행 후 삭제)")
+    parser.add_argument("--compare", help="기준 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=1.2, help="기준 대비 이 배수 이상 느리면 회귀로 판단")
+    args = parser.parse_args(argv)
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="dashboard-bench-")
+    try:
+        results = []
+        for scale in args.scales:
+            results.extend(bench_scale(scale, workdir, args.repeat))
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {"environment": environment(), "scales": args.scales, "repeat": args.repeat, "results": results}
+    status = 0
+    if args.compare:
+        report["regressions"] = compare(results, args.compare, args.threshold)
+        for r in report["regressions"]:
+            print(f"⚠️ 회귀: {r['name']} ({r['scale']}×) {r['baseline_seconds'] * 1000:.1f} → "
+                  f"{r['seconds'] * 1000:.1f} ms ({r['ratio']:.2f}배)", file=sys.stderr)
+        status = 1 if report["regressions"] else 0
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"결과 {len(results)}개 → {args.out}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
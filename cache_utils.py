@@ -0,0 +1,94 @@
+import threading
+from collections import OrderedDict
+
+
+# =========================
+# 크기 제한 LRU 캐시
+# =========================
+class LRUCache:
+    """항목 수 또는 바이트 합계가 한도를 넘으면 가장 오래 안 쓴 항목부터 내보내는 캐시.
+
+    여러 세션(스레드)에서 동시에 쓰므로 모든 접근은 잠금 안에서 처리한다.
+    on_evict(key, value)를 주면 내보낸 항목을 디스크 등에 옮길 수 있다.
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None, sizeof=None, on_evict=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or (lambda value: 0)
+        self.on_evict = on_evict
+        self._items = OrderedDict()
+        self._sizes = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        size = self.sizeof(value)
+        with self._lock:
+            if key in self._items:
+                self._bytes -= self._sizes[key]
+            self._items[key] = value
+            self._items.move_to_end(key)
+            self._sizes[key] = size
+            self._bytes += size
+            evicted = self._evict()
+        # 내보낸 항목 처리(디스크 저장 등)는 잠금 밖에서
+        if self.on_evict is not None:
+            for old_key, old_value in evicted:
+                self.on_evict(old_key, old_value)
+
+    def _evict(self):
+        evicted = []
+        # 방금 넣은 항목 하나만 남았다면 한도를 넘어도 유지
+        while len(self._items) > 1 and self._over_limit():
+            old_key, old_value = self._items.popitem(last=False)
+            self._bytes -= self._sizes.pop(old_key)
+            self.evictions += 1
+            evicted.append((old_key, old_value))
+        return evicted
+
+    def _over_limit(self):
+        if self.max_entries is not None and len(self._items) > self.max_entries:
+            return True
+        return self.max_bytes is not None and self._bytes > self.max_bytes
+
+    def pop(self, key, default=None):
+        with self._lock:
+            if key not in self._items:
+                return default
+            self._bytes -= self._sizes.pop(key)
+            return self._items.pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._items),
+            "bytes": self._bytes,
+        }
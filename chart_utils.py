@@ -0,0 +1,237 @@
+import logging
+import importlib
+import numpy as np
+import pandas as pd
+import perf
+from analytics import top_k_indices
+
+logger = logging.getLogger(__name__)
+
+
+class LazyModule:
+    """속성에 처음 접근할 때 import하는 모듈 대리자.
+
+    plotly(express·graph_objects)는 import에 수백 ms가 걸려서, 차트를 처음 그리는 화면에서만 불러온다.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            with perf.span(f"import:{self._name}"):
+                self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+go = LazyModule("plotly.graph_objects")
+
+# =========================
+# 1. 시계열 다운샘플링 (LTTB / min-max)
+# =========================
+# 화면 가로 1px당 2개 점이면 선 모양이 충분히 유지된다
+POINTS_PER_PIXEL = 2
+DEFAULT_CHART_WIDTH = 1200
+
+
+def max_points_for_width(width_px, points_per_pixel=POINTS_PER_PIXEL):
+    return max(int(width_px * points_per_pixel), 3)
+
+
+def x_to_numeric(values):
+    # LTTB 면적 계산용 숫자 x (날짜 → ns, '202001'/'2020-01' 문자열 → 날짜, 그 외 → 순번)
+    s = pd.Series(values).reset_index(drop=True)
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return s.astype("int64").to_numpy(dtype=float)
+    if pd.api.types.is_numeric_dtype(s):
+        return s.to_numpy(dtype=float)
+    text = s.astype(str)
+    for fmt in ("%Y%m", "%Y-%m", "ISO8601"):
+        parsed = pd.to_datetime(text, format=fmt, errors="coerce")
+        if parsed.notna().all():
+            return parsed.astype("int64").to_numpy(dtype=float)
+    return np.arange(len(s), dtype=float)
+
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets로 남길 점의 위치를 고른다 (x는 오름차순).
+
+    버킷 평균은 한 번에 계산하고, 반복은 버킷 수(n_out)만큼만 돈다.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # 첫 점과 마지막 점을 뺀 구간을 n_out-2개 버킷으로 나눔
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(y[:n - 1], edges[:-1]) / counts
+    # 마지막 버킷의 "다음 버킷 평균"은 마지막 점
+    mean_x = np.append(mean_x[1:], x[-1])
+    mean_y = np.append(mean_y[1:], y[-1])
+
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[a] - mean_x[i]) * (y[lo:hi] - y[a])
+            - (x[a] - x[lo:hi]) * (mean_y[i] - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y, n_out):
+    # 버킷마다 최솟값·최댓값 위치만 남긴다 (반복문 없이 reshape로 처리)
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+    y = np.asarray(y, dtype=float)
+    size = int(np.ceil(n / (n_out // 2)))
+    buckets = int(np.ceil(n / size))
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(buckets, size)
+    # 결측만 있는 버킷을 피하려고 NaN은 ±inf로 바꿔 argmin/argmax
+    offsets = np.arange(buckets) * size
+    low = offsets + np.argmin(np.where(np.isnan(padded), np.inf, padded), axis=1)
+    high = offsets + np.argmax(np.where(np.isnan(padded), -np.inf, padded), axis=1)
+    keep = np.unique(np.concatenate([[0, n - 1], low, high]))
+    return keep[keep < n]
+
+
+def downsample_frame(df, x, y, max_points, color=None, method="lttb"):
+    """trace(색상 그룹)별로 점 수를 max_points 이하로 줄인다. 원래 행을 그대로 골라 반환."""
+    groups = [df] if color is None else [g for _, g in df.groupby(color, observed=True, sort=False)]
+    parts = []
+    for group in groups:
+        group = group.sort_values(x)
+        if len(group) > max_points:
+            values = group[y].to_numpy(dtype=float)
+            if method == "minmax":
+                keep = minmax_indices(values, max_points)
+            else:
+                keep = lttb_indices(x_to_numeric(group[x]), values, max_points)
+            group = group.iloc[keep]
+        parts.append(group)
+    if not parts:
+        return df
+    return pd.concat(parts)
+
+
+# =========================
+# 2. 렌더링 모드 선택 (SVG / WebGL)
+# =========================
+# 점이 이 개수를 넘으면 Scattergl로 바꾸고 마커 테두리 등 점 단위 장식을 뺀다
+WEBGL_POINT_THRESHOLD = 5000
+
+
+def count_points(fig):
+    total = 0
+    for trace in fig.data:
+        if trace.type in ("scatter", "scattergl"):
+            values = trace.x if trace.x is not None else trace.y
+            total += len(values) if values is not None else 0
+    return total
+
+
+def convert_trace(trace, trace_class):
+    props = trace.to_plotly_json()
+    props.pop("type", None)
+    return trace_class(props, skip_invalid=True)
+
+
+def apply_render_mode(fig, threshold=WEBGL_POINT_THRESHOLD, chart_id=None):
+    """점 개수에 따라 scatter 계열 trace를 SVG(Scatter) 또는 WebGL(Scattergl)로 맞춘다."""
+    points = count_points(fig)
+    mode = "webgl" if points > threshold else "svg"
+    traces = []
+    for trace in fig.data:
+        if mode == "webgl" and trace.type == "scatter":
+            trace = convert_trace(trace, go.Scattergl)
+        elif mode == "svg" and trace.type == "scattergl":
+            trace = convert_trace(trace, go.Scatter)
+        if mode == "webgl" and trace.type == "scattergl":
+            # 점마다 그리는 테두리는 WebGL에서 비용이 커서 제거
+            trace.marker.line = None
+        traces.append(trace)
+    fig.data = ()
+    fig.add_traces(traces)
+    logger.info("chart=%s points=%d render_mode=%s", chart_id, points, mode)
+    return fig
+
+
+# =========================
+# 3. 상위 K개 + 기타 묶기 (파레토 / 파이)
+# =========================
+# 범주가 수만 개여도 막대·조각 수는 K+1개로 고정된다
+DEFAULT_TOP_K = 20
+OTHERS_LABEL = "기타"
+PARETO_CUTOFF = 80
+
+
+def label_sums(labels, values):
+    # 같은 라벨은 합산 (해시 groupby, 정렬 없음), 라벨이나 값이 결측인 행은 제외
+    labels = pd.Index(labels)
+    values = np.asarray(values, dtype=float)
+    valid = ~(labels.isna() | np.isnan(values))
+    sums = pd.Series(values[valid], index=labels[valid].astype(str))
+    return sums.groupby(level=0, sort=False).sum()
+
+
+def others_name(others_label, count, existing):
+    # 묶은 범주 수를 붙이고, 그래도 실제 라벨과 겹치면 괄호로 감싸 구분한다
+    label = f"{others_label} ({count:,}개)"
+    while label in existing:
+        label = f"({label})"
+    return label
+
+
+def bucket_top_k(sums, k=DEFAULT_TOP_K, others_label=OTHERS_LABEL):
+    """전체 정렬 대신 argpartition으로 k개만 골라 정렬하고, 나머지는 '기타' 한 행으로 묶는다.
+
+    others 컬럼은 묶음 행 표시 (실제 데이터에 '기타' 범주가 있어도 라벨이 겹치지 않음).
+    """
+    keep = top_k_indices(sums.to_numpy(), k)
+    top = pd.DataFrame({"label": sums.index[keep], "value": sums.to_numpy()[keep], "others": False})
+    if len(sums) > len(keep):
+        rest = float(sums.sum()) - float(top["value"].sum())
+        label = others_name(others_label, len(sums) - len(keep), sums.index)
+        top = pd.concat([top, pd.DataFrame({"label": [label], "value": [rest], "others": [True]})], ignore_index=True)
+    return top
+
+
+def top_k_with_others(labels, values, k=DEFAULT_TOP_K, others_label=OTHERS_LABEL):
+    """값이 큰 k개 라벨 + '기타' 한 행. 범주 수와 관계없이 결과는 최대 k+1행."""
+    return bucket_top_k(label_sums(labels, values), k, others_label)
+
+
+def pareto_frame(labels, values, k=DEFAULT_TOP_K, cutoff=PARETO_CUTOFF):
+    """상위 k개(+기타)의 누적비율과 cutoff(%)에 도달하는 범주 수를 계산한다.
+
+    상위 k개는 전체 내림차순 정렬의 앞부분과 같으므로 누적비율은 정확하다.
+    cutoff가 k개 밖에 있을 때만 값 배열(라벨 제외)을 정렬해 도달 범주 수를 센다.
+    """
+    sums = label_sums(labels, values)
+    total = float(sums.sum())
+    top = bucket_top_k(sums, k)
+    share = top["value"].cumsum() / total * 100 if total else top["value"] * 0
+    top["누적비율(%)"] = share.round(2)
+
+    ranked = share.to_numpy()[:min(k, len(sums))]
+    reached = np.flatnonzero(ranked >= cutoff)
+    if len(reached):
+        cutoff_count = int(reached[0]) + 1
+    elif total:
+        ordered = -np.sort(-sums.to_numpy())
+        cutoff_count = int(np.searchsorted(np.cumsum(ordered) / total * 100, cutoff)) + 1
+    else:
+        cutoff_count = None
+    return top, {"categories": len(sums), "cutoff": cutoff, "cutoff_count": cutoff_count}
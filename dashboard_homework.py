@@ -1,171 +1,210 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
+import perf
+import os
+import json
+import time
 from io import BytesIO
+from figure_cache import FigureCache
+from excel_loader import parse_sheet
+from upload_cache import UploadCache, content_key
+from chart_utils import DEFAULT_CHART_WIDTH, DEFAULT_TOP_K, WEBGL_POINT_THRESHOLD, apply_render_mode, max_points_for_width
+from homework_charts import (
+    build_bar_figure, build_line_figure, build_pareto_figure, build_pie_figure, build_scatter_figure,
+    parse_workbook, required, to_datetime_safe
+)
+from stream_ingest import ROLE_LABELS, StreamIngest, detect_roles, is_stream_file, peek
 
 st.set_page_config(page_title="시각화 대시보드 (엑셀 업로드)", layout="wide")
 
+# 성능 측정: 끄면 구간 기록 호출이 바로 반환된다 (DASHBOARD_PERF=1이면 기본으로 켜짐)
+perf_enabled = st.sidebar.checkbox("⏱️ 성능 측정", value=perf.ENV_ENABLED, key="perf_enabled")
+perf.begin("dashboard_homework", perf_enabled)
+
 st.title("📊 시각화 대시보드")
-st.caption("엑셀 파일(.xlsx/.xls)을 업로드하면 5개의 차트를 자동 생성합니다. 다크 모드에 최적화된 팔레트를 사용합니다.")
+st.caption("엑셀 파일(.xlsx/.xls)을 업로드하면 5개의 차트를 자동 생성합니다. 다크 모드에 최적화된 팔레트를 사용합니다. "
+           "큰 데이터는 CSV·Parquet으로 올리면 청크 단위로 읽어 집계합니다.")
 
 # --- Sidebar ---
 st.sidebar.header("설정")
 theme_template = st.sidebar.selectbox("Plotly 테마", ["plotly_dark", "plotly", "ggplot2", "seaborn"], index=0)
-color_yellow = "#FFCE56"  # 노란색
-color_green  = "#4BC0C0"  # 민트/그린
-color_lime   = "#99FF33"  # 라임
-color_orange = "#FF9F40"  # 오렌지
-color_blue   = "#36A2EB"  # 파랑
+chart_width = st.sidebar.number_input("차트 가로 해상도(px)", min_value=300, max_value=4000, value=DEFAULT_CHART_WIDTH, step=100)
+webgl_threshold = st.sidebar.number_input("WebGL 전환 기준(점 수)", min_value=100, max_value=1_000_000, value=WEBGL_POINT_THRESHOLD, step=1000)
+# 파레토·파이: 상위 K개 범주만 그리고 나머지는 '기타'로 묶음
+top_k = st.sidebar.number_input("파레토·파이 상위 K개", min_value=3, max_value=200, value=DEFAULT_TOP_K, step=1)
+
+uploaded = st.file_uploader(
+    "엑셀·CSV·Parquet 파일 업로드", type=["xlsx", "xls", "csv", "parquet"],
+    help="엑셀 시트명: 바차트_히스토그램, 시계열차트, 파이차트, 산점도, 파레토차트 / CSV·Parquet: 사이드바에서 열 지정"
+)
+
+# 업로드 캐시: 파일 내용 해시 기준으로 모든 세션이 공유 (한도 초과 시 LRU, 선택적으로 디스크로 이동)
+@st.cache_resource
+def load_upload_cache():
+    return UploadCache(
+        max_bytes=int(os.environ.get("UPLOAD_CACHE_MB", "512")) * 1024 * 1024,
+        spill_dir=os.environ.get("UPLOAD_CACHE_DIR"),
+        max_spill_bytes=int(os.environ.get("UPLOAD_CACHE_DISK_MB", "2048")) * 1024 * 1024
+    )
 
-uploaded = st.file_uploader("엑셀 파일 업로드", type=["xlsx", "xls"], help="시트명: 바차트_히스토그램, 시계열차트, 파이차트, 산점도, 파레토차트")
+def load_excel(file: BytesIO):
+    data = file.getvalue()
+    return load_upload_cache().get_or_load(data, lambda: parse_workbook(data, file.name))
 
 @st.cache_data(show_spinner=False)
-def load_excel(file: BytesIO):
-    xls = pd.ExcelFile(file)
-    sheets = {name: xls.parse(name) for name in xls.sheet_names}
-    return sheets, xls.sheet_names
+def load_preview(file: BytesIO, name):
+    return parse_sheet(file.getvalue(), file.name, name)
+
+# CSV·Parquet: 파일 전체를 DataFrame으로 만들지 않고 청크마다 차트용 집계만 갱신
+# 읽는 동안 진행률과 (1초 간격으로) 부분 차트를 보여 준다
+PARTIAL_CHART_SECONDS = 1.0
+
+def stream_upload(file, roles):
+    ingest = StreamIngest(file, file.name, roles)
+    progress = st.progress(0.0, text="파일을 읽는 중...")
+    partial = st.empty()
+    last_partial = time.perf_counter()
+    for state in ingest:
+        progress.progress(state.progress, text=f"{state.rows:,}행 읽음 ({state.progress:.0%})")
+        if time.perf_counter() - last_partial >= PARTIAL_CHART_SECONDS:
+            last_partial = time.perf_counter()
+            partial_sheets = state.sheets()
+            with partial.container():
+                st.caption(f"⏳ 부분 결과: {state.rows:,}행까지 집계")
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.plotly_chart(build_bar_figure(partial_sheets, theme_template), key=f"partial_bar_{state.chunks}")
+                with col2:
+                    st.plotly_chart(build_pie_figure(partial_sheets, theme_template, top_k), key=f"partial_pie_{state.chunks}")
+    progress.empty()
+    partial.empty()
+    return ingest.result()
+
+def load_stream(file, roles, variant):
+    data = file.getvalue()
+    return load_upload_cache().get_or_load(data, lambda: stream_upload(file, roles), variant)
 
 if not uploaded:
     st.info("좌측 또는 위의 업로더에서 파일을 선택하세요. 샘플 시트명은 `바차트_히스토그램`, `시계열차트`, `파이차트`, `산점도`, `파레토차트` 입니다.")
     st.stop()
 
-sheets, sheet_names = load_excel(uploaded)
-required = ["바차트_히스토그램", "시계열차트", "파이차트", "산점도", "파레토차트"]
+streaming = is_stream_file(uploaded.name)
+upload_variant = None
+if streaming:
+    # 앞부분 표본으로 열 역할 기본값을 고르고, 사이드바에서 바꿀 수 있게 함
+    sample = peek(uploaded, uploaded.name)
+    detected = detect_roles(sample)
+    options = [None] + list(sample.columns)
+    st.sidebar.subheader("🧭 열 지정 (CSV·Parquet)")
+    roles = {
+        role: st.sidebar.selectbox(
+            label, options, index=options.index(detected[role]),
+            format_func=lambda c: "(사용 안 함)" if c is None else str(c), key=f"role_{role}:{uploaded.name}"
+        )
+        for role, label in ROLE_LABELS.items()
+    }
+    upload_variant = json.dumps(roles, ensure_ascii=False, sort_keys=True)
+    with perf.span("load_stream"):
+        sheets, sheet_names = load_stream(uploaded, roles, upload_variant)
+else:
+    with st.spinner("파일을 읽는 중..."):
+        with perf.span("load_excel"):
+            sheets, sheet_names = load_excel(uploaded)
+
+upload_stats = load_upload_cache().stats()
+st.sidebar.caption(
+    f"📂 업로드 캐시: 적중 {upload_stats['hits']} · 미스 {upload_stats['misses']} · "
+    f"축출 {upload_stats['evictions']} · 디스크 적중 {upload_stats['disk_hits']} · "
+    f"저장 {upload_stats['entries']}개 ({upload_stats['bytes'] / 1024 / 1024:.1f} MB)"
+)
 missing = [s for s in required if s not in sheet_names]
-if missing:
+if missing and streaming:
+    st.warning(f"지정하지 않은 열 때문에 그릴 수 없는 차트: {', '.join(missing)}. 사이드바에서 열을 지정하세요.")
+elif missing:
     st.warning(f"다음 시트가 누락되었습니다: {', '.join(missing)}. 있는 시트만 표시합니다.")
 
-# --- Helper functions ---
-def to_datetime_safe(series):
-    try:
-        s = pd.to_datetime(series)
-        return s
-    except Exception:
-        return series
-
-# --- 1) 바차트_히스토그램: 월별 총 매출 ---
-if "바차트_히스토그램" in sheets:
-    df_bar = sheets["바차트_히스토그램"].copy()
-    # 기대 컬럼: 월, 총 매출
-    if "월" in df_bar.columns and "총 매출" in df_bar.columns:
-        df_bar["월"] = to_datetime_safe(df_bar["월"]).dt.strftime("%Y-%m")
-        fig_bar = px.bar(
-            df_bar, x="월", y="총 매출", title="월별 총 매출",
-            template=theme_template, color_discrete_sequence=[color_yellow]
-        )
-        fig_bar.update_traces(hovertemplate="%{x}<br>총 매출: %{y:,}")
-        fig_bar.update_layout(margin=dict(l=10,r=10,t=60,b=10))
-    else:
-        fig_bar = go.Figure().add_annotation(text="'월' 또는 '총 매출' 컬럼이 없습니다.", showarrow=False)
-        fig_bar.update_layout(template=theme_template)
-else:
-    fig_bar = go.Figure().add_annotation(text="바차트_히스토그램 시트 없음", showarrow=False)
-    fig_bar.update_layout(template=theme_template)
-
-# --- 2) 시계열차트: 첫 두 열 사용 ---
-if "시계열차트" in sheets:
-    df_line = sheets["시계열차트"].copy()
-    if df_line.shape[1] >= 2:
-        xcol, ycol = df_line.columns[:2]
-        df_line[xcol] = to_datetime_safe(df_line[xcol]).dt.strftime("%Y-%m")
-        fig_line = px.line(
-            df_line, x=xcol, y=ycol, markers=True, title="시계열 추세",
-            template=theme_template, color_discrete_sequence=[color_green]
-        )
-        fig_line.update_traces(hovertemplate=f"%{{x}}<br>{ycol}: %{{y:,}}")
-        fig_line.update_layout(margin=dict(l=10,r=10,t=60,b=10))
-    else:
-        fig_line = go.Figure().add_annotation(text="시계열차트 시트에 최소 2개 열이 필요합니다.", showarrow=False)
-        fig_line.update_layout(template=theme_template)
-else:
-    fig_line = go.Figure().add_annotation(text="시계열차트 시트 없음", showarrow=False)
-    fig_line.update_layout(template=theme_template)
-
-# --- 3) 파이차트: 첫 열=라벨, 둘째=값 ---
-if "파이차트" in sheets:
-    df_pie = sheets["파이차트"].copy()
-    if df_pie.shape[1] >= 2:
-        lcol, vcol = df_pie.columns[:2]
-        fig_pie = px.pie(
-            df_pie, names=lcol, values=vcol, title="비율 분석",
-            template=theme_template, color_discrete_sequence=[color_yellow, color_green, color_orange, color_blue, color_lime]
-        )
-        fig_pie.update_traces(textposition="inside", insidetextorientation="auto", textinfo="percent+label")
-        fig_pie.update_layout(margin=dict(l=10,r=10,t=60,b=10))
-    else:
-        fig_pie = go.Figure().add_annotation(text="파이차트 시트에 최소 2개 열이 필요합니다.", showarrow=False)
-        fig_pie.update_layout(template=theme_template)
-else:
-    fig_pie = go.Figure().add_annotation(text="파이차트 시트 없음", showarrow=False)
-    fig_pie.update_layout(template=theme_template)
-
-# --- 4) 산점도: 첫 두 열 사용, 마커 강조 ---
-if "산점도" in sheets:
-    df_sc = sheets["산점도"].copy()
-    if df_sc.shape[1] >= 2:
-        xsc, ysc = df_sc.columns[:2]
-        fig_scatter = px.scatter(
-            df_sc, x=xsc, y=ysc, title="산점도 분석",
-            template=theme_template, color_discrete_sequence=[color_lime]
-        )
-        fig_scatter.update_traces(marker=dict(size=10, line=dict(width=1.5, color="#FFFFFF")))
-        fig_scatter.update_layout(margin=dict(l=10,r=10,t=60,b=10))
-    else:
-        fig_scatter = go.Figure().add_annotation(text="산점도 시트에 최소 2개 열이 필요합니다.", showarrow=False)
-        fig_scatter.update_layout(template=theme_template)
-else:
-    fig_scatter = go.Figure().add_annotation(text="산점도 시트 없음", showarrow=False)
-    fig_scatter.update_layout(template=theme_template)
-
-# --- 5) 파레토: 첫 열=라벨, 둘째=값 + 누적비율 라인 ---
-if "파레토차트" in sheets:
-    df_pa = sheets["파레토차트"].copy()
-    if df_pa.shape[1] >= 2:
-        lcol, vcol = df_pa.columns[:2]
-        dfp = df_pa[[lcol, vcol]].dropna().copy()
-        dfp = dfp.sort_values(vcol, ascending=False)
-        dfp["누적비율(%)"] = (dfp[vcol].cumsum() / dfp[vcol].sum() * 100).round(2)
-
-        fig_pareto = go.Figure()
-        fig_pareto.add_bar(x=dfp[lcol], y=dfp[vcol], name="값", marker_color=color_orange, yaxis="y")
-        fig_pareto.add_trace(go.Scatter(x=dfp[lcol], y=dfp["누적비율(%)"], name="누적 비율(%)",
-                                        mode="lines+markers", line=dict(color=color_green, width=2), yaxis="y2"))
-        fig_pareto.update_layout(
-            template=theme_template, title="파레토 차트",
-            yaxis=dict(title="값"),
-            yaxis2=dict(title="누적 비율(%)", overlaying="y", side="right", range=[0, 100]),
-            margin=dict(l=10,r=10,t=60,b=10)
+# --- 차트 캐시: (업로드 파일 해시, 차트, 테마)가 같으면 저장된 차트 재사용 ---
+@st.cache_resource
+def load_figure_cache():
+    return FigureCache(max_entries=64)
+
+figure_cache = load_figure_cache()
+upload_fingerprint = content_key(uploaded.getvalue()) + (f":{upload_variant}" if upload_variant else "")
+chart_params = {"theme_template": theme_template, "webgl_threshold": webgl_threshold}
+
+def cached_figure(chart_id, builder, **options):
+    with perf.span(f"chart:{chart_id}"):
+        return figure_cache.get_or_build(
+            upload_fingerprint,
+            chart_id,
+            lambda: apply_render_mode(builder(sheets, theme_template, **options), webgl_threshold, chart_id),
+            {**chart_params, **options}
         )
-    else:
-        fig_pareto = go.Figure().add_annotation(text="파레토차트 시트에 최소 2개 열이 필요합니다.", showarrow=False)
-        fig_pareto.update_layout(template=theme_template)
-else:
-    fig_pareto = go.Figure().add_annotation(text="파레토차트 시트 없음", showarrow=False)
-    fig_pareto.update_layout(template=theme_template)
+
+# 시계열 확대 구간: 좁히면 해당 구간 원본을 다시 다운샘플링해서 그림
+line_range = None
+if "시계열차트" in sheets and sheets["시계열차트"].shape[1] >= 2:
+    line_x = to_datetime_safe(sheets["시계열차트"].iloc[:, 0])
+    if pd.api.types.is_datetime64_any_dtype(line_x) and line_x.notna().any():
+        line_start, line_end = line_x.min().date(), line_x.max().date()
+        if line_start < line_end:
+            picked = st.sidebar.slider("시계열 확대 구간", min_value=line_start, max_value=line_end, value=(line_start, line_end))
+            line_range = (pd.Timestamp(picked[0]), pd.Timestamp(picked[1]))
+
+fig_bar = cached_figure("bar", build_bar_figure)
+fig_line = cached_figure("line", build_line_figure, x_range=line_range, max_points=max_points_for_width(chart_width))
+fig_pie = cached_figure("pie", build_pie_figure, top_k=top_k)
+fig_scatter = cached_figure("scatter", build_scatter_figure)
+fig_pareto = cached_figure("pareto", build_pareto_figure, top_k=top_k)
+
+figure_stats = figure_cache.stats()
+st.sidebar.caption(
+    f"📈 차트 캐시: 적중 {figure_stats['hits']} · 미스 {figure_stats['misses']} · 저장 {figure_stats['entries']}개"
+)
 
 # --- Layout: 2 x 2 + 1 ---
-col1, col2 = st.columns(2)
-with col1:
-    st.plotly_chart(fig_bar, use_container_width=True)
-with col2:
-    st.plotly_chart(fig_line, use_container_width=True)
-col3, col4 = st.columns(2)
-with col3:
-    st.plotly_chart(fig_pie, use_container_width=True)
-with col4:
-    st.plotly_chart(fig_scatter, use_container_width=True)
-
-st.plotly_chart(fig_pareto, use_container_width=True)
+with perf.span("layout"):
+    col1, col2 = st.columns(2)
+    with col1:
+        st.plotly_chart(fig_bar, use_container_width=True)
+    with col2:
+        st.plotly_chart(fig_line, use_container_width=True)
+    col3, col4 = st.columns(2)
+    with col3:
+        st.plotly_chart(fig_pie, use_container_width=True)
+    with col4:
+        st.plotly_chart(fig_scatter, use_container_width=True)
+
+    st.plotly_chart(fig_pareto, use_container_width=True)
 
 # --- Optional: 데이터 미리보기 ---
 with st.expander("원시 데이터 미리보기", expanded=False):
-    for name in sheet_names:
-        st.subheader(name)
-        st.dataframe(sheets[name], use_container_width=True)
+    # 시트를 고를 때만 전체 컬럼을 파싱
+    preview_name = st.selectbox("시트 선택", sheet_names, index=None, placeholder="미리볼 시트를 선택하세요")
+    if preview_name and streaming:
+        # CSV·Parquet은 원본 전체를 들고 있지 않으므로 차트용 집계 결과와 원본 앞부분을 보여 줌
+        st.subheader(f"{preview_name} (집계 결과)")
+        st.dataframe(sheets[preview_name], use_container_width=True)
+        st.caption(f"원본 앞 {len(sample):,}행")
+        st.dataframe(sample, use_container_width=True)
+    elif preview_name:
+        st.subheader(preview_name)
+        st.dataframe(load_preview(uploaded, preview_name), use_container_width=True)
+
+# --- 사이드바: 이번 실행의 구간별 시간 / 캐시 적중 / 메모리 변화 (성능 측정을 켠 경우만) ---
+trace = perf.end()
+if trace is not None:
+    with st.sidebar.expander("⏱️ 이번 실행 성능", expanded=True):
+        st.caption(
+            f"전체 {trace.seconds * 1000:,.1f} ms · 메모리 변화 {(trace.rss_end - trace.rss_start) / 1024 / 1024:+.1f} MB "
+            f"(현재 {trace.rss_end / 1024 / 1024:,.0f} MB)"
+        )
+        st.dataframe(pd.DataFrame(perf.summary(trace)), use_container_width=True, hide_index=True)
+        if trace.counters:
+            st.caption(" · ".join(f"{name} {value}" for name, value in sorted(trace.counters.items())))
 
 # --- (선택) 이미지 저장 기능: kaleido 필요 ---
+# 서버 없이 여러 파일을 한 번에 내보낼 때: python export_reports.py workbook *.xlsx --formats html png
 # def fig_to_png_bytes(fig):
 #     return fig.to_image(format="png", scale=2)
 # if st.sidebar.button("모든 차트 PNG로 저장"):
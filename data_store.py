@@ -0,0 +1,449 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+from io import BytesIO
+import pandas as pd
+
+# pyarrow가 없으면 사이드카 없이 CSV를 그대로 읽는다 (requirements.txt 참고)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+# 사이드카를 만들거나 읽지 못하면 CSV로 대체하는 오류
+# (쓰기 권한 없음 / 숫자 컬럼에 "-" 같은 자리표시 문자열이 섞여 Arrow로 변환 불가 등)
+SIDECAR_ERRORS = (OSError, ValueError) + ((pa.ArrowException,) if pa is not None else ())
+
+PANDAS_MAJOR = int(pd.__version__.split(".")[0])
+
+
+def copy_on_write():
+    # pandas 3.0부터 Copy-on-Write가 기본값 (2.x는 앱에서 옵션을 켠 경우에만).
+    # 전역 옵션은 이 모듈을 import하는 다른 코드에도 영향을 주므로 여기서 바꾸지 않는다
+    return PANDAS_MAJOR >= 3 or pd.options.mode.copy_on_write is True
+
+# =========================
+# 1. 사이드카 저장소 경로
+# =========================
+# cleaned/*.csv 옆의 .parquet 폴더에 변환본(.parquet)과 메타(.json)를 둔다
+SIDECAR_DIRNAME = ".parquet"
+
+
+def sidecar_paths(csv_path):
+    folder = os.path.join(os.path.dirname(csv_path), SIDECAR_DIRNAME)
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return (
+        os.path.join(folder, stem + ".parquet"),
+        os.path.join(folder, stem + ".json"),
+    )
+
+
+# =========================
+# 2. 원본 변경 감지 (mtime → 해시)
+# =========================
+def file_sha256(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def source_stat(path):
+    info = os.stat(path)
+    return {"mtime_ns": info.st_mtime_ns, "size": info.st_size}
+
+
+def read_meta(meta_path):
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def temp_path(path):
+    # 여러 프로세스·스레드가 같은 파일을 동시에 써도 임시 파일이 겹치지 않게 함
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def write_meta(meta_path, meta):
+    tmp = temp_path(meta_path)
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp, meta_path)
+
+
+def is_fresh(csv_path, parquet_path, meta_path):
+    # mtime/크기가 같으면 바로 통과, 다르면 해시까지 비교 (touch만 된 경우 재변환 방지)
+    if not os.path.exists(parquet_path):
+        return False
+    meta = read_meta(meta_path)
+    if meta is None:
+        return False
+    stat = source_stat(csv_path)
+    if meta.get("mtime_ns") == stat["mtime_ns"] and meta.get("size") == stat["size"]:
+        return True
+    if meta.get("size") != stat["size"] or meta.get("sha256") != file_sha256(csv_path):
+        return False
+    meta.update(stat)
+    write_meta(meta_path, meta)
+    return True
+
+
+# =========================
+# 3. CSV → Parquet 변환
+# =========================
+def convert_to_parquet(csv_path, parquet_path, meta_path):
+    # utf-8-sig: 첫 컬럼명에 붙은 BOM 제거
+    df = pd.read_csv(csv_path, encoding="utf-8-sig")
+    return write_sidecar(csv_path, df, parquet_path, meta_path)
+
+
+def write_sidecar(csv_path, df, parquet_path=None, meta_path=None):
+    # 이미 읽어 둔 DataFrame으로 사이드카를 쓴다
+    if parquet_path is None:
+        parquet_path, meta_path = sidecar_paths(csv_path)
+    os.makedirs(os.path.dirname(parquet_path), exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp = temp_path(parquet_path)
+    pq.write_table(table, tmp)
+    os.replace(tmp, parquet_path)
+
+    meta = source_stat(csv_path)
+    meta["sha256"] = file_sha256(csv_path)
+    meta["columns"] = list(df.columns)
+    meta["rows"] = len(df)
+    write_meta(meta_path, meta)
+    return df
+
+
+def ensure_sidecar(csv_path):
+    parquet_path, meta_path = sidecar_paths(csv_path)
+    if not is_fresh(csv_path, parquet_path, meta_path):
+        convert_to_parquet(csv_path, parquet_path, meta_path)
+    return parquet_path
+
+
+# =========================
+# 4. 읽기 (컬럼 프로젝션)
+# =========================
+def read_table(csv_path, columns=None):
+    # 필요한 컬럼만 읽어 파싱 비용을 줄인다 (압축된 Parquet이라 to_pandas()에서 복사는 일어남)
+    columns = list(columns) if columns else None
+    if pq is None:
+        return pd.read_csv(csv_path, encoding="utf-8-sig", usecols=columns)
+
+    try:
+        parquet_path = ensure_sidecar(csv_path)
+        table = pq.read_table(parquet_path, columns=columns)
+    except SIDECAR_ERRORS as e:
+        logger.warning("사이드카 사용 불가, CSV로 읽음: %s (%s: %s)", csv_path, type(e).__name__, e)
+        return pd.read_csv(csv_path, encoding="utf-8-sig", usecols=columns)
+    return table.to_pandas()
+
+
+# =========================
+# 5. dtype 정규화 (스키마 기반)
+# =========================
+# category: 반복되는 문자열 / count: 건수·인원 등 정수 / year: '2010년' 형식 포함 연도
+REGION_KEYS = ["지역코드", "지역명"]
+
+SCHEMAS = {
+    "등록관리율": {
+        "category": REGION_KEYS,
+        "year": ["연도"],
+        "count": ["주민등록인구", "추계중증정신질환자수", "정신건강복지센터 등록  중증정신질환자수"],
+    },
+    "기관현황": {
+        "category": REGION_KEYS,
+        "year": ["연도"],
+        "count": [
+            "합계", "광역정신건강복지센터 수", "기초정신건강복지센터 수", "중독관리통합지원센터 수",
+            "주간재활시설 수", "공동생활가정 수", "지역사회전환시설 수", "직업재활시설 수",
+            "아동청소년정신건강지원시설 수", "중독자재활시설 수", "종합시설 수",
+        ],
+    },
+    "예산": {
+        "category": REGION_KEYS,
+        "year": ["연도"],
+        "count": ["서울시예산", "보건 예산", "정신건강증진 예산"],
+    },
+    "진료정보": {
+        "category": ["주상병코드", "주상병명"],
+        "count": ["진료인원(명)"],
+    },
+    "상병그룹": {
+        "category": ["주상병코드", "가입자구분", "성별", "연령"],
+        "year": ["진료년도"],
+        "count": ["진료실인원(명)", "진료건수(건)", "총진료비(천원)"],
+    },
+    "주관적건강": {
+        "category": REGION_KEYS,
+        "year": ["연도"],
+        "count": ["모름/무응답"],
+    },
+    "알코올사망": {
+        "category": ["구분"],
+        "year": ["연도"],
+    },
+}
+
+
+def to_year(series):
+    # '2010년' → 2010 (int16)
+    if not pd.api.types.is_numeric_dtype(series):
+        series = series.astype(str).str.replace("년", "", regex=False).str.strip()
+    return pd.to_numeric(series).astype("int16")
+
+
+def downcast_count(series):
+    # 결측이 있으면 정수로 바꿀 수 없으므로 그대로 둔다
+    if series.isna().any():
+        return series
+    return pd.to_numeric(series, downcast="integer")
+
+
+def normalize(df, schema):
+    if not schema:
+        return df
+    changes = {}
+    for col in schema.get("category", []):
+        if col in df.columns:
+            changes[col] = df[col].astype("category")
+    for col in schema.get("year", []):
+        if col in df.columns:
+            changes[col] = to_year(df[col])
+    for col in schema.get("count", []):
+        if col in df.columns:
+            changes[col] = downcast_count(df[col])
+    return df.assign(**changes)
+
+
+def frame_bytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def concat_rows(base, delta):
+    # 범주형 컬럼은 두 쪽 범주를 합친 뒤 이어 붙여야 category dtype이 유지된다
+    changes = {}
+    for col in base.columns:
+        if isinstance(base[col].dtype, pd.CategoricalDtype) and col in delta.columns:
+            categories = base[col].cat.categories.union(pd.Index(delta[col].dropna().unique()))
+            dtype = pd.CategoricalDtype(categories)
+            base = base.assign(**{col: base[col].astype(dtype)})
+            changes[col] = delta[col].astype(dtype)
+    return pd.concat([base, delta.assign(**changes)], ignore_index=True)
+
+
+def dtype_report(before, after):
+    # 컬럼별 정규화 전후 dtype과 메모리 비교
+    report = pd.DataFrame({
+        "변환 전 dtype": before.dtypes.astype(str),
+        "변환 후 dtype": after.dtypes.reindex(before.columns).astype(str),
+        "변환 전(bytes)": before.memory_usage(index=False, deep=True),
+        "변환 후(bytes)": after.memory_usage(index=False, deep=True).reindex(before.columns),
+    })
+    report.index.name = "컬럼"
+    return report.reset_index()
+
+
+# =========================
+# 6. 원본 뒤에 행이 추가되었는지 확인 (앞부분 서명 비교)
+# =========================
+SIGNATURE_CHUNK = 64 * 1024
+
+
+def prefix_signature(path, size):
+    # 파일 앞 size 바이트의 처음·마지막 64KB 해시 (전체를 다시 읽지 않음)
+    h = hashlib.sha256(str(size).encode())
+    with open(path, "rb") as f:
+        h.update(f.read(min(size, SIGNATURE_CHUNK)))
+        f.seek(max(size - SIGNATURE_CHUNK, 0))
+        h.update(f.read(min(size, SIGNATURE_CHUNK)))
+    return h.hexdigest()
+
+
+def read_appended(path, old_size, new_size, signature, columns=None):
+    """old_size~new_size 사이에 덧붙은 완성된 행만 읽는다.
+
+    반환: (추가 행, 실제로 읽은 끝 위치). 앞부분이 바뀌었으면(추가가 아니면) None.
+    new_size 뒤에 더 쓰인 내용과 줄바꿈이 아직 안 온 마지막 행은 읽지 않고 다음 확인 때 이어 읽는다.
+    """
+    if new_size < old_size or prefix_signature(path, old_size) != signature:
+        return None
+    with open(path, "rb") as f:
+        header = f.readline()
+        f.seek(max(old_size - 1, 0))
+        # 기존 내용이 줄바꿈으로 끝나지 않았다면 마지막 행이 이어 쓰인 것이므로 전체 재로드
+        if old_size and f.read(1) != b"\n":
+            return None
+        data = f.read(new_size - old_size)
+    data = data[:data.rfind(b"\n") + 1]
+    end = old_size + len(data)
+    if not data.strip():
+        return pd.read_csv(BytesIO(header), encoding="utf-8-sig", usecols=columns), end
+    return pd.read_csv(BytesIO(header + data), encoding="utf-8-sig", usecols=columns), end
+
+
+# =========================
+# 7. 프로세스 공용 데이터셋 레지스트리
+# =========================
+class DatasetRegistry:
+    """프로세스 전체에서 데이터셋을 한 번만 읽어 공유하는 저장소.
+
+    get()은 원본의 얕은 복사본을 돌려준다. Copy-on-Write 덕분에 메모리는 공유되고,
+    세션 쪽에서 컬럼을 바꿔도 원본과 다른 세션에는 영향이 없다 (CoW가 꺼진 pandas 2.x에서는 깊은 복사).
+    """
+
+    def __init__(self):
+        self._specs = {}
+        self._frames = {}
+        self._raw_bytes = {}
+        self._dtype_reports = {}
+        self._versions = {}
+        self._sources = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+        # 데이터가 바뀔 때마다 1씩 증가 (세션이 새로고침 필요 여부를 판단)
+        self.generation = 0
+
+    def register(self, name, path, columns=None, derive=None):
+        # 같은 이름을 다시 등록해도 이미 읽은 데이터는 유지
+        with self._lock:
+            self._specs.setdefault(name, (path, columns, derive))
+
+    def get(self, name):
+        frame = self._frames.get(name)
+        if frame is None:
+            with self._lock:
+                frame = self._frames.get(name)
+                if frame is None:
+                    frame = self._load(name)
+        return frame.copy(deep=not copy_on_write())
+
+    def _read(self, name, attempts=3):
+        path, columns, derive = self._specs[name]
+        # 읽는 도중 파일이 바뀌면 기록한 크기와 읽은 내용이 어긋나므로, 앞뒤 상태가 같을 때까지 다시 읽는다
+        for _ in range(attempts):
+            stat = source_stat(path)
+            raw = read_table(path, columns)
+            if source_stat(path) == stat:
+                break
+        frame = normalize(raw, SCHEMAS.get(name))
+        # 파생 컬럼은 등록 시 한 번만 계산
+        if derive is not None:
+            frame = derive(frame)
+        return frame, stat, frame_bytes(raw), dtype_report(raw, frame)
+
+    def _load(self, name):
+        frame, stat, raw_bytes, report = self._read(name)
+        self._publish(name, frame, stat, raw_bytes, report)
+        return frame
+
+    def _publish(self, name, frame, stat, raw_bytes, report=None):
+        # 버전과 프레임을 함께 바꾼다 (version()이 새 값을 돌려주는 순간 get()도 새 프레임)
+        path = self._specs[name][0]
+        self._raw_bytes[name] = raw_bytes
+        if report is not None:
+            self._dtype_reports[name] = report
+        self._sources[name] = dict(stat, signature=prefix_signature(path, stat["size"]))
+        self._frames[name] = frame
+        self._versions[name] = f"{stat['mtime_ns']}-{stat['size']}"
+
+    # -------------------------
+    # 증분 갱신
+    # -------------------------
+    def subscribe(self, listener):
+        # listener(name, kind, rows): kind="append"이면 rows는 추가된 행, "reload"면 전체 데이터
+        # 새 버전을 공개하기 전에 호출되므로, 새 버전 키로 계산되는 화면은 항상 갱신된 파생 데이터를 본다
+        self._listeners.append(listener)
+
+    def refresh(self):
+        """로드된 데이터셋의 원본 변경을 반영한다. 반환: {데이터셋: "append" | "reload"}
+
+        뒤에 행만 추가되었으면 추가분만 읽어 이어 붙이고, 그 밖의 변경은 전체를 다시 읽는다.
+        """
+        changes = {}
+        for name in list(self._frames):
+            path, columns, derive = self._specs[name]
+            try:
+                stat = source_stat(path)
+            except OSError:
+                continue
+            old = self._sources[name]
+            if stat["mtime_ns"] == old["mtime_ns"] and stat["size"] == old["size"]:
+                continue
+
+            with self._lock:
+                appended = read_appended(path, old["size"], stat["size"], old["signature"], columns)
+                if appended is None:
+                    frame, stat, raw_bytes, report = self._read(name)
+                    kind, rows = "reload", frame
+                else:
+                    delta, end = appended
+                    if end == old["size"]:
+                        # 아직 줄바꿈까지 쓰이지 않은 행뿐: 다음 확인 때 다시 본다
+                        continue
+                    # 실제로 읽은 위치까지만 반영한 것으로 기록 (그 뒤에 추가된 행은 다음 확인 때 읽음)
+                    stat = dict(stat, size=end)
+                    rows = normalize(delta, SCHEMAS.get(name))
+                    if derive is not None:
+                        rows = derive(rows)
+                    frame = concat_rows(self._frames[name], rows)
+                    raw_bytes, report = self._raw_bytes[name] + frame_bytes(delta), None
+                    kind = "append"
+                # 큐브 등 파생 데이터를 먼저 갱신한 뒤 새 버전을 공개한다
+                # (반대 순서면 그 사이에 새 버전 키로 옛 큐브 결과가 캐시되어 다시는 무효화되지 않음)
+                for listener in self._listeners:
+                    listener(name, kind, rows.copy(deep=not copy_on_write()))
+                self._publish(name, frame, stat, raw_bytes, report)
+                self.generation += 1
+            changes[name] = kind
+        return changes
+
+    def loaded(self):
+        return list(self._frames)
+
+    def version(self, name):
+        # 로드된 데이터는 로드 시점 버전, 아직 안 읽은 데이터(SQL 백엔드 등)는 현재 파일 버전
+        if name in self._versions:
+            return self._versions[name]
+        try:
+            stat = source_stat(self._specs[name][0])
+        except (KeyError, OSError):
+            return None
+        return f"{stat['mtime_ns']}-{stat['size']}"
+
+    def fingerprint(self, names):
+        # 차트 캐시 키용: 원본 파일의 (mtime, 크기) 조합
+        return tuple((name, self.version(name)) for name in names)
+
+    def memory_report(self):
+        rows = [
+            {
+                "데이터셋": name,
+                "행 수": len(frame),
+                "컬럼 수": frame.shape[1],
+                "정규화 전(bytes)": self._raw_bytes[name],
+                "메모리(bytes)": frame_bytes(frame),
+            }
+            for name, frame in self._frames.items()
+        ]
+        return pd.DataFrame(rows, columns=["데이터셋", "행 수", "컬럼 수", "정규화 전(bytes)", "메모리(bytes)"])
+
+    def dtype_report(self, name):
+        return self._dtype_reports[name]
+
+
+_registry = DatasetRegistry()
+
+
+def get_registry():
+    return _registry
@@ -0,0 +1,410 @@
+"""원본 공공데이터(엑셀/CSV)로 cleaned/ 데이터셋(CSV + Parquet 사이드카)을 만든다.
+
+    # raw/ 폴더의 원본 → cleaned/ (입력이 바뀐 데이터셋만 다시 변환)
+    python etl.py
+
+    # 다른 폴더에서, 전부 다시, 일부 데이터셋만
+    python etl.py --raw 다운로드 --force --only 상병그룹 진료정보
+
+원본 파일은 파일명에 데이터셋 이름이 들어 있으면 된다 (예: 상병그룹_2010-2021.xlsx).
+여러 파일·시트는 이어 붙이고, 시트 단위로 프로세스 풀에서 병렬로 읽는다.
+"""
+import os
+import re
+import sys
+import glob
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from data_store import SCHEMAS, convert_to_parquet, file_sha256, pa, read_meta, sidecar_paths, source_stat, write_meta
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RAW_PATH = os.path.join(BASE_DIR, "raw")
+CLEANED_PATH = os.path.join(BASE_DIR, "cleaned")
+MANIFEST_NAME = ".etl_manifest.json"
+RAW_EXTENSIONS = (".xlsx", ".xls", ".csv")
+
+# 변환 규칙이 바뀌면 올려서 기존 결과를 모두 다시 만든다
+ETL_VERSION = 1
+
+# =========================
+# 1. 데이터셋 정의 (출력 컬럼 순서 = cleaned/ CSV 헤더)
+# =========================
+REGION_KEYS = ["연도", "지역코드", "지역명"]
+
+OUTPUT_COLUMNS = {
+    "등록관리율": REGION_KEYS + [
+        "주민등록인구", "추계중증정신질환자수", "정신건강복지센터 등록  중증정신질환자수",
+        "추계중증정신질환자수 대비 정신건강복지센터 등록 중증정신질환자",
+    ],
+    "기관현황": REGION_KEYS + SCHEMAS["기관현황"]["count"],
+    "예산": REGION_KEYS + ["서울시예산", "보건 예산", "정신건강증진 예산", "보건 예산 대비 정신건강증진 예산 비중"],
+    "주관적건강": REGION_KEYS + ["좋은편", "보통", "좋지않은편", "모름/무응답"],
+    "상병그룹": [
+        "주상병코드", "진료년도", "가입자구분", "성별", "연령", "진료실인원(명)", "진료건수(건)", "총진료비(천원)",
+    ],
+    "진료정보": ["주상병코드", "주상병명", "진료년월", "진료인원(명)"],
+    "알코올사망": ["연도", "구분", "계", "20세-29세", "30세-39세", "40세-49세", "50세-59세", "60세-69세", "70세이상"],
+}
+
+# 행을 구분하는 키 (여러 파일을 이어 붙일 때 중복 제거 · 검증용)
+ROW_KEYS = {
+    "등록관리율": ["연도", "지역코드"],
+    "기관현황": ["연도", "지역코드"],
+    "예산": ["연도", "지역코드"],
+    "주관적건강": ["연도", "지역코드"],
+    "상병그룹": ["주상병코드", "진료년도", "가입자구분", "성별", "연령"],
+    "진료정보": ["주상병코드", "진료년월"],
+    "알코올사망": ["연도", "구분"],
+}
+
+# 공공데이터 원본에서 자주 보이는 다른 헤더 이름 (공백 제거 후 비교)
+HEADER_ALIASES = {
+    "년도": "연도",
+    "기간": "연도",
+    "시점": "연도",
+    "자치구": "지역명",
+    "시군구": "지역명",
+    "지역": "지역명",
+}
+
+# 서울시 전체(C01)와 자치구(D01~D25) 코드
+SEOUL_CODES = {"서울시": "C01"}
+SEOUL_CODES.update({
+    name: f"D{i:02d}" for i, name in enumerate([
+        "종로구", "중구", "용산구", "성동구", "광진구", "동대문구", "중랑구", "성북구", "강북구", "도봉구",
+        "노원구", "은평구", "서대문구", "마포구", "양천구", "강서구", "구로구", "금천구", "영등포구", "동작구",
+        "관악구", "서초구", "강남구", "송파구", "강동구",
+    ], start=1)
+})
+CITY_ALIASES = {"서울", "서울특별시", "서울시전체", "합계", "계", "전체"}
+REGION_CODE_PATTERN = re.compile(r"^[CD]\d{2}$")
+
+
+# =========================
+# 2. 헤더 정리
+# =========================
+def clean_label(value):
+    # BOM·줄바꿈·앞뒤 공백 제거 (컬럼명 안의 공백은 cleaned/ 헤더와 같게 유지)
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    text = str(value).replace("\ufeff", "").replace("\r", " ").replace("\n", " ")
+    return text.strip()
+
+
+def compact(label):
+    return re.sub(r"\s+", "", label)
+
+
+def header_map(labels, dataset):
+    # 원본 헤더 → 출력 컬럼명 (공백 차이·별칭 허용). 매칭되지 않는 컬럼은 버린다
+    targets = {compact(c): c for c in OUTPUT_COLUMNS[dataset]}
+    mapping = {}
+    for position, label in enumerate(labels):
+        key = compact(label)
+        key = compact(HEADER_ALIASES.get(key, key))
+        target = targets.get(key)
+        if target is not None and target not in mapping.values():
+            mapping[position] = target
+    return mapping
+
+
+def find_header(raw, dataset, max_rows=15):
+    # 제목·단위 행이 위에 붙은 시트가 많아 처음 몇 행에서 출력 컬럼과 가장 많이 맞는 행을 헤더로 사용
+    best = (None, {})
+    for row in range(min(max_rows, len(raw))):
+        mapping = header_map([clean_label(v) for v in raw.iloc[row]], dataset)
+        if len(mapping) > len(best[1]):
+            best = (row, mapping)
+    # 절반도 맞지 않으면 이 데이터셋의 시트가 아님
+    if len(best[1]) * 2 < len(OUTPUT_COLUMNS[dataset]):
+        return None, {}
+    return best
+
+
+# =========================
+# 3. 값 정규화
+# =========================
+def to_number(series):
+    # '1,234' / '-' / '…' 같은 표기를 숫자로 (변환할 수 없는 값은 NaN)
+    if pd.api.types.is_numeric_dtype(series):
+        return series
+    text = series.astype("string").str.replace(",", "", regex=False).str.strip()
+    text = text.mask(text.isin(["", "-", "…", "x", "X"]))
+    return pd.to_numeric(text, errors="coerce")
+
+
+def to_year(series):
+    # 2010 / '2010년' / '2010.0' / 날짜 → 2010
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.dt.year.astype("Int64")
+    text = series.astype("string").str.extract(r"((?:19|20)\d{2})", expand=False)
+    return pd.to_numeric(text, errors="coerce").astype("Int64")
+
+
+def to_month(series):
+    # 202301 / '2023-01' / '2023.1' / 날짜 → '202301'
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.dt.strftime("%Y%m")
+    parts = series.astype("string").str.extract(r"((?:19|20)\d{2})\D?(\d{1,2})")
+    return parts[0] + parts[1].str.zfill(2)
+
+
+def normalize_region(df):
+    # 지역명 표기를 맞추고, 지역코드가 없거나 비어 있으면 지역명으로 채운다
+    changes = {}
+    names = df["지역명"].astype("string").str.replace(r"\s+", "", regex=True) if "지역명" in df else None
+    if names is not None:
+        names = names.mask(names.isin(CITY_ALIASES), "서울시")
+        changes["지역명"] = names
+    codes = df["지역코드"].astype("string").str.strip().str.upper() if "지역코드" in df else None
+    if names is not None:
+        from_names = names.map(SEOUL_CODES)
+        codes = from_names if codes is None else codes.fillna(from_names).mask(codes == "", from_names)
+    if codes is not None:
+        changes["지역코드"] = codes
+        if names is None:
+            # 코드만 있는 원본은 코드로 지역명을 채운다
+            by_code = {code: name for name, code in SEOUL_CODES.items()}
+            changes["지역명"] = codes.map(by_code)
+    return df.assign(**changes)
+
+
+def transform(df, dataset):
+    columns = OUTPUT_COLUMNS[dataset]
+    schema = SCHEMAS.get(dataset, {})
+    if {"지역코드", "지역명"} & set(columns):
+        df = normalize_region(df)
+
+    changes = {}
+    text_columns = set(schema.get("category", [])) | {"지역코드", "지역명"}
+    for col in df.columns:
+        if col in schema.get("year", []):
+            changes[col] = to_year(df[col])
+        elif col == "진료년월":
+            changes[col] = to_month(df[col])
+        elif col in text_columns:
+            changes[col] = df[col].astype("string").str.strip()
+        else:
+            changes[col] = to_number(df[col])
+    df = df.assign(**changes)
+
+    # 전부 빈 행(합계 아래 주석 등) 제거
+    values = [c for c in columns if c in df.columns and c not in ROW_KEYS[dataset]]
+    df = df.dropna(how="all", subset=values or None)
+    for col in schema.get("count", []):
+        # 결측이 없는 건수 컬럼은 정수로 저장
+        if col in df.columns and df[col].notna().all() and (df[col] % 1 == 0).all():
+            df = df.assign(**{col: df[col].astype("int64")})
+    return df
+
+
+# =========================
+# 4. 검증
+# =========================
+def validate(df, dataset):
+    """출력하기 전에 스키마 문제를 모아 문자열 목록으로 반환 (비어 있으면 통과)."""
+    problems = []
+    columns = OUTPUT_COLUMNS[dataset]
+    missing = [c for c in columns if c not in df.columns]
+    if missing:
+        problems.append(f"없는 컬럼: {', '.join(missing)}")
+    if df.empty:
+        problems.append("행이 없음")
+        return problems
+
+    schema = SCHEMAS.get(dataset, {})
+    for col in schema.get("year", []):
+        if col in df.columns and df[col].isna().any():
+            problems.append(f"{col}: 연도로 읽을 수 없는 값 {int(df[col].isna().sum())}행")
+    if "진료년월" in df.columns and df["진료년월"].isna().any():
+        problems.append(f"진료년월: 연월로 읽을 수 없는 값 {int(df['진료년월'].isna().sum())}행")
+    if "지역코드" in df.columns:
+        codes = df["지역코드"].astype("string")
+        invalid = sorted(set(df.loc[~codes.str.match(REGION_CODE_PATTERN).fillna(False), "지역명"].astype(str)))
+        if invalid:
+            problems.append(f"지역코드를 알 수 없는 지역: {', '.join(invalid[:5])}")
+    for col in schema.get("count", []):
+        if col in df.columns and (df[col] < 0).any():
+            problems.append(f"{col}: 음수 값 {int((df[col] < 0).sum())}행")
+
+    keys = [k for k in ROW_KEYS[dataset] if k in df.columns]
+    duplicated = df.duplicated(keys, keep=False)
+    if keys and duplicated.any():
+        problems.append(f"키 중복 ({', '.join(keys)}): {int(duplicated.sum())}행")
+    return problems
+
+
+# =========================
+# 5. 원본 읽기 (시트 단위 작업)
+# =========================
+def find_inputs(raw_path, dataset):
+    paths = []
+    for ext in RAW_EXTENSIONS:
+        paths.extend(glob.glob(os.path.join(raw_path, f"*{dataset}*{ext}")))
+    # 엑셀 임시 파일(~$...) 제외
+    return sorted(p for p in paths if not os.path.basename(p).startswith("~$"))
+
+
+def read_csv_raw(path):
+    # 공공데이터 CSV는 cp949가 많아서 utf-8-sig 실패 시 cp949로 다시 읽음
+    try:
+        return pd.read_csv(path, header=None, dtype=str, encoding="utf-8-sig")
+    except UnicodeDecodeError:
+        return pd.read_csv(path, header=None, dtype=str, encoding="cp949")
+
+
+def sheet_jobs(dataset, path):
+    if path.lower().endswith(".csv"):
+        return [(dataset, path, None)]
+    engine = "xlrd" if path.lower().endswith(".xls") else "openpyxl"
+    with pd.ExcelFile(path, engine=engine) as book:
+        return [(dataset, path, name) for name in book.sheet_names]
+
+
+def read_sheet(job):
+    """시트 하나를 읽어 출력 컬럼 이름으로 정리한다. 이 데이터셋 시트가 아니면 None."""
+    dataset, path, sheet = job
+    if sheet is None:
+        raw = read_csv_raw(path)
+    else:
+        engine = "xlrd" if path.lower().endswith(".xls") else "openpyxl"
+        raw = pd.read_excel(path, sheet_name=sheet, header=None, engine=engine)
+    row, mapping = find_header(raw, dataset)
+    if row is None:
+        return job, None
+    body = raw.iloc[row + 1:, list(mapping)]
+    body.columns = list(mapping.values())
+    return job, transform(body.reset_index(drop=True), dataset)
+
+
+# =========================
+# 6. 증분 실행 (입력 해시 목록)
+# =========================
+def input_hashes(paths, previous):
+    # mtime·크기가 같으면 이전 해시를 재사용 (내용이 바뀐 파일만 해시 계산)
+    hashes = {}
+    for path in paths:
+        stat = source_stat(path)
+        old = previous.get(os.path.basename(path), {})
+        if old.get("mtime_ns") == stat["mtime_ns"] and old.get("size") == stat["size"]:
+            hashes[os.path.basename(path)] = old
+        else:
+            hashes[os.path.basename(path)] = dict(stat, sha256=file_sha256(path))
+    return hashes
+
+
+def is_current(entry, hashes, out_path):
+    if not entry or entry.get("version") != ETL_VERSION or not os.path.exists(out_path):
+        return False
+    same_inputs = {k: v["sha256"] for k, v in entry["inputs"].items()} == {k: v["sha256"] for k, v in hashes.items()}
+    # 출력 파일을 손으로 고친 경우도 다시 만든다
+    return same_inputs and entry.get("output_sha256") == file_sha256(out_path)
+
+
+def write_output(df, dataset, out_path):
+    # 행 순서는 원본 그대로 둔다 (예산 KPI 등 순서에 기대는 화면이 있음)
+    df = df[OUTPUT_COLUMNS[dataset]].reset_index(drop=True)
+    tmp = out_path + ".tmp"
+    # utf-8-sig: 엑셀에서 열어도 한글이 깨지지 않도록 BOM 포함
+    df.to_csv(tmp, index=False, encoding="utf-8-sig")
+    os.replace(tmp, out_path)
+    if pa is not None:
+        # 사이드카는 방금 쓴 CSV를 다시 읽어 만든다 (진료년월·지역코드처럼 숫자로 읽히는 문자열 컬럼도
+        # CSV로 읽을 때와 dtype이 같아야 함)
+        convert_to_parquet(out_path, *sidecar_paths(out_path))
+    return df
+
+
+# =========================
+# 7. 실행
+# =========================
+def run(raw_path, out_path, datasets, workers, force=False):
+    os.makedirs(out_path, exist_ok=True)
+    manifest_path = os.path.join(out_path, MANIFEST_NAME)
+    manifest = read_meta(manifest_path) or {}
+    results = {}
+
+    # 1) 바뀐 데이터셋만 골라 시트 작업 목록 만들기
+    pending = {}
+    for dataset in datasets:
+        paths = find_inputs(raw_path, dataset)
+        target = os.path.join(out_path, f"{dataset}.csv")
+        if not paths:
+            results[dataset] = {"status": "no-input"}
+            continue
+        entry = manifest.get(dataset, {})
+        hashes = input_hashes(paths, entry.get("inputs", {}))
+        if not force and is_current(entry, hashes, target):
+            results[dataset] = {"status": "up-to-date", "rows": entry.get("rows")}
+            continue
+        pending[dataset] = (paths, hashes, target)
+
+    jobs = [job for dataset, (paths, _, _) in pending.items() for path in paths for job in sheet_jobs(dataset, path)]
+
+    # 2) 시트 단위 병렬 파싱 (시트가 하나뿐이면 프로세스를 띄우지 않음)
+    workers = min(len(jobs), workers)
+    if workers < 2:
+        parsed = [read_sheet(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parsed = list(pool.map(read_sheet, jobs))
+
+    # 3) 데이터셋별로 합쳐 검증 후 한 번에 CSV + Parquet 쓰기
+    for dataset, (paths, hashes, target) in pending.items():
+        frames = [df for (name, _, _), df in parsed if name == dataset and df is not None]
+        if not frames:
+            results[dataset] = {"status": "failed", "problems": ["헤더가 맞는 시트가 없음"]}
+            continue
+        df = pd.concat(frames, ignore_index=True)
+        # 같은 기간이 여러 파일에 있으면 나중 파일(파일명 순) 값을 사용
+        df = df.drop_duplicates([k for k in ROW_KEYS[dataset] if k in df.columns], keep="last")
+        problems = validate(df, dataset)
+        if problems:
+            results[dataset] = {"status": "failed", "problems": problems}
+            continue
+        df = write_output(df, dataset, target)
+        manifest[dataset] = {
+            "version": ETL_VERSION,
+            "inputs": hashes,
+            "output_sha256": file_sha256(target),
+            "rows": len(df),
+        }
+        results[dataset] = {"status": "written", "rows": len(df), "sheets": len(frames)}
+
+    write_meta(manifest_path, manifest)
+    return {dataset: results[dataset] for dataset in datasets}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="원본 공공데이터 → cleaned/ CSV + Parquet")
+    parser.add_argument("--raw", default=RAW_PATH, help="원본 엑셀/CSV 폴더 (기본: raw/)")
+    parser.add_argument("--out", default=CLEANED_PATH, help="출력 폴더 (기본: cleaned/)")
+    parser.add_argument("--only", nargs="+", choices=list(OUTPUT_COLUMNS), help="일부 데이터셋만")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="프로세스 수 (1이면 순서대로)")
+    parser.add_argument("--force", action="store_true", help="입력이 그대로여도 다시 변환")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    started = time.perf_counter()
+    results = run(args.raw, args.out, args.only or list(OUTPUT_COLUMNS), args.workers, args.force)
+    elapsed = time.perf_counter() - started
+
+    for dataset, result in results.items():
+        line = f"{dataset}: {result['status']}"
+        if result.get("rows") is not None:
+            line += f" ({result['rows']:,}행)"
+        print(line)
+        for problem in result.get("problems", []):
+            print(f"  ❌ {problem}", file=sys.stderr)
+    print(f"완료 ({elapsed:.1f}초) → {args.out}")
+    return 1 if any(r["status"] == "failed" for r in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
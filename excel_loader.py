@@ -0,0 +1,124 @@
+import os
+import tempfile
+import threading
+import multiprocessing
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+# =========================
+# 엑셀 시트 지연 파싱
+# =========================
+# 이보다 작은 파일은 프로세스를 띄우는 비용이 더 커서 순서대로 파싱
+PARALLEL_MIN_BYTES = 1 << 20
+
+
+def is_xls(filename):
+    return str(filename).lower().endswith(".xls")
+
+
+def open_source(source):
+    # source: 업로드 내용(bytes) 또는 파일 경로
+    return BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+
+
+def sheet_names(data, filename):
+    # 시트 내용은 읽지 않고 이름만 확인
+    if is_xls(filename):
+        return pd.ExcelFile(open_source(data), engine="xlrd").sheet_names
+    from openpyxl import load_workbook
+    wb = load_workbook(open_source(data), read_only=True, data_only=True)
+    try:
+        return list(wb.sheetnames)
+    finally:
+        wb.close()
+
+
+def pick_columns(header, columns):
+    # columns: None(전체) / 컬럼명 목록 / 위치(int) 목록
+    if columns is None:
+        return list(range(len(header)))
+    if all(isinstance(c, int) for c in columns):
+        return [c for c in columns if c < len(header)]
+    return [i for i, name in enumerate(header) if name in columns]
+
+
+def header_labels(header, positions):
+    # pandas.read_excel과 같은 방식으로 빈 헤더 이름을 채움
+    return [header[i] if header[i] is not None else f"Unnamed: {i}" for i in positions]
+
+
+def parse_sheet(data, filename, name, columns=None):
+    """시트 하나를 필요한 컬럼만 읽어 DataFrame으로 반환한다. data: bytes 또는 파일 경로."""
+    if is_xls(filename):
+        header = list(pd.read_excel(open_source(data), sheet_name=name, nrows=0, engine="xlrd").columns)
+        positions = pick_columns(header, columns)
+        return pd.read_excel(open_source(data), sheet_name=name, usecols=positions, engine="xlrd")
+
+    # .xlsx: openpyxl 읽기 전용(스트리밍) 모드로 필요한 폭까지만 행을 읽음
+    from openpyxl import load_workbook
+    wb = load_workbook(open_source(data), read_only=True, data_only=True)
+    try:
+        ws = wb[name]
+        header = list(next(ws.iter_rows(max_row=1, values_only=True), ()))
+        positions = pick_columns(header, columns)
+        records = []
+        if positions:
+            for row in ws.iter_rows(min_row=2, max_col=max(positions) + 1, values_only=True):
+                values = [row[i] if i < len(row) else None for i in positions]
+                # 완전히 빈 행은 건너뜀
+                if any(v is not None for v in values):
+                    records.append(values)
+    finally:
+        wb.close()
+    return pd.DataFrame(records, columns=header_labels(header, positions))
+
+
+def _parse_job(args):
+    return args[2], parse_sheet(*args)
+
+
+# 프로세스 풀은 처음 필요할 때 한 번만 만들어 업로드마다 재사용
+# Streamlit 서버는 다중 스레드 프로세스라 fork 대신 spawn으로 작업 프로세스를 띄운다
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def shared_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def reset_pool():
+    global _pool
+    with _pool_lock:
+        _pool = None
+
+
+def load_sheets(data, filename, specs, max_workers=None):
+    """specs: {시트명: 컬럼 지정}. 큰 파일은 시트별로 공용 프로세스 풀에서 병렬 파싱."""
+    workers = min(len(specs), max_workers or os.cpu_count() or 1)
+    if workers < 2 or len(data) < PARALLEL_MIN_BYTES:
+        return {name: parse_sheet(data, filename, name, columns) for name, columns in specs.items()}
+
+    # 작업마다 파일 내용을 피클로 보내지 않도록 임시 파일 경로만 넘긴다
+    suffix = os.path.splitext(str(filename))[1]
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
+        f.write(data)
+    try:
+        jobs = [(f.name, filename, name, columns) for name, columns in specs.items()]
+        try:
+            return dict(shared_pool().map(_parse_job, jobs))
+        except BrokenProcessPool:
+            # 작업 프로세스가 죽었으면 풀을 버리고 이번 파일은 순서대로 파싱
+            reset_pool()
+            return dict(_parse_job(job) for job in jobs)
+    finally:
+        os.remove(f.name)
@@ -0,0 +1,243 @@
+"""대시보드 차트를 Streamlit 없이 HTML/JSON/PNG 파일로 내보낸다.
+
+    # final_project.py 네 개 탭의 모든 차트
+    python export_reports.py project --out reports/project
+
+    # 업로드 대시보드(dashboard_homework.py) 형식 엑셀 여러 개
+    python export_reports.py workbook 지역별/*.xlsx --out reports/regions --workers 8
+
+차트(와 통합문서) 단위로 프로세스 풀에 나눠 그리고, 결과 목록은 <out>/index.json에 남긴다.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import importlib.util
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from chart_utils import DEFAULT_CHART_WIDTH, DEFAULT_TOP_K, WEBGL_POINT_THRESHOLD, apply_render_mode, max_points_for_width
+
+FORMATS = ("html", "json", "png")
+
+
+# =========================
+# 1. 파일 쓰기
+# =========================
+def png_available():
+    # PNG는 kaleido가 설치되어 있을 때만 만든다
+    return importlib.util.find_spec("kaleido") is not None
+
+
+def write_plotlyjs(folder):
+    # --plotlyjs directory: 작업을 나누기 전에 폴더마다 한 번만 저장 (있으면 write_html이 다시 쓰지 않음)
+    from plotly.offline import get_plotlyjs
+    from data_store import temp_path
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, "plotly.min.js")
+    if not os.path.exists(path):
+        tmp = temp_path(path)
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(get_plotlyjs())
+        os.replace(tmp, path)
+
+
+def write_figure(fig, folder, chart_id, formats, plotlyjs):
+    os.makedirs(folder, exist_ok=True)
+    written = []
+    for fmt in formats:
+        path = os.path.join(folder, f"{chart_id}.{fmt}")
+        if fmt == "html":
+            fig.write_html(path, include_plotlyjs=plotlyjs, full_html=True)
+        elif fmt == "json":
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(fig.to_json())
+        else:
+            fig.write_image(path, format="png", scale=2)
+        written.append(path)
+    return written
+
+
+def run_job(source, chart_id, build, folder, options):
+    started = time.perf_counter()
+    result = {"source": source, "chart": chart_id, "files": [], "error": None}
+    try:
+        fig = apply_render_mode(build(), options["webgl_threshold"], chart_id)
+        result["files"] = write_figure(fig, folder, chart_id, options["formats"], options["plotlyjs"])
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+# =========================
+# 2. final_project.py 차트
+# =========================
+# 부모 프로세스에서 데이터를 읽고 탭별 집계까지 끝내 둔 뒤 작업 프로세스에 나눠 준다
+# (fork면 복사 없이 물려받고, fork가 없는 플랫폼은 작업 프로세스마다 init_project에서 한 번만 만든다)
+_project_data = None
+PROJECT_AGGREGATES = ("cube", "region", "group_trend", "overview", "rankings", "disease_trend", "risk")
+
+
+def load_project(backend_name):
+    from project_charts import ProjectData
+    data = ProjectData(backend_name=backend_name)
+    for name in PROJECT_AGGREGATES:
+        try:
+            getattr(data, name)
+        except Exception:
+            # 실패한 집계는 그 집계를 쓰는 차트 작업에서 다시 시도해 차트별 오류로 남긴다
+            pass
+    return data
+
+
+def init_project(backend_name):
+    global _project_data
+    if _project_data is None:
+        _project_data = load_project(backend_name)
+
+
+def project_job(args):
+    chart_id, out, options = args
+    from project_charts import PROJECT_CHARTS
+    init_project(options["backend"])
+    _, _, build = PROJECT_CHARTS[chart_id]
+    return run_job("project", chart_id, lambda: build(_project_data, options["max_points"]), out, options)
+
+
+def project_jobs(args, options):
+    from project_charts import PROJECT_CHARTS
+    charts = args.charts or list(PROJECT_CHARTS)
+    unknown = sorted(set(charts) - set(PROJECT_CHARTS))
+    if unknown:
+        raise SystemExit(f"알 수 없는 차트: {', '.join(unknown)} (가능: {', '.join(PROJECT_CHARTS)})")
+    # 사이드카 변환도 여기서 한 번만 일어난다 (작업 프로세스는 읽기만)
+    init_project(options["backend"])
+    return project_job, [(chart_id, args.out, options) for chart_id in charts], [args.out]
+
+
+# =========================
+# 3. 업로드 대시보드(엑셀) 차트
+# =========================
+# 같은 통합문서의 차트가 연달아 오므로 마지막으로 읽은 통합문서만 보관
+_workbook = (None, None)
+
+
+def read_workbook(path):
+    global _workbook
+    if _workbook[0] != path:
+        from homework_charts import parse_workbook
+        with open(path, "rb") as f:
+            data = f.read()
+        # 이미 차트 단위로 병렬 처리 중이므로 시트 파싱은 순서대로
+        sheets, _ = parse_workbook(data, path, max_workers=1)
+        _workbook = (path, sheets)
+    return _workbook[1]
+
+
+def workbook_job(args):
+    path, chart_id, folder, options = args
+    from homework_charts import HOMEWORK_CHARTS
+    builder = HOMEWORK_CHARTS[chart_id]
+    extra = {}
+    if chart_id == "line":
+        extra["max_points"] = options["max_points"]
+    elif chart_id in ("pie", "pareto"):
+        extra["top_k"] = options["top_k"]
+    return run_job(
+        path, chart_id, lambda: builder(read_workbook(path), options["theme"], **extra), folder, options
+    )
+
+
+def workbook_jobs(args, options):
+    from homework_charts import HOMEWORK_CHARTS
+    jobs = []
+    for path in args.workbooks:
+        folder = os.path.join(args.out, os.path.splitext(os.path.basename(path))[0])
+        jobs.extend((path, chart_id, folder, options) for chart_id in HOMEWORK_CHARTS)
+    return workbook_job, jobs, sorted({job[2] for job in jobs})
+
+
+# =========================
+# 4. 실행
+# =========================
+def run(job, jobs, workers, chunksize=1, initializer=None, initargs=()):
+    workers = min(len(jobs), workers)
+    if workers < 2:
+        return [job(args) for args in jobs]
+    # 부모가 준비한 데이터를 물려받도록 가능하면 fork (이 CLI는 스레드를 띄우지 않음)
+    context = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=initializer, initargs=initargs) as pool:
+        return list(pool.map(job, jobs, chunksize=chunksize))
+
+
+def parse_args(argv=None):
+    # 공통 옵션은 하위 명령 뒤에 쓴다: export_reports.py workbook a.xlsx --out reports --workers 4
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--out", default="reports", help="출력 폴더 (기본: reports)")
+    common.add_argument("--formats", nargs="+", choices=FORMATS, default=["html", "json"])
+    common.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="프로세스 수 (1이면 순서대로)")
+    common.add_argument("--plotlyjs", choices=["directory", "cdn", "inline"], default="directory",
+                        help="HTML의 plotly.js 포함 방식 (directory: 폴더당 한 번만 저장)")
+    common.add_argument("--width", type=int, default=DEFAULT_CHART_WIDTH, help="시계열 다운샘플링 기준 가로 해상도(px)")
+    common.add_argument("--webgl-threshold", type=int, default=WEBGL_POINT_THRESHOLD)
+
+    parser = argparse.ArgumentParser(description="대시보드 차트를 HTML/JSON/PNG로 내보내기")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    project = commands.add_parser("project", parents=[common], help="final_project.py의 모든 탭 차트")
+    project.add_argument("--charts", nargs="+", help="일부 차트만 (기본: 전체)")
+    project.add_argument("--backend", choices=["pandas", "duckdb"], default=os.environ.get("DASHBOARD_BACKEND", "pandas"))
+
+    workbook = commands.add_parser("workbook", parents=[common], help="dashboard_homework.py 형식 엑셀 파일들")
+    workbook.add_argument("workbooks", nargs="+", help=".xlsx/.xls 파일")
+    workbook.add_argument("--theme", default="plotly_dark", choices=["plotly_dark", "plotly", "ggplot2", "seaborn"])
+    workbook.add_argument("--top-k", type=int, default=DEFAULT_TOP_K, help="파레토·파이 상위 K개")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    formats = list(dict.fromkeys(args.formats))
+    if "png" in formats and not png_available():
+        print("⚠️ PNG 내보내기에는 kaleido 패키지가 필요합니다: pip install -U kaleido (PNG 제외)", file=sys.stderr)
+        formats.remove("png")
+    options = {
+        "formats": formats,
+        "plotlyjs": args.plotlyjs if args.plotlyjs != "inline" else True,
+        "max_points": max_points_for_width(args.width),
+        "webgl_threshold": args.webgl_threshold,
+        "backend": getattr(args, "backend", "pandas"),
+        "theme": getattr(args, "theme", None),
+        "top_k": getattr(args, "top_k", DEFAULT_TOP_K),
+    }
+
+    started = time.perf_counter()
+    if args.command == "project":
+        job, jobs, folders = project_jobs(args, options)
+        chunksize, initializer, initargs = 1, init_project, (options["backend"],)
+    else:
+        job, jobs, folders = workbook_jobs(args, options)
+        # 같은 통합문서의 차트는 같은 프로세스로 보내 한 번만 파싱
+        chunksize, initializer, initargs = len(jobs) // len(args.workbooks), None, ()
+    if options["plotlyjs"] == "directory" and "html" in formats:
+        for folder in folders:
+            write_plotlyjs(folder)
+
+    results = run(job, jobs, args.workers, chunksize, initializer, initargs)
+    elapsed = time.perf_counter() - started
+
+    os.makedirs(args.out, exist_ok=True)
+    with open(os.path.join(args.out, "index.json"), "w", encoding="utf-8") as f:
+        json.dump({"command": args.command, "seconds": round(elapsed, 3), "results": results}, f, ensure_ascii=False, indent=2)
+
+    failed = [r for r in results if r["error"]]
+    for r in failed:
+        print(f"❌ {r['source']} / {r['chart']}: {r['error']}", file=sys.stderr)
+    print(f"차트 {len(results) - len(failed)}/{len(results)}개 완료 ({elapsed:.1f}초) → {args.out}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
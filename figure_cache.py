@@ -0,0 +1,39 @@
+import perf
+from cache_utils import LRUCache
+
+
+# =========================
+# 완성된 차트 객체 캐시
+# =========================
+class FigureCache:
+    """(데이터 지문, 차트 ID, 옵션) 단위로 완성된 Plotly Figure를 보관한다.
+
+    적중하면 pandas 집계·px 호출·JSON 역직렬화 없이 같은 Figure 객체를 돌려준다.
+    여러 세션이 같은 객체를 함께 쓰므로 받은 쪽에서 수정하면 안 된다 (st.plotly_chart는 복사본을 직렬화함).
+    """
+
+    def __init__(self, max_entries=64):
+        # 항목 접근은 LRUCache의 잠금 안에서 처리
+        self._cache = LRUCache(max_entries=max_entries)
+
+    @staticmethod
+    def make_key(fingerprint, chart_id, params=None):
+        return (fingerprint, chart_id, tuple(sorted((params or {}).items())))
+
+    def get_or_build(self, fingerprint, chart_id, builder, params=None):
+        key = self.make_key(fingerprint, chart_id, params)
+        fig = self._cache.get(key)
+        if fig is None:
+            perf.count("figure_cache.miss")
+            with perf.span("figure.build"):
+                fig = builder()
+            self._cache.put(key, fig)
+        else:
+            perf.count("figure_cache.hit")
+        return fig
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self):
+        return self._cache.stats()
@@ -1,35 +1,97 @@
 import os
+import re
+import time
 import pandas as pd
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
+import perf
+from data_store import get_registry
+from rollup import RollupCube
+from analytics import top_k, window_growth
+from region import REGION_MEASURES, RegionDimension
+from refresh import REFRESH_SECONDS, RefreshService
+from query_backend import PandasBackend, get_backend
+from figure_cache import FigureCache
+from chart_utils import DEFAULT_CHART_WIDTH, WEBGL_POINT_THRESHOLD, apply_render_mode, max_points_for_width
+# 데이터 경로·집계·차트 빌더는 Streamlit 없이도 쓰도록 분리 (export_reports.py)
+from project_charts import (
+    files, growth_tables, overview_kpis, region_rankings, register_files, risk_frames, top_disease_trend,
+    build_alcohol_figure, build_code_trend_figure, build_disease_trend_figure, build_health_figure,
+    build_org_figure, build_per_capita_figure, build_reg_figure, build_trend_figure
+)
 
 # =========================
 # 1. 데이터 경로 설정
 # =========================
-DATA_PATH = os.path.join(os.path.dirname(__file__), "cleaned")
-
-files = {
-    "등록관리율": os.path.join(DATA_PATH, "등록관리율.csv"),
-    "기관현황": os.path.join(DATA_PATH, "기관현황.csv"),
-    "예산": os.path.join(DATA_PATH, "예산.csv"),
-    "진료정보": os.path.join(DATA_PATH, "진료정보.csv"),
-    "상병그룹": os.path.join(DATA_PATH, "상병그룹.csv"),
-    "주관적건강": os.path.join(DATA_PATH, "주관적건강.csv"),
-    "알코올사망": os.path.join(DATA_PATH, "알코올사망.csv")
-}
+# 파일 경로(files)와 사용 컬럼(columns)은 project_charts.py에 정의
 
 # =========================
-# 2. 캐시 적용된 데이터 로드 함수
+# 2. 공유 데이터 저장소
 # =========================
-@st.cache_data
-def load_csv(path):
+# 모든 세션이 같은 DataFrame을 공유한다 (세션마다 복사본을 만들지 않음)
+@st.cache_resource
+def load_registry():
+    return register_files(get_registry())
+
+def load_csv(name):
     try:
-        return pd.read_csv(path)
+        with perf.span(f"load_csv:{name}"):
+            return load_registry().get(name)
     except Exception as e:
-        st.warning(f"⚠️ {os.path.basename(path)} 로드 실패: {e}")
+        st.warning(f"⚠️ {os.path.basename(files[name])} 로드 실패: {e}")
         return pd.DataFrame()
 
+# 데이터(파일 버전)와 옵션이 같으면 만들어 둔 차트 객체를 재사용한다
+@st.cache_resource
+def load_figure_cache():
+    return FigureCache(max_entries=64)
+
+def cached_figure(chart_id, datasets, builder, **params):
+    fingerprint = load_registry().fingerprint(datasets)
+    params["webgl_threshold"] = webgl_threshold
+    with perf.span(f"chart:{chart_id}"):
+        return load_figure_cache().get_or_build(
+            fingerprint,
+            chart_id,
+            lambda: apply_render_mode(builder(), webgl_threshold, chart_id),
+            params
+        )
+
+# 상병그룹은 원본 행 대신 미리 합산한 롤업 큐브로 조회한다 (세션 간 공유)
+@st.cache_resource
+def load_cube():
+    cube = RollupCube.from_frame(load_csv("상병그룹"))
+
+    # 원본에 행이 추가되면 추가분만 큐브에 더한다
+    def on_refresh(name, kind, rows):
+        if name == "상병그룹":
+            cube.update(rows) if kind == "append" else cube.reset(rows)
+
+    load_registry().subscribe(on_refresh)
+    return cube
+
+# 등록관리율·기관현황·예산·주관적건강을 (연도, 지역코드)로 한 번만 조인한 지역 차원 (세션 간 공유)
+# 네 데이터셋 중 하나라도 갱신되면 버전이 바뀌어 다시 조인한다 (작은 표라 전체 재조인)
+REGION_DATASETS = list(REGION_MEASURES)
+
+@st.cache_resource(max_entries=1)
+def load_region(version=None):
+    return RegionDimension.from_registry(load_csv)
+
+def data_version(datasets):
+    # 화면 캐시 키: 사용하는 데이터셋의 버전만 포함 → 다른 데이터가 갱신되어도 캐시 유지
+    return load_registry().fingerprint(datasets)
+
+# cleaned/ 원본 감시: 추가된 행만 읽어 레지스트리·큐브에 반영 (프로세스당 스레드 하나)
+@st.cache_resource
+def load_refresh():
+    return RefreshService(load_registry()).start()
+
+# 집계 백엔드: 기본은 pandas, DASHBOARD_BACKEND=duckdb면 파일에 직접 SQL 질의 (실패 시 pandas로 대체)
+@st.cache_resource
+def load_backend():
+    pandas_backend = PandasBackend(load_csv, cubes={"상병그룹": load_cube})
+    return get_backend(os.environ.get("DASHBOARD_BACKEND", "pandas"), files, pandas_backend)
+
 # =========================
 # 3. Streamlit 페이지 설정
 # =========================
@@ -39,6 +101,19 @@ st.set_page_config(
     layout="wide"
 )
 
+# 성능 측정: 끄면 구간 기록 호출이 바로 반환된다 (DASHBOARD_PERF=1이면 기본으로 켜짐)
+perf_enabled = st.sidebar.checkbox("⏱️ 성능 측정", value=perf.ENV_ENABLED, key="perf_enabled")
+perf.begin("final_project", perf_enabled)
+
+# 시계열 차트는 가로 해상도에 맞춰 trace당 점 수를 제한한다
+chart_width = st.sidebar.number_input(
+    "차트 가로 해상도(px)", min_value=300, max_value=4000, value=DEFAULT_CHART_WIDTH, step=100
+)
+# 점 개수가 기준을 넘는 차트는 WebGL(Scattergl)로 그린다
+webgl_threshold = st.sidebar.number_input(
+    "WebGL 전환 기준(점 수)", min_value=100, max_value=1_000_000, value=WEBGL_POINT_THRESHOLD, step=1000
+)
+
 # =========================
 # 대시보드 소개 섹션
 # =========================
@@ -79,69 +154,111 @@ st.markdown(
     unsafe_allow_html=True
 )
 
+
+# =========================
+# 4. 공통 KPI 카드
+# =========================
+def kpi_card(title, value, description, color="#FFFFFF"):
+    card_html = f"""
+    <div style="background-color:#1E1E1E; padding:18px; border-radius:12px; text-align:center; 
+                box-shadow:0px 2px 8px rgba(0,0,0,0.3);">
+        <h3 style="color:{color}; font-size:22px; font-weight:700; margin-bottom:6px;">{title}</h3>
+        <p style="color:#A0A0A0; font-size:14px; margin:0 0 10px 0;">{description}</p>
+        <h2 style="color:{color}; font-size:36px; font-weight:900; margin:0;">{value}</h2>
+    </div>
+    """
+    st.markdown(card_html, unsafe_allow_html=True)
+
+# =========================
+# 4-1. 상병그룹 필터 (개요·질환 트렌드 탭 공용)
+# =========================
+def age_order(age):
+    # '0-4세', '65세 이상' 등을 시작 나이 순으로 정렬
+    match = re.match(r"\d+", str(age))
+    return int(match.group()) if match else float("inf")
+
+def save_widget(key):
+    st.session_state[f"saved_{key}"] = st.session_state[key]
+
+def remember(key, default, clean=lambda value: value):
+    # 다른 화면으로 가면 Streamlit이 그려지지 않은 위젯의 값을 지우므로,
+    # 바뀔 때마다 별도 key에 보관했다가 위젯을 다시 그릴 때 되살린다
+    if key not in st.session_state:
+        saved = st.session_state.get(f"saved_{key}")
+        st.session_state[key] = default if saved is None else clean(saved)
+    return {"key": key, "on_change": save_widget, "args": (key,)}
+
+def cube_filters():
+    # 위젯 key를 고정하고 값을 보관해 두 탭(과 다른 화면을 다녀온 뒤)에서 같은 선택이 유지되도록 함
+    cube = load_cube()
+    years = [int(y) for y in cube.dimension_values('진료년도')]
+    lo, hi = min(years), max(years)
+    st.sidebar.subheader("🔎 상병그룹 필터")
+    year_range = st.sidebar.slider(
+        "진료년도", min_value=lo, max_value=hi,
+        **remember("filter_years", (lo, hi), lambda r: (max(r[0], lo), min(r[1], hi)))
+    )
+
+    def multiselect(label, dim, key, sort_key=None):
+        options = sorted(cube.dimension_values(dim), key=sort_key) if sort_key else cube.dimension_values(dim)
+        # 갱신으로 사라진 값은 되살리지 않음
+        restore = lambda values: [v for v in values if v in options]
+        return st.sidebar.multiselect(label, options, **remember(key, [], restore))
+
+    selected = {
+        '성별': multiselect("성별", '성별', "filter_sex"),
+        '연령': multiselect("연령", '연령', "filter_age", age_order),
+        '가입자구분': multiselect("가입자구분", '가입자구분', "filter_kind"),
+        '주상병코드': multiselect("주상병코드", '주상병코드', "filter_code"),
+    }
+    # 선택하지 않은 항목은 전체
+    filters = {dim: tuple(values) for dim, values in selected.items() if values}
+    if tuple(year_range) == (lo, hi):
+        year_range = None
+    return filters, year_range
+
+def filtered_rollup(by, filters, year_range):
+    # 비트맵 인덱스로 조회하고 응답 시간을 함께 돌려줌
+    started = time.perf_counter()
+    result = load_cube().rollup(by, filters, year_range)
+    return result, (time.perf_counter() - started) * 1000
+
+def growth_rate(group_trend, years=5):
+    return window_growth(group_trend['진료실인원(명)'].to_numpy(dtype=float)[None, :], years)[0]
+
 # =========================
-# 4. 탭 구성
+# 4-2. 계열별 성장 지표 (질환×성별×연령, 자치구)
 # =========================
-tabs = st.tabs([
-    "개요",
-    "지역별 서비스 격차",
-    "질환별 진료 트렌드",
-    "위험 요인 및 인식"
-])
+GROWTH_METRICS = ["CAGR(%)", "최근5년 증가율(%)", "연간 기울기"]
+
+GROWTH_DATASETS = ["상병그룹"] + REGION_DATASETS
+
+@st.cache_data(max_entries=4)
+def compute_growth(version):
+    # 모든 계열의 CAGR·증가율·기울기·예측값을 행렬 연산 한 번으로 계산
+    return growth_tables(load_cube(), load_region(data_version(REGION_DATASETS)))
 
 # =====================================================
 # [TAB 1] 개요 탭 (개선 버전)
 # =====================================================
-with tabs[0]:
-    st.header("📌 국내 정신건강 현황 개요")
+OVERVIEW_DATASETS = ["상병그룹", "진료정보", "등록관리율", "예산"]
 
-    # -----------------------------
-    # 1. 데이터 로드
-    # -----------------------------
-    예산 = load_csv(files["예산"])
-    진료정보 = load_csv(files["진료정보"])
-    상병그룹 = load_csv(files["상병그룹"])
-    등록관리율 = load_csv(files["등록관리율"])
+@st.cache_data(max_entries=4)
+def compute_overview(version):
+    # 진료년도는 숫자로 변환된 상태 (pandas: 롤업 큐브 / duckdb: SQL에서 변환)
+    return overview_kpis(load_backend(), load_csv("예산"))
 
-    # -----------------------------
-    # 2. 핵심 지표 계산
-    # -----------------------------
-    try:
-        # 진료년도 전처리 (문자 → 숫자)
-        상병그룹['진료년도'] = (
-            상병그룹['진료년도']
-            .astype(str)
-            .str.replace("년", "", regex=False)
-            .astype(int)
-        )
 
-        # 기간 범위 산출
-        min_year = 상병그룹['진료년도'].min()
-        max_year = 상병그룹['진료년도'].max()
+def render_overview():
+    st.header("📌 국내 정신건강 현황 개요")
 
-        total_patients = 진료정보['진료인원(명)'].sum()
-        top_disease = 진료정보.groupby('주상병명')['진료인원(명)'].sum().idxmax()
-        avg_reg_rate = 등록관리율['추계중증정신질환자수 대비 정신건강복지센터 등록 중증정신질환자'].mean()
-        mental_budget_ratio = 예산['보건 예산 대비 정신건강증진 예산 비중'].iloc[-1]
+    try:
+        with perf.span("개요:KPI"):
+            kpis = compute_overview(data_version(OVERVIEW_DATASETS))
     except KeyError:
         st.error("⚠️ '개요' 탭에 필요한 컬럼명이 일치하지 않습니다.")
         st.stop()
 
-
-    # ========================
-    # KPI 카드 커스텀 스타일
-    # ========================
-    def kpi_card(title, value, description, color="#FFFFFF"):
-        card_html = f"""
-        <div style="background-color:#1E1E1E; padding:18px; border-radius:12px; text-align:center; 
-                    box-shadow:0px 2px 8px rgba(0,0,0,0.3);">
-            <h3 style="color:{color}; font-size:22px; font-weight:700; margin-bottom:6px;">{title}</h3>
-            <p style="color:#A0A0A0; font-size:14px; margin:0 0 10px 0;">{description}</p>
-            <h2 style="color:{color}; font-size:36px; font-weight:900; margin:0;">{value}</h2>
-        </div>
-        """
-        st.markdown(card_html, unsafe_allow_html=True)
-
     # ========================
     # 3. KPI 카드 구성
     # ========================
@@ -149,98 +266,72 @@ with tabs[0]:
     with col1:
         kpi_card(
             title=f"👥 누적 진료 환자 수",
-            value=f"{total_patients:,.0f} 명",
-            description=f"정신질환으로 진료받은 전체 환자 수 ({min_year}~{max_year})"
+            value=f"{kpis['total_patients']:,.0f} 명",
+            description=f"정신질환으로 진료받은 전체 환자 수 ({kpis['min_year']}~{kpis['max_year']})"
         )
     with col2:
         kpi_card(
             title="🧩 가장 많은 정신 질환",
-            value=top_disease,
+            value=kpis['top_disease'],
             description="가장 많이 진료받은 정신 질환명"
         )
     with col3:
         kpi_card(
             title="📈 평균 등록률",
-            value=f"{avg_reg_rate:.1f}%",
+            value=f"{kpis['avg_reg_rate']:.1f}%",
             description="중증정신질환자의 센터 등록률 평균"
         )
     with col4:
         kpi_card(
             title="💰 서울시 예산 비중",
-            value=f"{mental_budget_ratio:.1f}%",
+            value=f"{kpis['mental_budget_ratio']:.1f}%",
             description="보건 예산 대비 정신건강 예산 비중"
         )
     st.markdown("---")
 
     # -----------------------------
-    # 4. 연도별 전체 진료 환자 수 추이
+    # 4. 연도별 전체 진료 환자 수 추이 (사이드바 필터 적용)
     # -----------------------------
-    group_trend = 상병그룹.groupby(['진료년도'])['진료실인원(명)'].sum().reset_index()
-
-    fig_trend = px.line(
-        group_trend,
-        x='진료년도',
-        y='진료실인원(명)',
-        title='연도별 전체 정신질환 진료 환자 수 추이',
-        markers=True,
-        color_discrete_sequence=["#005BAC"]
-    )
-
-    # 데이터 레이블 및 스타일 강화
-    fig_trend.update_traces(
-        line=dict(width=3),
-        text=group_trend['진료실인원(명)'],
-        textposition="top center"
-    )
-    fig_trend.update_layout(
-        title={
-            'text': '연도별 전체 정신질환 진료 환자 수 추이',
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': dict(size=22)
-        },
-        yaxis_title="진료 환자 수",
-        xaxis_title="연도",
-        template="plotly_white"
+    filters, year_range = cube_filters()
+    group_trend = kpis['group_trend']
+    if filters or year_range:
+        group_trend, elapsed_ms = filtered_rollup(['진료년도'], filters, year_range)
+        st.caption(f"필터 적용: {len(group_trend)}개 연도 · 응답 {elapsed_ms:.1f} ms")
+
+    if group_trend.empty:
+        st.warning("선택한 조건에 해당하는 데이터가 없습니다.")
+        return
+
+    fig_trend = cached_figure(
+        "overview_trend",
+        ["상병그룹"],
+        lambda: build_trend_figure(group_trend),
+        filters=tuple(sorted(filters.items())),
+        year_range=year_range
     )
     st.plotly_chart(fig_trend, use_container_width=True)
 
     # -----------------------------
     # 5. 자동 인사이트 추가
     # -----------------------------
-    recent_years = group_trend.tail(5)
-    growth_rate = (
-        (recent_years['진료실인원(명)'].iloc[-1] - recent_years['진료실인원(명)'].iloc[0])
-        / recent_years['진료실인원(명)'].iloc[0]
-    ) * 100
-
     st.info(
-        f"최근 5년간 전체 정신질환 진료 환자 수는 약 **{growth_rate:.1f}%** 증가했습니다. "
+        f"최근 5년간 전체 정신질환 진료 환자 수는 약 **{growth_rate(group_trend):.1f}%** 증가했습니다. "
         f"이는 정신건강 관리 및 예방 정책의 중요성을 시사합니다."
     )
 
 # =====================================================
 # [TAB 2] 지역별 서비스 격차 분석 (개선 버전)
 # =====================================================
-with tabs[1]:
-    st.header("📍 지역별 서비스 격차 분석")
-    등록관리율 = load_csv(files["등록관리율"])
-    기관현황 = load_csv(files["기관현황"])
+@st.cache_data(max_entries=4)
+def compute_region(version):
+    # 상·하위 지역은 지역 차원의 최신 연도 자치구 순위에서 조회
+    return region_rankings(load_region(version))
 
-    # -------------------------
-    # 2-1. 데이터 전처리
-    # -------------------------
-    reg_rate = 등록관리율[['지역명', '추계중증정신질환자수 대비 정신건강복지센터 등록 중증정신질환자']].copy()
-    reg_rate.rename(columns={reg_rate.columns[1]: '등록률'}, inplace=True)
-
-    # 상·하위 5개 지역 추출
-    top5 = reg_rate.sort_values(by='등록률', ascending=False).head(5)
-    bottom5 = reg_rate.sort_values(by='등록률', ascending=True).head(5)
 
-    # 기관 수 데이터
-    org_count = 기관현황[['지역명', '합계']].copy()
-    org_count = org_count[org_count['지역명'] != '서울시']  # 서울시 전체 합계 행 제거
-    org_count = org_count.sort_values(by='합계', ascending=False).reset_index(drop=True)
+def render_region():
+    st.header("📍 지역별 서비스 격차 분석")
+    with perf.span("지역:순위"):
+        top5, bottom5, org_count, per_capita, years = compute_region(data_version(REGION_DATASETS))
 
     # -------------------------
     # 2-2. KPI 카드 구성
@@ -276,124 +367,212 @@ with tabs[1]:
     # -------------------------
     # 2-3. 등록률 상위·하위 5개 지역 시각화
     # -------------------------
-    top_bottom = pd.concat([top5, bottom5])
-
-    fig_reg = px.bar(
-        top_bottom,
-        x='지역명',
-        y='등록률',
-        color='등록률',
-        color_continuous_scale='Blues',
-        title="중증정신질환자 등록률 상위·하위 5개 지역",
-        text='등록률'  # ✅ 막대 위에 등록률 값 표시
-    )
-
-    # 텍스트 포맷 및 스타일 설정
-    fig_reg.update_traces(
-        texttemplate='%{text:.1f}%',  # 소수점 1자리 + % 표시
-        textposition='outside',  # ✅ 막대 위쪽에 레이블 표시
-    )
-
-    fig_reg.update_layout(
-        title=dict(
-            text="중증정신질환자 등록률 상위·하위 5개 지역",
-            font=dict(size=22),
-            x=0.5,  # ✅ 제목 가운데 정렬
-            xanchor='center'
-        ),
-        xaxis=dict(
-            title=dict(text="지역명", font=dict(size=16)),
-            tickfont=dict(size=12, color="#FFFFFF")
-        ),
-        yaxis=dict(
-            title=dict(text="등록률(%)", font=dict(size=16)),
-            tickfont=dict(size=12, color="#FFFFFF")
-        ),
-        plot_bgcolor="#1E1E1E",
-        paper_bgcolor="#1E1E1E",
-        font=dict(color="#FFFFFF")
+    fig_reg = cached_figure(
+        "region_reg_rate",
+        ["등록관리율"],
+        lambda: build_reg_figure(top5, bottom5)
     )
     st.plotly_chart(fig_reg, use_container_width=True)
 
     # -------------------------
     # 2-4. 자치구별 정신건강증진기관 수
     # -------------------------
-    fig_org = px.bar(
-        org_count,
-        x='지역명',
-        y='합계',
-        color='합계',
-        color_continuous_scale='Greens',
-        title='자치구별 정신건강증진기관 수'
-    )
-    fig_org.update_layout(
-        title=dict(
-            text="자치구별 정신건강증진기관 수",
-            font=dict(size=22),
-            x=0.5,
-            xanchor="center"  # ✅ 제목 완벽 가운데 정렬
-        ),
-        title_x=0.5,  # 제목 가운데 정렬
-        xaxis=dict(
-            title=dict(text="지역명", font=dict(size=16)),
-            tickfont=dict(size=12, color="#FFFFFF")
-        ),
-        yaxis=dict(
-            title=dict(text="기관 수", font=dict(size=16)),
-            tickfont=dict(size=12, color="#FFFFFF")
-        ),
-        plot_bgcolor="#1E1E1E",
-        paper_bgcolor="#1E1E1E",
-        font=dict(color="#FFFFFF")
+    fig_org = cached_figure(
+        "region_org_count",
+        ["기관현황"],
+        lambda: build_org_figure(org_count)
     )
     st.plotly_chart(fig_org, use_container_width=True)
 
+    # -------------------------
+    # 2-5. 인구 대비 기관 수 · 센터당 등록환자 수
+    # -------------------------
+    fig_per_capita = cached_figure(
+        "region_per_capita",
+        ["등록관리율", "기관현황"],
+        lambda: build_per_capita_figure(per_capita)
+    )
+    st.plotly_chart(fig_per_capita, use_container_width=True)
+    st.caption(
+        f"기준 연도: 등록률 {years['등록률']}년 · 기관 수 {years['기관 수']}년 · 인구 대비 {years['인구 대비']}년 "
+        f"(막대 색상: 광역·기초 정신건강복지센터 1곳당 등록 중증정신질환자 수)"
+    )
+
+    # -------------------------
+    # 2-6. 등록률 개선 속도 (자치구별 연간 기울기)
+    # -------------------------
+    with perf.span("지역:성장 지표"):
+        _, region_growth = compute_growth(data_version(GROWTH_DATASETS))
+    col_fast, col_slow = st.columns(2)
+    with col_fast:
+        st.subheader("📈 등록률 개선이 빠른 자치구")
+        st.dataframe(top_k(region_growth, "연간 기울기", 5), hide_index=True, use_container_width=True)
+    with col_slow:
+        st.subheader("📉 등록률 개선이 느린 자치구")
+        st.dataframe(top_k(region_growth, "연간 기울기", 5, largest=False), hide_index=True, use_container_width=True)
+
 # =====================================================
 # [TAB 3] 질환별 진료 트렌드 분석
 # =====================================================
-with tabs[2]:
+@st.cache_data(max_entries=4)
+def compute_trend(version):
+    return top_disease_trend(load_backend())
+
+
+def render_trend():
     st.header("🩺 질환별 진료 트렌드")
-    진료정보 = load_csv(files["진료정보"])
-
-    top_diseases = (
-        진료정보
-        .groupby('주상병명')['진료인원(명)']
-        .sum()
-        .sort_values(ascending=False)
-        .head(5)
-        .index.tolist()
-    )
-    trend_df = 진료정보[진료정보['주상병명'].isin(top_diseases)]
-    fig_disease_trend = px.line(
-        trend_df,
-        x='진료년월',
-        y='진료인원(명)',
-        color='주상병명',
-        title="주요 질환별 진료인원 추이"
+    with perf.span("트렌드:상위 질환"):
+        trend_df = compute_trend(data_version(["진료정보"]))
+
+    # 확대 구간: 범위를 좁히면 해당 구간의 원본 데이터를 다시 읽어 그린다
+    periods = sorted(trend_df['진료년월'].unique())
+    x_range = None
+    if len(periods) > 1:
+        x_range = st.select_slider(
+            "확대 구간 (진료년월)", options=periods, value=(periods[0], periods[-1])
+        )
+    max_points = max_points_for_width(chart_width)
+
+    fig_disease_trend = cached_figure(
+        "disease_trend",
+        ["진료정보"],
+        lambda: build_disease_trend_figure(trend_df, x_range, max_points),
+        x_range=x_range,
+        max_points=max_points
     )
     st.plotly_chart(fig_disease_trend, use_container_width=True)
+    st.caption(f"질환별 최대 {max_points:,}개 점으로 표시합니다. 구간을 좁히면 더 촘촘하게 다시 그립니다.")
+
+    # 상병그룹 주상병코드별 연도 추이 (사이드바 필터 적용)
+    filters, year_range = cube_filters()
+    code_trend, elapsed_ms = filtered_rollup(['주상병코드', '진료년도'], filters, year_range)
+    fig_code_trend = cached_figure(
+        "code_trend",
+        ["상병그룹"],
+        lambda: build_code_trend_figure(code_trend),
+        filters=tuple(sorted(filters.items())),
+        year_range=year_range
+    )
+    st.plotly_chart(fig_code_trend, use_container_width=True)
+    st.caption(f"필터 응답 {elapsed_ms:.1f} ms (상병그룹 큐브 인덱스 조회)")
+
+    # 주상병코드×성별×연령 계열 중 가장 빠르게 증가하는 집단
+    st.subheader("🚀 가장 빠르게 증가하는 진료 집단")
+    with perf.span("트렌드:성장 지표"):
+        disease_growth, _ = compute_growth(data_version(GROWTH_DATASETS))
+    col_metric, col_base = st.columns(2)
+    with col_metric:
+        metric = st.selectbox("순위 기준", GROWTH_METRICS, key="growth_metric")
+    with col_base:
+        # 진료 인원이 적은 집단은 증가율이 크게 튀므로 최소 규모로 거름
+        min_patients = st.number_input("최근 진료실인원 최소(명)", min_value=0, value=100, step=50, key="growth_min")
+    candidates = disease_growth[disease_growth['최근값'] >= min_patients].reset_index(drop=True)
+    st.dataframe(top_k(candidates, metric, 10), hide_index=True, use_container_width=True)
+    st.caption(f"{len(disease_growth):,}개 계열(주상병코드×성별×연령) 중 상위 10개")
 
 # =====================================================
 # [TAB 4] 위험 요인 및 정신건강 인식
 # =====================================================
-with tabs[3]:
+RISK_DATASETS = ["알코올사망", "주관적건강"]
+
+@st.cache_data(max_entries=4)
+def compute_risk(version):
+    return risk_frames(load_csv("알코올사망"), load_csv("주관적건강"))
+
+
+def render_risk():
     st.header("⚠️ 위험 요인 및 정신건강 인식")
-    알코올사망 = load_csv(files["알코올사망"])
-    주관적건강 = load_csv(files["주관적건강"])
+    with perf.span("위험요인:데이터"):
+        알코올사망자수, 주관적건강 = compute_risk(data_version(RISK_DATASETS))
 
     col1, col2 = st.columns(2)
-    fig_alcohol = px.line(
-        알코올사망[알코올사망['구분'] == '사망자수'],
-        x='연도',
-        y='계',
-        title='연도별 알코올 관련 사망자수'
+    fig_alcohol = cached_figure(
+        "risk_alcohol",
+        ["알코올사망"],
+        lambda: build_alcohol_figure(알코올사망자수)
     )
     col1.plotly_chart(fig_alcohol, use_container_width=True)
 
-    fig_health = px.line(
-        주관적건강,
-        x='연도',
-        y=['좋은편', '보통', '좋지않은편'],
-        title='서울시민 주관적 정신건강 수준 변화'
+    fig_health = cached_figure(
+        "risk_health",
+        ["주관적건강"],
+        lambda: build_health_figure(주관적건강)
     )
     col2.plotly_chart(fig_health, use_container_width=True)
+
+# =========================
+# 5. 탭 구성
+# =========================
+# st.tabs는 보이지 않는 탭까지 매 실행마다 모두 계산하므로,
+# 선택된 화면 하나만 계산·렌더링하도록 라디오 버튼으로 전환한다
+VIEWS = {
+    "개요": render_overview,
+    "지역별 서비스 격차": render_region,
+    "질환별 진료 트렌드": render_trend,
+    "위험 요인 및 인식": render_risk,
+}
+
+# 데이터 자동 갱신: 감시 스레드가 데이터를 바꾸면 다음 확인 때 이 세션만 다시 실행한다
+# (바뀐 데이터셋을 쓰는 계산·차트만 캐시 키가 달라지므로 나머지는 캐시를 그대로 사용)
+refresh_service = load_refresh()
+st.session_state.setdefault("data_generation", refresh_service.generation)
+
+if REFRESH_SECONDS > 0:
+    @st.fragment(run_every=REFRESH_SECONDS)
+    def watch_updates():
+        if refresh_service.generation != st.session_state["data_generation"]:
+            st.session_state["data_generation"] = refresh_service.generation
+            st.rerun()
+
+    watch_updates()
+
+active_view = st.radio(
+    "화면 선택",
+    list(VIEWS),
+    horizontal=True,
+    label_visibility="collapsed",
+    key="active_view"
+)
+with perf.span(f"view:{active_view}"):
+    VIEWS[active_view]()
+
+# 사이드바: 프로세스 공용 데이터셋의 메모리 사용량 (현재까지 로드된 것만)
+with perf.span("sidebar"), st.sidebar.expander("💾 데이터 메모리 사용량"):
+    memory_report = load_registry().memory_report()
+    st.dataframe(memory_report, use_container_width=True, hide_index=True)
+    st.caption(
+        f"합계 {memory_report['메모리(bytes)'].sum():,} bytes "
+        f"(정규화 전 {memory_report['정규화 전(bytes)'].sum():,} bytes)"
+    )
+    for name in memory_report['데이터셋']:
+        st.markdown(f"**{name}** 컬럼별 dtype 변환")
+        st.dataframe(load_registry().dtype_report(name), use_container_width=True, hide_index=True)
+
+st.sidebar.caption(f"🗄️ 집계 백엔드: {load_backend().name}")
+
+# 사이드바: 최근 증분 갱신 기록
+if refresh_service.history:
+    with st.sidebar.expander("🔄 데이터 갱신 기록"):
+        for item in reversed(refresh_service.history):
+            changes = ", ".join(f"{name}({kind})" for name, kind in item["변경"].items())
+            st.caption(f"{item['시각']} · {changes} · {item['초'] * 1000:,.0f} ms")
+elif REFRESH_SECONDS > 0:
+    st.sidebar.caption(f"🔄 데이터 자동 갱신: {REFRESH_SECONDS:g}초마다 확인")
+
+# 사이드바: 차트 캐시 적중률
+figure_stats = load_figure_cache().stats()
+st.sidebar.caption(
+    f"📈 차트 캐시: 적중 {figure_stats['hits']} · 미스 {figure_stats['misses']} · 저장 {figure_stats['entries']}개"
+)
+
+# 사이드바: 이번 실행의 구간별 시간 / 캐시 적중 / 메모리 변화 (성능 측정을 켠 경우만)
+trace = perf.end()
+if trace is not None:
+    with st.sidebar.expander("⏱️ 이번 실행 성능", expanded=True):
+        st.caption(
+            f"전체 {trace.seconds * 1000:,.1f} ms · 메모리 변화 {(trace.rss_end - trace.rss_start) / 1024 / 1024:+.1f} MB "
+            f"(현재 {trace.rss_end / 1024 / 1024:,.0f} MB)"
+        )
+        st.dataframe(pd.DataFrame(perf.summary(trace)), use_container_width=True, hide_index=True)
+        if trace.counters:
+            st.caption(" · ".join(f"{name} {value}" for name, value in sorted(trace.counters.items())))
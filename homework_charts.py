@@ -0,0 +1,173 @@
+import pandas as pd
+from excel_loader import load_sheets, sheet_names as read_sheet_names
+from chart_utils import DEFAULT_TOP_K, LazyModule, downsample_frame, pareto_frame, top_k_with_others
+
+# plotly는 차트를 처음 그릴 때 import (시작 시간 단축)
+px = LazyModule("plotly.express")
+go = LazyModule("plotly.graph_objects")
+
+# =========================
+# 업로드 대시보드 차트 (Streamlit 없이도 사용: dashboard_homework.py, export_reports.py)
+# =========================
+color_yellow = "#FFCE56"  # 노란색
+color_green  = "#4BC0C0"  # 민트/그린
+color_lime   = "#99FF33"  # 라임
+color_orange = "#FF9F40"  # 오렌지
+color_blue   = "#36A2EB"  # 파랑
+
+required = ["바차트_히스토그램", "시계열차트", "파이차트", "산점도", "파레토차트"]
+# 차트마다 실제로 쓰는 컬럼만 파싱 (이름 또는 위치)
+sheet_columns = {
+    "바차트_히스토그램": ["월", "총 매출"],
+    "시계열차트": [0, 1],
+    "파이차트": [0, 1],
+    "산점도": [0, 1],
+    "파레토차트": [0, 1],
+}
+
+def parse_workbook(data, filename, max_workers=None):
+    # 시트 이름만 먼저 확인하고, 필요한 시트만 병렬로 파싱
+    names = read_sheet_names(data, filename)
+    specs = {name: sheet_columns[name] for name in required if name in names}
+    return load_sheets(data, filename, specs, max_workers), names
+
+# --- Helper functions ---
+def to_datetime_safe(series):
+    try:
+        s = pd.to_datetime(series)
+        return s
+    except Exception:
+        return series
+
+# --- 1) 바차트_히스토그램: 월별 총 매출 ---
+def build_bar_figure(sheets, theme_template):
+    if "바차트_히스토그램" in sheets:
+        df_bar = sheets["바차트_히스토그램"].copy()
+        # 기대 컬럼: 월, 총 매출
+        if "월" in df_bar.columns and "총 매출" in df_bar.columns:
+            df_bar["월"] = to_datetime_safe(df_bar["월"]).dt.strftime("%Y-%m")
+            fig_bar = px.bar(
+                df_bar, x="월", y="총 매출", title="월별 총 매출",
+                template=theme_template, color_discrete_sequence=[color_yellow]
+            )
+            fig_bar.update_traces(hovertemplate="%{x}<br>총 매출: %{y:,}")
+            fig_bar.update_layout(margin=dict(l=10,r=10,t=60,b=10))
+        else:
+            fig_bar = go.Figure().add_annotation(text="'월' 또는 '총 매출' 컬럼이 없습니다.", showarrow=False)
+            fig_bar.update_layout(template=theme_template)
+    else:
+        fig_bar = go.Figure().add_annotation(text="바차트_히스토그램 시트 없음", showarrow=False)
+        fig_bar.update_layout(template=theme_template)
+    return fig_bar
+
+# --- 2) 시계열차트: 첫 두 열 사용 ---
+def build_line_figure(sheets, theme_template, x_range=None, max_points=None):
+    if "시계열차트" in sheets:
+        df_line = sheets["시계열차트"].copy()
+        if df_line.shape[1] >= 2:
+            xcol, ycol = df_line.columns[:2]
+            df_line[xcol] = to_datetime_safe(df_line[xcol])
+            # 확대 구간만 원본에서 잘라 화면 해상도에 맞게 다운샘플링
+            if x_range is not None:
+                df_line = df_line[df_line[xcol].dt.normalize().between(*x_range)]
+            if max_points is not None:
+                df_line = downsample_frame(df_line, xcol, ycol, max_points)
+            df_line[xcol] = df_line[xcol].dt.strftime("%Y-%m")
+            fig_line = px.line(
+                df_line, x=xcol, y=ycol, markers=True, title="시계열 추세",
+                template=theme_template, color_discrete_sequence=[color_green]
+            )
+            fig_line.update_traces(hovertemplate=f"%{{x}}<br>{ycol}: %{{y:,}}")
+            fig_line.update_layout(margin=dict(l=10,r=10,t=60,b=10))
+        else:
+            fig_line = go.Figure().add_annotation(text="시계열차트 시트에 최소 2개 열이 필요합니다.", showarrow=False)
+            fig_line.update_layout(template=theme_template)
+    else:
+        fig_line = go.Figure().add_annotation(text="시계열차트 시트 없음", showarrow=False)
+        fig_line.update_layout(template=theme_template)
+    return fig_line
+
+# --- 3) 파이차트: 첫 열=라벨, 둘째=값 ---
+def build_pie_figure(sheets, theme_template, top_k=DEFAULT_TOP_K):
+    if "파이차트" in sheets:
+        df_pie = sheets["파이차트"]
+        if df_pie.shape[1] >= 2:
+            lcol, vcol = df_pie.columns[:2]
+            df_pie = top_k_with_others(df_pie[lcol], df_pie[vcol], top_k)
+            df_pie = df_pie.drop(columns="others").rename(columns={"label": lcol, "value": vcol})
+            fig_pie = px.pie(
+                df_pie, names=lcol, values=vcol, title="비율 분석",
+                template=theme_template, color_discrete_sequence=[color_yellow, color_green, color_orange, color_blue, color_lime]
+            )
+            fig_pie.update_traces(textposition="inside", insidetextorientation="auto", textinfo="percent+label")
+            fig_pie.update_layout(margin=dict(l=10,r=10,t=60,b=10))
+        else:
+            fig_pie = go.Figure().add_annotation(text="파이차트 시트에 최소 2개 열이 필요합니다.", showarrow=False)
+            fig_pie.update_layout(template=theme_template)
+    else:
+        fig_pie = go.Figure().add_annotation(text="파이차트 시트 없음", showarrow=False)
+        fig_pie.update_layout(template=theme_template)
+    return fig_pie
+
+# --- 4) 산점도: 첫 두 열 사용, 마커 강조 ---
+def build_scatter_figure(sheets, theme_template):
+    if "산점도" in sheets:
+        df_sc = sheets["산점도"].copy()
+        if df_sc.shape[1] >= 2:
+            xsc, ysc = df_sc.columns[:2]
+            fig_scatter = px.scatter(
+                df_sc, x=xsc, y=ysc, title="산점도 분석",
+                template=theme_template, color_discrete_sequence=[color_lime]
+            )
+            fig_scatter.update_traces(marker=dict(size=10, line=dict(width=1.5, color="#FFFFFF")))
+            fig_scatter.update_layout(margin=dict(l=10,r=10,t=60,b=10))
+        else:
+            fig_scatter = go.Figure().add_annotation(text="산점도 시트에 최소 2개 열이 필요합니다.", showarrow=False)
+            fig_scatter.update_layout(template=theme_template)
+    else:
+        fig_scatter = go.Figure().add_annotation(text="산점도 시트 없음", showarrow=False)
+        fig_scatter.update_layout(template=theme_template)
+    return fig_scatter
+
+# --- 5) 파레토: 첫 열=라벨, 둘째=값 + 누적비율 라인 (상위 K개 + 기타) ---
+def build_pareto_figure(sheets, theme_template, top_k=DEFAULT_TOP_K):
+    if "파레토차트" in sheets:
+        df_pa = sheets["파레토차트"]
+        if df_pa.shape[1] >= 2:
+            lcol, vcol = df_pa.columns[:2]
+            dfp, info = pareto_frame(df_pa[lcol], df_pa[vcol], top_k)
+            title = "파레토 차트"
+            if info["cutoff_count"] is not None:
+                title += f" (상위 {info['cutoff_count']:,}개 / {info['categories']:,}개 항목이 {info['cutoff']}%)"
+            bar_colors = [color_blue if others else color_orange for others in dfp["others"]]
+
+            fig_pareto = go.Figure()
+            fig_pareto.add_bar(x=dfp["label"], y=dfp["value"], name="값", marker_color=bar_colors, yaxis="y")
+            fig_pareto.add_trace(go.Scatter(x=dfp["label"], y=dfp["누적비율(%)"], name="누적 비율(%)",
+                                            mode="lines+markers", line=dict(color=color_green, width=2), yaxis="y2"))
+            # 80% 기준선
+            fig_pareto.add_shape(type="line", xref="paper", x0=0, x1=1, yref="y2", y0=info["cutoff"], y1=info["cutoff"],
+                                 line=dict(color=color_yellow, width=1, dash="dash"))
+            fig_pareto.update_layout(
+                template=theme_template, title=title,
+                xaxis=dict(title=lcol, type="category"),
+                yaxis=dict(title="값"),
+                yaxis2=dict(title="누적 비율(%)", overlaying="y", side="right", range=[0, 100]),
+                margin=dict(l=10,r=10,t=60,b=10)
+            )
+        else:
+            fig_pareto = go.Figure().add_annotation(text="파레토차트 시트에 최소 2개 열이 필요합니다.", showarrow=False)
+            fig_pareto.update_layout(template=theme_template)
+    else:
+        fig_pareto = go.Figure().add_annotation(text="파레토차트 시트 없음", showarrow=False)
+        fig_pareto.update_layout(template=theme_template)
+    return fig_pareto
+
+# 차트 ID → 빌더 (build(sheets, theme_template, **options))
+HOMEWORK_CHARTS = {
+    "bar": build_bar_figure,
+    "line": build_line_figure,
+    "pie": build_pie_figure,
+    "scatter": build_scatter_figure,
+    "pareto": build_pareto_figure,
+}
@@ -0,0 +1,239 @@
+import os
+import json
+import time
+import threading
+from functools import wraps
+from collections import defaultdict
+
+# =========================
+# 1. 실행(rerun) 단위 측정 기록
+# =========================
+# DASHBOARD_PERF=1 이면 기본으로 켜짐 (사이드바에서 세션별로 켜고 끌 수 있음)
+# DASHBOARD_PERF_LOG=경로.jsonl  → 실행마다 한 줄씩 JSON 기록
+# DASHBOARD_PERF_PROM=경로.prom  → 프로세스 누적값을 Prometheus 텍스트 형식으로 기록
+ENV_ENABLED = os.environ.get("DASHBOARD_PERF", "") not in ("", "0", "false")
+
+_local = threading.local()
+
+
+def rss_bytes():
+    # 현재 상주 메모리 (리눅스 /proc, 그 외에는 최대 상주 메모리로 대체)
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except (ImportError, OSError):
+        return 0
+
+
+class RunTrace:
+    """한 번의 스크립트 실행 동안의 구간 시간, 카운터, 메모리 변화."""
+
+    def __init__(self, app):
+        self.app = app
+        self.spans = []
+        self.counters = defaultdict(int)
+        self._stack = []
+        self.started = time.perf_counter()
+        self.rss_start = rss_bytes()
+        self.seconds = None
+        self.rss_end = None
+
+    def finish(self):
+        self.seconds = time.perf_counter() - self.started
+        self.rss_end = rss_bytes()
+        return self
+
+    def to_dict(self):
+        return {
+            "app": self.app,
+            "timestamp": time.time(),
+            "seconds": self.seconds,
+            "rss_start": self.rss_start,
+            "rss_end": self.rss_end,
+            "rss_delta": (self.rss_end or 0) - self.rss_start,
+            "spans": self.spans,
+            "counters": dict(self.counters),
+        }
+
+
+class Span:
+    __slots__ = ("trace", "name", "started", "path")
+
+    def __init__(self, trace, name):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        stack = self.trace._stack
+        self.path = "/".join(stack + [self.name])
+        stack.append(self.name)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.started
+        stack = self.trace._stack
+        stack.pop()
+        self.trace.spans.append({"name": self.path, "depth": len(stack), "seconds": elapsed})
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+# =========================
+# 2. 측정 API (꺼져 있으면 스레드 로컬 확인 한 번만 하고 끝)
+# =========================
+def begin(app, enabled=None):
+    enabled = ENV_ENABLED if enabled is None else enabled
+    _local.trace = RunTrace(app) if enabled else None
+    return _local.trace
+
+
+def current():
+    return getattr(_local, "trace", None)
+
+
+def span(name):
+    trace = getattr(_local, "trace", None)
+    if trace is None:
+        return _NOOP
+    return Span(trace, name)
+
+
+def count(name, value=1):
+    trace = getattr(_local, "trace", None)
+    if trace is not None:
+        trace.counters[name] += value
+
+
+def timed(name):
+    # 함수 전체를 하나의 구간으로 기록하는 데코레이터
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            trace = getattr(_local, "trace", None)
+            if trace is None:
+                return fn(*args, **kwargs)
+            with Span(trace, name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def end():
+    trace = getattr(_local, "trace", None)
+    _local.trace = None
+    if trace is None:
+        return None
+    trace.finish()
+    _totals.add(trace)
+    write_log(trace)
+    write_prometheus()
+    return trace
+
+
+# =========================
+# 3. 요약표 / 기록 파일
+# =========================
+def summary(trace):
+    """같은 이름의 구간을 합쳐 (구간, 깊이, 횟수, ms, 비율%) 행 목록으로 만든다."""
+    merged = {}
+    for item in trace.spans:
+        row = merged.setdefault(item["name"], {"구간": item["name"], "깊이": item["depth"], "횟수": 0, "ms": 0.0})
+        row["횟수"] += 1
+        row["ms"] += item["seconds"] * 1000
+    total_ms = (trace.seconds or 0) * 1000
+    rows = sorted(merged.values(), key=lambda r: r["구간"])
+    for row in rows:
+        row["ms"] = round(row["ms"], 2)
+        row["비율(%)"] = round(row["ms"] / total_ms * 100, 1) if total_ms else 0.0
+    return rows
+
+
+class Totals:
+    # 프로세스 전체 누적값 (Prometheus 기록용)
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.runs = defaultdict(lambda: [0, 0.0])
+        self.spans = defaultdict(lambda: [0, 0.0])
+        self.counters = defaultdict(int)
+        self.rss = 0
+
+    def add(self, trace):
+        with self._lock:
+            run = self.runs[trace.app]
+            run[0] += 1
+            run[1] += trace.seconds
+            for item in trace.spans:
+                entry = self.spans[(trace.app, item["name"])]
+                entry[0] += 1
+                entry[1] += item["seconds"]
+            for name, value in trace.counters.items():
+                self.counters[(trace.app, name)] += value
+            self.rss = trace.rss_end
+
+    def prometheus(self):
+        def label(value):
+            return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+        with self._lock:
+            lines = [
+                "# TYPE dashboard_rerun_seconds_total counter",
+                *(f'dashboard_rerun_seconds_total{{app="{label(app)}"}} {total:.6f}'
+                  for app, (_, total) in self.runs.items()),
+                "# TYPE dashboard_rerun_count_total counter",
+                *(f'dashboard_rerun_count_total{{app="{label(app)}"}} {n}' for app, (n, _) in self.runs.items()),
+                "# TYPE dashboard_span_seconds_total counter",
+                *(f'dashboard_span_seconds_total{{app="{label(app)}",span="{label(name)}"}} {total:.6f}'
+                  for (app, name), (_, total) in self.spans.items()),
+                "# TYPE dashboard_span_count_total counter",
+                *(f'dashboard_span_count_total{{app="{label(app)}",span="{label(name)}"}} {n}'
+                  for (app, name), (n, _) in self.spans.items()),
+                "# TYPE dashboard_events_total counter",
+                *(f'dashboard_events_total{{app="{label(app)}",name="{label(name)}"}} {value}'
+                  for (app, name), value in self.counters.items()),
+                "# TYPE dashboard_rss_bytes gauge",
+                f"dashboard_rss_bytes {self.rss}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+_totals = Totals()
+_write_lock = threading.Lock()
+
+
+def write_log(trace, path=None):
+    path = path or os.environ.get("DASHBOARD_PERF_LOG")
+    if not path:
+        return
+    line = json.dumps(trace.to_dict(), ensure_ascii=False)
+    with _write_lock, open(path, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+
+def write_prometheus(path=None):
+    path = path or os.environ.get("DASHBOARD_PERF_PROM")
+    if not path:
+        return
+    text = _totals.prometheus()
+    with _write_lock:
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
@@ -0,0 +1,368 @@
+import os
+from functools import cached_property
+
+import pandas as pd
+
+from analytics import trend_table
+from chart_utils import LazyModule, downsample_frame
+from data_store import get_registry
+from query_backend import PandasBackend, get_backend
+from region import ORGS_PER_100K, PATIENTS_PER_CENTER, RegionDimension, region_columns
+from rollup import RollupCube
+
+# plotly.express는 차트를 처음 그릴 때 import (시작 시간 단축)
+px = LazyModule("plotly.express")
+
+# =========================
+# 1. 데이터 경로 설정
+# =========================
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cleaned")
+
+DATASETS = ["등록관리율", "기관현황", "예산", "진료정보", "상병그룹", "주관적건강", "알코올사망"]
+
+
+def dataset_files(data_path=DATA_PATH):
+    # 같은 파일 구성의 다른 폴더(벤치마크용 합성 데이터 등)도 쓸 수 있게 경로만 바꿔 만든다
+    return {name: os.path.join(data_path, name + ".csv") for name in DATASETS}
+
+
+files = dataset_files()
+
+# 대시보드에서 실제로 사용하는 컬럼 (None이면 전체)
+columns = {
+    "등록관리율": region_columns("등록관리율"),
+    "기관현황": region_columns("기관현황"),
+    "예산": region_columns("예산"),
+    "진료정보": ["주상병명", "진료년월", "진료인원(명)"],
+    "상병그룹": None,
+    "주관적건강": region_columns("주관적건강"),
+    "알코올사망": ["연도", "구분", "계"]
+}
+
+RATE_COL = '추계중증정신질환자수 대비 정신건강복지센터 등록 중증정신질환자'
+
+
+def register_files(registry, data_path=DATA_PATH):
+    for name, path in dataset_files(data_path).items():
+        registry.register(name, path, columns.get(name))
+    return registry
+
+
+# =========================
+# 2. 탭별 집계 (final_project.py의 compute_*와 export_reports.py가 공유)
+# =========================
+def overall_trend(backend):
+    # 연도별 전체 진료 환자 수 (상병그룹만 사용)
+    return backend.group_sum('상병그룹', '진료년도', '진료실인원(명)', order_by_key=True)
+
+
+def overview_kpis(backend, 예산, group_trend=None):
+    if group_trend is None:
+        group_trend = overall_trend(backend)
+
+    return {
+        # 기간 범위 산출
+        "min_year": group_trend['진료년도'].min(),
+        "max_year": group_trend['진료년도'].max(),
+        "total_patients": backend.aggregate('진료정보', '진료인원(명)'),
+        "top_disease": backend.group_sum('진료정보', '주상병명', '진료인원(명)', limit=1)['주상병명'].iloc[0],
+        "avg_reg_rate": backend.aggregate('등록관리율', RATE_COL, 'mean'),
+        "mental_budget_ratio": 예산['보건 예산 대비 정신건강증진 예산 비중'].iloc[-1],
+        "group_trend": group_trend,
+    }
+
+
+def region_rankings(region):
+    # 상·하위 5개 지역 (최신 연도 자치구 순위에서 조회)
+    rate_year = region.latest_year(RATE_COL)
+    top5 = region.top(RATE_COL, 5, rate_year)[['지역명', RATE_COL]].rename(columns={RATE_COL: '등록률'})
+    bottom5 = region.bottom(RATE_COL, 5, rate_year)[['지역명', RATE_COL]].rename(columns={RATE_COL: '등록률'})
+
+    # 기관 수 데이터 (자치구만, 서울시 전체 합계 행 제외)
+    org_year = region.latest_year('합계')
+    org_count = region.ranking('합계', org_year)[['지역명', '합계']].astype({'합계': 'int64'})
+
+    # 인구 10만명당 기관 수 / 센터당 등록환자 수 (지역 차원에서 미리 계산된 파생 지표)
+    per_capita_year = region.latest_year(ORGS_PER_100K)
+    per_capita = region.ranking(ORGS_PER_100K, per_capita_year)[['지역명', ORGS_PER_100K, PATIENTS_PER_CENTER]]
+
+    years = {"등록률": rate_year, "기관 수": org_year, "인구 대비": per_capita_year}
+    return top5, bottom5, org_count, per_capita, years
+
+
+def growth_tables(cube, region):
+    disease_series = cube.rollup(['주상병코드', '진료년도', '성별', '연령'])
+    disease_growth = trend_table(disease_series, ['주상병코드', '성별', '연령'], '진료년도', '진료실인원(명)')
+
+    districts = region.table.reset_index()
+    districts = districts[districts['자치구']]
+    region_growth = trend_table(districts, ['지역명'], '연도', RATE_COL)
+    return disease_growth, region_growth
+
+
+def top_disease_trend(backend, k=5):
+    top_diseases = backend.group_sum('진료정보', '주상병명', '진료인원(명)', limit=k)['주상병명'].tolist()
+    return backend.select(
+        '진료정보', ['주상병명', '진료년월', '진료인원(명)'], where=[('주상병명', 'in', top_diseases)]
+    )
+
+
+def risk_frames(알코올사망, 주관적건강):
+    return 알코올사망[알코올사망['구분'] == '사망자수'], 주관적건강
+
+
+# =========================
+# 3. 차트 빌더
+# =========================
+def build_trend_figure(group_trend):
+    fig_trend = px.line(
+        group_trend,
+        x='진료년도',
+        y='진료실인원(명)',
+        title='연도별 전체 정신질환 진료 환자 수 추이',
+        markers=True,
+        color_discrete_sequence=["#005BAC"]
+    )
+
+    # 데이터 레이블 및 스타일 강화
+    fig_trend.update_traces(
+        line=dict(width=3),
+        text=group_trend['진료실인원(명)'],
+        textposition="top center"
+    )
+    fig_trend.update_layout(
+        title={
+            'text': '연도별 전체 정신질환 진료 환자 수 추이',
+            'x': 0.5,
+            'xanchor': 'center',
+            'font': dict(size=22)
+        },
+        yaxis_title="진료 환자 수",
+        xaxis_title="연도",
+        template="plotly_white"
+    )
+    return fig_trend
+
+
+def build_reg_figure(top5, bottom5):
+    top_bottom = pd.concat([top5, bottom5])
+
+    fig_reg = px.bar(
+        top_bottom,
+        x='지역명',
+        y='등록률',
+        color='등록률',
+        color_continuous_scale='Blues',
+        title="중증정신질환자 등록률 상위·하위 5개 지역",
+        text='등록률'  # ✅ 막대 위에 등록률 값 표시
+    )
+
+    # 텍스트 포맷 및 스타일 설정
+    fig_reg.update_traces(
+        texttemplate='%{text:.1f}%',  # 소수점 1자리 + % 표시
+        textposition='outside',  # ✅ 막대 위쪽에 레이블 표시
+    )
+
+    fig_reg.update_layout(
+        title=dict(
+            text="중증정신질환자 등록률 상위·하위 5개 지역",
+            font=dict(size=22),
+            x=0.5,  # ✅ 제목 가운데 정렬
+            xanchor='center'
+        ),
+        xaxis=dict(
+            title=dict(text="지역명", font=dict(size=16)),
+            tickfont=dict(size=12, color="#FFFFFF")
+        ),
+        yaxis=dict(
+            title=dict(text="등록률(%)", font=dict(size=16)),
+            tickfont=dict(size=12, color="#FFFFFF")
+        ),
+        plot_bgcolor="#1E1E1E",
+        paper_bgcolor="#1E1E1E",
+        font=dict(color="#FFFFFF")
+    )
+    return fig_reg
+
+
+def build_org_figure(org_count):
+    fig_org = px.bar(
+        org_count,
+        x='지역명',
+        y='합계',
+        color='합계',
+        color_continuous_scale='Greens',
+        title='자치구별 정신건강증진기관 수'
+    )
+    fig_org.update_layout(
+        title=dict(
+            text="자치구별 정신건강증진기관 수",
+            font=dict(size=22),
+            x=0.5,
+            xanchor="center"  # ✅ 제목 완벽 가운데 정렬
+        ),
+        title_x=0.5,  # 제목 가운데 정렬
+        xaxis=dict(
+            title=dict(text="지역명", font=dict(size=16)),
+            tickfont=dict(size=12, color="#FFFFFF")
+        ),
+        yaxis=dict(
+            title=dict(text="기관 수", font=dict(size=16)),
+            tickfont=dict(size=12, color="#FFFFFF")
+        ),
+        plot_bgcolor="#1E1E1E",
+        paper_bgcolor="#1E1E1E",
+        font=dict(color="#FFFFFF")
+    )
+    return fig_org
+
+
+def build_per_capita_figure(per_capita):
+    fig_per_capita = px.bar(
+        per_capita,
+        x='지역명',
+        y=ORGS_PER_100K,
+        color=PATIENTS_PER_CENTER,
+        color_continuous_scale='Oranges',
+        hover_data={PATIENTS_PER_CENTER: ':.0f', ORGS_PER_100K: ':.2f'},
+        title='자치구별 인구 10만명당 정신건강증진기관 수'
+    )
+    fig_per_capita.update_layout(
+        title=dict(
+            text="자치구별 인구 10만명당 정신건강증진기관 수",
+            font=dict(size=22),
+            x=0.5,
+            xanchor="center"
+        ),
+        xaxis=dict(
+            title=dict(text="지역명", font=dict(size=16)),
+            tickfont=dict(size=12, color="#FFFFFF")
+        ),
+        yaxis=dict(
+            title=dict(text="인구 10만명당 기관 수", font=dict(size=16)),
+            tickfont=dict(size=12, color="#FFFFFF")
+        ),
+        coloraxis_colorbar=dict(title="센터당 등록환자 수"),
+        plot_bgcolor="#1E1E1E",
+        paper_bgcolor="#1E1E1E",
+        font=dict(color="#FFFFFF")
+    )
+    return fig_per_capita
+
+
+def build_disease_trend_figure(trend_df, x_range=None, max_points=None):
+    # 선택 구간만 잘라 원본에서 다시 다운샘플링 (확대할수록 세밀해짐)
+    if x_range is not None:
+        trend_df = trend_df[trend_df['진료년월'].between(*x_range)]
+    if max_points is not None:
+        trend_df = downsample_frame(trend_df, '진료년월', '진료인원(명)', max_points, color='주상병명')
+
+    fig_disease_trend = px.line(
+        trend_df,
+        x='진료년월',
+        y='진료인원(명)',
+        color='주상병명',
+        title="주요 질환별 진료인원 추이"
+    )
+    return fig_disease_trend
+
+
+def build_code_trend_figure(code_trend):
+    fig_code_trend = px.line(
+        code_trend,
+        x='진료년도',
+        y='진료실인원(명)',
+        color='주상병코드',
+        markers=True,
+        title="주상병코드별 진료실인원 추이 (필터 적용)"
+    )
+    return fig_code_trend
+
+
+def build_alcohol_figure(알코올사망자수):
+    fig_alcohol = px.line(
+        알코올사망자수,
+        x='연도',
+        y='계',
+        title='연도별 알코올 관련 사망자수'
+    )
+    return fig_alcohol
+
+
+def build_health_figure(주관적건강):
+    fig_health = px.line(
+        주관적건강,
+        x='연도',
+        y=['좋은편', '보통', '좋지않은편'],
+        title='서울시민 주관적 정신건강 수준 변화'
+    )
+    return fig_health
+
+
+# =========================
+# 4. Streamlit 없이 쓰는 데이터 묶음 (리포트 내보내기용)
+# =========================
+class ProjectData:
+    """레지스트리·큐브·지역 차원·백엔드를 처음 쓸 때 만들고, 탭별 집계 결과를 보관한다."""
+
+    def __init__(self, registry=None, backend_name="pandas", data_path=DATA_PATH):
+        self.registry = register_files(registry or get_registry(), data_path)
+        self.backend_name = backend_name
+        self.files = dataset_files(data_path)
+
+    def frame(self, name):
+        return self.registry.get(name)
+
+    @cached_property
+    def cube(self):
+        return RollupCube.from_frame(self.frame("상병그룹"))
+
+    @cached_property
+    def region(self):
+        return RegionDimension.from_registry(self.frame)
+
+    @cached_property
+    def backend(self):
+        pandas_backend = PandasBackend(self.frame, cubes={"상병그룹": lambda: self.cube})
+        return get_backend(self.backend_name, self.files, pandas_backend)
+
+    @cached_property
+    def group_trend(self):
+        return overall_trend(self.backend)
+
+    @cached_property
+    def overview(self):
+        return overview_kpis(self.backend, self.frame("예산"), self.group_trend)
+
+    @cached_property
+    def rankings(self):
+        return region_rankings(self.region)
+
+    @cached_property
+    def disease_trend(self):
+        return top_disease_trend(self.backend)
+
+    @cached_property
+    def risk(self):
+        return risk_frames(self.frame("알코올사망"), self.frame("주관적건강"))
+
+
+# 차트 ID → (탭, 사용 데이터셋, 빌더(ProjectData, max_points)). ID는 대시보드 차트 캐시와 같다
+PROJECT_CHARTS = {
+    "overview_trend": ("개요", ["상병그룹"], lambda data, max_points: build_trend_figure(data.group_trend)),
+    "region_reg_rate": ("지역별 서비스 격차", ["등록관리율"], lambda data, max_points: build_reg_figure(*data.rankings[:2])),
+    "region_org_count": ("지역별 서비스 격차", ["기관현황"], lambda data, max_points: build_org_figure(data.rankings[2])),
+    "region_per_capita": (
+        "지역별 서비스 격차", ["등록관리율", "기관현황"], lambda data, max_points: build_per_capita_figure(data.rankings[3])
+    ),
+    "disease_trend": (
+        "질환별 진료 트렌드", ["진료정보"],
+        lambda data, max_points: build_disease_trend_figure(data.disease_trend, max_points=max_points)
+    ),
+    "code_trend": (
+        "질환별 진료 트렌드", ["상병그룹"],
+        lambda data, max_points: build_code_trend_figure(data.cube.rollup(['주상병코드', '진료년도']))
+    ),
+    "risk_alcohol": ("위험 요인 및 인식", ["알코올사망"], lambda data, max_points: build_alcohol_figure(data.risk[0])),
+    "risk_health": ("위험 요인 및 인식", ["주관적건강"], lambda data, max_points: build_health_figure(data.risk[1])),
+}
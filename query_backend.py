@@ -0,0 +1,261 @@
+import os
+import re
+import logging
+
+import pandas as pd
+
+import perf
+from analytics import top_k_indices
+from data_store import SCHEMAS, SIDECAR_ERRORS, is_fresh, pq, sidecar_paths
+
+logger = logging.getLogger(__name__)
+
+# duckdb는 SQL 백엔드를 쓸 때만 import (기본 pandas 백엔드의 시작 시간 단축)
+duckdb = None
+
+
+def import_duckdb():
+    global duckdb
+    if duckdb is None:
+        try:
+            import duckdb as module
+        except ImportError:
+            return None
+        duckdb = module
+    return duckdb
+
+# =========================
+# 1. 조건식 공통 형식
+# =========================
+# where: [(컬럼, 연산자, 값), ...]  연산자는 "==", "!=", "in"
+OPERATORS = ("==", "!=", "in")
+
+
+def check_where(where):
+    for _, op, _ in where or []:
+        if op not in OPERATORS:
+            raise ValueError(f"지원하지 않는 연산자: {op}")
+
+
+# =========================
+# 2. pandas 백엔드 (기본값 / 대체 경로)
+# =========================
+class PandasBackend:
+    """메모리에 올린 DataFrame으로 집계한다. 롤업 큐브가 있는 데이터셋은 큐브에서 합산."""
+
+    name = "pandas"
+
+    def __init__(self, get_frame, cubes=None):
+        self.get_frame = get_frame
+        self.cubes = cubes or {}
+
+    def _filtered(self, dataset, where):
+        check_where(where)
+        df = self.get_frame(dataset)
+        for col, op, value in where or []:
+            if op == "==":
+                df = df[df[col] == value]
+            elif op == "!=":
+                df = df[df[col] != value]
+            else:
+                df = df[df[col].isin(list(value))]
+        return df
+
+    @perf.timed("backend.aggregate")
+    def aggregate(self, dataset, column, func="sum", where=None):
+        return getattr(self._filtered(dataset, where)[column], func)()
+
+    @perf.timed("backend.group_sum")
+    def group_sum(self, dataset, by, measure, where=None, ascending=False, limit=None, order_by_key=False):
+        cube = self.cubes.get(dataset)
+        if cube is not None and not where:
+            result = cube().rollup([by])[[by, measure]]
+        else:
+            result = (
+                self._filtered(dataset, where)
+                .groupby(by, observed=True)[measure]
+                .sum()
+                .reset_index()
+            )
+        if limit is not None and not order_by_key:
+            # 상위/하위 k개만 필요하면 전체 정렬 대신 argpartition
+            keep = top_k_indices(result[measure].to_numpy(dtype=float), limit, largest=not ascending)
+            return result.iloc[keep].reset_index(drop=True)
+        result = result.sort_values(by if order_by_key else measure, ascending=order_by_key or ascending)
+        if limit is not None:
+            result = result.head(limit)
+        return result.reset_index(drop=True)
+
+    @perf.timed("backend.select")
+    def select(self, dataset, columns, where=None, order_by=None, ascending=True, limit=None):
+        result = self._filtered(dataset, where)[list(columns)]
+        if order_by is not None:
+            result = result.sort_values(by=order_by, ascending=ascending)
+        if limit is not None:
+            result = result.head(limit)
+        return result
+
+
+# =========================
+# 3. DuckDB 백엔드 (CSV/Parquet 직접 질의)
+# =========================
+def quote(identifier):
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+
+def sql_where(where):
+    check_where(where)
+    clauses, params = [], []
+    for col, op, value in where or []:
+        if op == "in":
+            values = list(value)
+            if not values:
+                clauses.append("FALSE")
+                continue
+            clauses.append(f"{quote(col)} IN ({', '.join('?' for _ in values)})")
+            params.extend(values)
+        else:
+            clauses.append(f"{quote(col)} {'=' if op == '==' else '<>'} ?")
+            params.append(value)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+# DUCKDB_MEMORY_LIMIT 등으로 받은 값은 SQL에 들어가므로 "숫자+단위"만 허용
+MEMORY_LIMIT_PATTERN = re.compile(r"\d+(\.\d+)?\s*[KMGT]i?B", re.IGNORECASE)
+
+
+class DuckDBBackend:
+    """cleaned/ 파일을 메모리에 올리지 않고 DuckDB로 group-by·필터·top-k를 처리한다.
+
+    결과는 배치 단위로 받아오고, 질의가 실패하면 fallback(pandas) 경로로 다시 계산한다.
+    """
+
+    name = "duckdb"
+
+    def __init__(self, files, fallback=None, memory_limit=None, batch_rows=100_000):
+        self.files = files
+        self.fallback = fallback
+        self.batch_rows = batch_rows
+        memory_limit = memory_limit or os.environ.get("DUCKDB_MEMORY_LIMIT", "1GB")
+        if not MEMORY_LIMIT_PATTERN.fullmatch(memory_limit):
+            raise ValueError(f"DuckDB 메모리 한도 형식이 잘못됨: {memory_limit!r} (예: 512MB, 2GB)")
+        self.con = import_duckdb().connect()
+        self.con.execute(f"SET memory_limit = {self._literal(memory_limit)}")
+
+    def _source(self, dataset):
+        # 최신 Parquet 사이드카가 이미 있으면 사용, 없으면 CSV를 바로 질의
+        # (여기서 사이드카를 만들면 pandas로 파일 전체를 읽게 되어 메모리 밖 처리 의미가 없음)
+        path = self.files[dataset]
+        parquet_path, meta_path = sidecar_paths(path)
+        try:
+            if is_fresh(path, parquet_path, meta_path):
+                return f"read_parquet({self._literal(parquet_path)})"
+        except SIDECAR_ERRORS as e:
+            logger.warning("사이드카 확인 실패, CSV를 직접 읽음: %s (%s)", path, e)
+        return f"read_csv_auto({self._literal(path)}, header = true)"
+
+    @staticmethod
+    def _literal(text):
+        return "'" + str(text).replace("'", "''") + "'"
+
+    def _column_types(self, source):
+        try:
+            rows = self.con.cursor().execute(f"DESCRIBE SELECT * FROM {source}").fetchall()
+        except duckdb.Error:
+            # 파일이 없는 등 오류는 본 질의에서 다시 발생시켜 대체 경로로 넘김
+            return {}
+        return {row[0]: row[1] for row in rows}
+
+    def _sum(self, dataset, column):
+        # 정수 합계는 HUGEINT(Decimal)로 나오므로 BIGINT로 맞춤
+        column_type = self._column_types(self._source(dataset)).get(column, "")
+        if column_type == "INTEGER" or column_type.endswith("INT"):
+            return f"CAST(SUM({quote(column)}) AS BIGINT)"
+        return f"SUM({quote(column)})"
+
+    def _relation(self, dataset):
+        # '2010년' 같은 연도 컬럼은 pandas 경로와 같게 정수로 맞춤
+        source = self._source(dataset)
+        years = SCHEMAS.get(dataset, {}).get("year", [])
+        if years:
+            columns = self._column_types(source)
+            years = [col for col in years if col in columns]
+        if not years:
+            return source
+        replaced = ", ".join(
+            f"CAST(replace(CAST({quote(col)} AS VARCHAR), '년', '') AS SMALLINT) AS {quote(col)}"
+            for col in years
+        )
+        return f"(SELECT * REPLACE ({replaced}) FROM {source})"
+
+    def _fetch(self, sql, params, fallback):
+        try:
+            cursor = self.con.cursor()
+            result = cursor.execute(sql, params)
+            if pq is None:
+                return result.fetchdf()
+            # 결과를 배치 단위로 받아 합침
+            reader = result.fetch_record_batch(self.batch_rows)
+            frames = [batch.to_pandas() for batch in reader]
+            return pd.concat(frames, ignore_index=True) if frames else reader.schema.empty_table().to_pandas()
+        except duckdb.Error as e:
+            if self.fallback is None:
+                raise
+            logger.warning("DuckDB 질의 실패, pandas로 대체: %s", e)
+            return fallback()
+
+    @perf.timed("backend.aggregate")
+    def aggregate(self, dataset, column, func="sum", where=None):
+        clause, params = sql_where(where)
+        if func == "sum":
+            expr = self._sum(dataset, column)
+        else:
+            sql_func = {"mean": "AVG", "min": "MIN", "max": "MAX", "count": "COUNT"}[func]
+            expr = f"{sql_func}({quote(column)})"
+        sql = f"SELECT {expr} AS value FROM {self._relation(dataset)}{clause}"
+        result = self._fetch(
+            sql, params,
+            lambda: pd.DataFrame({"value": [self.fallback.aggregate(dataset, column, func, where)]})
+        )
+        return result["value"].iloc[0]
+
+    @perf.timed("backend.group_sum")
+    def group_sum(self, dataset, by, measure, where=None, ascending=False, limit=None, order_by_key=False):
+        clause, params = sql_where(where)
+        order = f"{quote(by)} ASC" if order_by_key else f"{quote(measure)} {'ASC' if ascending else 'DESC'}"
+        sql = (
+            f"SELECT {quote(by)}, {self._sum(dataset, measure)} AS {quote(measure)} "
+            f"FROM {self._relation(dataset)}{clause} GROUP BY {quote(by)} ORDER BY {order}"
+        )
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return self._fetch(
+            sql, params,
+            lambda: self.fallback.group_sum(dataset, by, measure, where, ascending, limit, order_by_key)
+        )
+
+    @perf.timed("backend.select")
+    def select(self, dataset, columns, where=None, order_by=None, ascending=True, limit=None):
+        clause, params = sql_where(where)
+        sql = f"SELECT {', '.join(quote(c) for c in columns)} FROM {self._relation(dataset)}{clause}"
+        if order_by is not None:
+            sql += f" ORDER BY {quote(order_by)} {'ASC' if ascending else 'DESC'}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return self._fetch(
+            sql, params,
+            lambda: self.fallback.select(dataset, columns, where, order_by, ascending, limit)
+        )
+
+
+# =========================
+# 4. 백엔드 선택
+# =========================
+def get_backend(name, files, pandas_backend):
+    # DASHBOARD_BACKEND=duckdb 이고 duckdb가 설치되어 있을 때만 SQL 백엔드 사용
+    if name == "duckdb":
+        if import_duckdb() is None:
+            logger.warning("duckdb가 설치되어 있지 않아 pandas 백엔드를 사용합니다.")
+        else:
+            return DuckDBBackend(files, fallback=pandas_backend)
+    return pandas_backend
@@ -0,0 +1,61 @@
+import os
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# =========================
+# 1. cleaned/ 폴더 감시 (폴링)
+# =========================
+# DASHBOARD_REFRESH_SECONDS=0 이면 감시하지 않음
+REFRESH_SECONDS = float(os.environ.get("DASHBOARD_REFRESH_SECONDS", "10"))
+
+
+class RefreshService:
+    """레지스트리에 로드된 원본 파일을 주기적으로 확인해 추가된 행만 반영하는 백그라운드 스레드.
+
+    실제 반영은 DatasetRegistry.refresh()가 하고, 여기서는 주기 실행과 최근 변경 기록만 맡는다.
+    """
+
+    def __init__(self, registry, interval=REFRESH_SECONDS):
+        self.registry = registry
+        self.interval = interval
+        self.history = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def generation(self):
+        return self.registry.generation
+
+    def check(self):
+        started = time.perf_counter()
+        changes = self.registry.refresh()
+        if changes:
+            elapsed = time.perf_counter() - started
+            self.history.append({"시각": time.strftime("%H:%M:%S"), "변경": changes, "초": round(elapsed, 3)})
+            # 최근 20건만 보관
+            del self.history[:-20]
+            logger.info("데이터 갱신 %s (%.3fs)", changes, elapsed)
+        return changes
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                # 쓰는 도중인 파일 등은 다음 주기에 다시 시도
+                logger.exception("데이터 갱신 실패")
+
+    def start(self):
+        if self.interval > 0 and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="dashboard-refresh", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+
+# =========================
+# 1. 지역 차원 정의
+# =========================
+# 네 데이터셋이 공유하는 키: (연도, 지역코드). 지역코드가 C로 시작하면 서울시 전체, D는 자치구
+REGION_INDEX = ["연도", "지역코드"]
+CITY_CODE_PREFIX = "C"
+
+# 데이터셋별로 지역 차원에 붙일 측정값
+REGION_MEASURES = {
+    "등록관리율": [
+        "주민등록인구",
+        "정신건강복지센터 등록  중증정신질환자수",
+        "추계중증정신질환자수 대비 정신건강복지센터 등록 중증정신질환자",
+    ],
+    "기관현황": ["합계", "광역정신건강복지센터 수", "기초정신건강복지센터 수"],
+    "예산": ["보건 예산 대비 정신건강증진 예산 비중"],
+    "주관적건강": ["좋은편", "보통", "좋지않은편"],
+}
+
+# 파생 지표 컬럼명
+ORGS_PER_100K = "인구10만명당 기관수"
+PATIENTS_PER_CENTER = "센터당 등록환자수"
+
+
+def region_columns(dataset):
+    # 레지스트리 컬럼 프로젝션용: 키 + 지역명 + 측정값
+    return REGION_INDEX + ["지역명"] + REGION_MEASURES[dataset]
+
+
+def keyed(df, measures):
+    # 데이터셋마다 category 값 목록이 달라서 키는 문자열/정수로 맞춘 뒤 인덱스로 올림
+    frame = df.assign(지역코드=df["지역코드"].astype(str), 연도=df["연도"].astype("int16"))
+    return frame.set_index(REGION_INDEX)[[m for m in measures if m in frame.columns]]
+
+
+# =========================
+# 2. 지역 차원 테이블
+# =========================
+class RegionDimension:
+    """(연도, 지역코드) 인덱스 하나에 지역별 측정값과 파생 지표를 모아 둔 테이블.
+
+    생성 시 한 번만 조인하고, 연도별 조회·순위는 인덱스 슬라이스로 처리한다.
+    """
+
+    def __init__(self, frames):
+        names = []
+        parts = []
+        for dataset, measures in REGION_MEASURES.items():
+            df = frames.get(dataset)
+            if df is None or df.empty:
+                continue
+            names.append(df.assign(지역코드=df["지역코드"].astype(str))[["지역코드", "지역명"]])
+            parts.append(keyed(df, measures))
+
+        table = pd.concat(parts, axis=1, join="outer").sort_index()
+        table = table.loc[:, ~table.columns.duplicated()]
+        # 지역명은 코드별로 하나만 유지
+        names = pd.concat(names).drop_duplicates("지역코드").set_index("지역코드")["지역명"].astype(str)
+        codes = table.index.get_level_values("지역코드")
+        table.insert(0, "지역명", names.reindex(codes).to_numpy())
+        table.insert(1, "자치구", ~codes.str.startswith(CITY_CODE_PREFIX))
+
+        self.table = self._derive(table)
+        self._rankings = {}
+
+    @classmethod
+    def from_registry(cls, get_frame):
+        return cls({dataset: get_frame(dataset) for dataset in REGION_MEASURES})
+
+    @staticmethod
+    def _derive(table):
+        changes = {}
+        if {"합계", "주민등록인구"} <= set(table.columns):
+            changes[ORGS_PER_100K] = table["합계"] / table["주민등록인구"] * 100_000
+        centers = [c for c in ("광역정신건강복지센터 수", "기초정신건강복지센터 수") if c in table.columns]
+        if centers and "정신건강복지센터 등록  중증정신질환자수" in table.columns:
+            # 센터가 없는 지역은 0으로 나누지 않도록 결측 처리
+            center_count = table[centers].sum(axis=1, min_count=1).replace(0, np.nan)
+            changes[PATIENTS_PER_CENTER] = table["정신건강복지센터 등록  중증정신질환자수"] / center_count
+        return table.assign(**changes)
+
+    # -------------------------
+    # 조회
+    # -------------------------
+    @property
+    def years(self):
+        return self.table.index.get_level_values("연도").unique()
+
+    def latest_year(self, measure, districts_only=True):
+        # 해당 측정값이 있는 가장 최근 연도
+        rows = self.table[measure].notna()
+        if districts_only:
+            rows &= self.table["자치구"]
+        years = self.table.index.get_level_values("연도")[rows.to_numpy()]
+        return int(years.max()) if len(years) else None
+
+    def snapshot(self, year, districts_only=True):
+        # 정렬된 MultiIndex에서 연도 구간만 잘라냄 (지역 수에 비례)
+        frame = self.table.xs(year, level="연도")
+        if districts_only:
+            frame = frame[frame["자치구"]]
+        return frame.reset_index()
+
+    def value(self, year, code, measure):
+        return self.table.at[(year, code), measure]
+
+    def series(self, code, measure):
+        return self.table.xs(code, level="지역코드")[measure].dropna()
+
+    def ranking(self, measure, year=None, districts_only=True):
+        # 연도·측정값별 내림차순 순위는 한 번만 정렬해 보관
+        if year is None:
+            year = self.latest_year(measure, districts_only)
+        key = (measure, year, districts_only)
+        if key not in self._rankings:
+            frame = self.snapshot(year, districts_only)
+            frame = frame[frame[measure].notna()]
+            self._rankings[key] = frame.sort_values(measure, ascending=False, kind="stable").reset_index(drop=True)
+        return self._rankings[key]
+
+    def top(self, measure, k=5, year=None, districts_only=True):
+        return self.ranking(measure, year, districts_only).head(k).reset_index(drop=True)
+
+    def bottom(self, measure, k=5, year=None, districts_only=True):
+        ranked = self.ranking(measure, year, districts_only)
+        return ranked.iloc[::-1].head(k).reset_index(drop=True)
@@ -0,0 +1,220 @@
+import numpy as np
+import pandas as pd
+import perf
+from data_store import to_year
+
+# =========================
+# 1. 상병그룹 큐브 정의
+# =========================
+DIMENSIONS = ["주상병코드", "진료년도", "가입자구분", "성별", "연령"]
+MEASURES = ["진료실인원(명)", "진료건수(건)", "총진료비(천원)"]
+
+# 대시보드에서 자주 쓰는 집계는 큐브 생성 시 미리 만들어 둔다
+PRECOMPUTED = [
+    (),
+    ("진료년도",),
+    ("주상병코드", "진료년도"),
+]
+
+
+def dim_key(by):
+    # 차원 순서를 DIMENSIONS 기준으로 고정해 캐시 키로 사용
+    by = set(by)
+    unknown = by - set(DIMENSIONS)
+    if unknown:
+        raise KeyError(f"큐브에 없는 차원: {', '.join(sorted(unknown))}")
+    return tuple(d for d in DIMENSIONS if d in by)
+
+
+def sum_dtypes(*frames):
+    # 합계는 int64/float64로 계산 (int32로 다운캐스트된 원본 컬럼끼리 더하면 넘칠 수 있음)
+    return {
+        m: "float64" if any(pd.api.types.is_float_dtype(f[m]) for f in frames) else "int64"
+        for m in MEASURES
+    }
+
+
+def index_levels(index):
+    return list(index.levels) if isinstance(index, pd.MultiIndex) else [index]
+
+
+def union_categories(merged, *frames):
+    # add()는 범주가 서로 다른 범주형 인덱스를 object로 바꾸므로, 양쪽 범주를 합친 category dtype으로 되돌린다
+    # (범주 합치는 규칙은 data_store.concat_rows와 같아서 전체 재집계와 dtype이 일치)
+    levels = []
+    for i, level in enumerate(index_levels(merged.index)):
+        dtypes = [index_levels(f.index)[i].dtype for f in frames]
+        categories = [d.categories for d in dtypes if isinstance(d, pd.CategoricalDtype)]
+        if categories:
+            union = categories[0]
+            for other in categories[1:]:
+                union = union.union(other)
+            level = level.astype(pd.CategoricalDtype(union))
+        levels.append(level)
+    if isinstance(merged.index, pd.MultiIndex):
+        return merged.set_axis(merged.index.set_levels(levels), axis=0)
+    return merged.set_axis(levels[0], axis=0)
+
+
+def aggregate(df, dims):
+    df = df.astype(sum_dtypes(df))
+    if not dims:
+        total = df[MEASURES].sum().to_frame().T
+        total.index = pd.RangeIndex(1)
+        return total
+    return df.groupby(list(dims), observed=True, sort=True)[MEASURES].sum()
+
+
+# =========================
+# 2. 필터용 인덱스 (비트맵 + 정렬)
+# =========================
+class CubeIndex:
+    """큐브 기본 집계본 위에 만든 필터 인덱스.
+
+    범주형 차원은 값별 비트맵(bool 배열), 진료년도는 정렬 인덱스로 범위를 찾는다.
+    필터 응답은 원본 행이 아니라 큐브 행 수에만 비례한다.
+    """
+
+    def __init__(self, base):
+        frame = base.reset_index()
+        self.size = len(frame)
+        self.values = {}
+        self.codes = {}
+        self.bitmaps = {}
+        for dim in DIMENSIONS:
+            codes, uniques = pd.factorize(frame[dim], sort=True)
+            self.codes[dim] = codes
+            self.values[dim] = np.asarray(uniques)
+            self.bitmaps[dim] = {value: codes == i for i, value in enumerate(self.values[dim])}
+        years = frame["진료년도"].to_numpy()
+        self.year_order = np.argsort(years, kind="stable")
+        self.year_sorted = years[self.year_order]
+        self.measures = {m: frame[m].to_numpy() for m in MEASURES}
+
+    def mask(self, filters=None, year_range=None):
+        mask = np.ones(self.size, dtype=bool)
+        if year_range is not None:
+            lo = np.searchsorted(self.year_sorted, year_range[0], side="left")
+            hi = np.searchsorted(self.year_sorted, year_range[1], side="right")
+            in_range = np.zeros(self.size, dtype=bool)
+            in_range[self.year_order[lo:hi]] = True
+            mask &= in_range
+        for dim, value in (filters or {}).items():
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            selected = np.zeros(self.size, dtype=bool)
+            for v in values:
+                bitmap = self.bitmaps[dim].get(v)
+                if bitmap is not None:
+                    selected |= bitmap
+            mask &= selected
+        return mask
+
+    def aggregate(self, dims, mask):
+        # 선택된 행의 차원 코드를 하나의 그룹 번호로 합쳐 bincount로 합산
+        dims = list(dims)
+        if not dims:
+            return pd.DataFrame({m: [values[mask].sum()] for m, values in self.measures.items()})
+        shape = tuple(len(self.values[d]) for d in dims)
+        group = np.ravel_multi_index(tuple(self.codes[d][mask] for d in dims), shape)
+        size = int(np.prod(shape))
+        counts = np.bincount(group, minlength=size)
+        present = np.flatnonzero(counts)
+        result = {
+            d: self.values[d][idx]
+            for d, idx in zip(dims, np.unravel_index(present, shape))
+        }
+        for m, values in self.measures.items():
+            sums = np.bincount(group, weights=values[mask], minlength=size)
+            result[m] = sums[present].round().astype("int64")
+        return pd.DataFrame(result)
+
+
+# =========================
+# 3. 롤업 큐브
+# =========================
+class RollupCube:
+    """상병그룹 원본 행을 (주상병코드, 진료년도, 가입자구분, 성별, 연령) 단위로 합산한 큐브.
+
+    rollup()은 요청 차원을 포함하는 가장 작은 집계본에서 다시 합산하고, 결과를 보관한다.
+    """
+
+    def __init__(self, base):
+        self.base = base
+        self.cuboids = {dim_key(DIMENSIONS): base}
+        self._index = None
+        for dims in PRECOMPUTED:
+            self._materialize(dims)
+
+    @classmethod
+    def from_frame(cls, df):
+        return cls(aggregate(cls._prepare(df), DIMENSIONS))
+
+    @staticmethod
+    def _prepare(df):
+        df = df[DIMENSIONS + MEASURES]
+        return df.assign(진료년도=to_year(df["진료년도"]))
+
+    def _materialize(self, dims):
+        # update()가 dict를 통째로 바꾸므로 한 번 잡은 dict 안에서만 찾고 저장한다
+        cuboids = self.cuboids
+        if dims in cuboids:
+            return cuboids[dims]
+        # 요청 차원을 모두 포함하는 집계본 중 행 수가 가장 적은 것에서 롤업
+        parents = [c for k, c in list(cuboids.items()) if set(dims) <= set(k)]
+        parent = min(parents, key=len).reset_index()
+        cuboids[dims] = aggregate(parent, dims)
+        return cuboids[dims]
+
+    @property
+    def index(self):
+        # 필터 인덱스는 처음 필터가 걸릴 때 만들고, update()로 base가 바뀌면 다시 만든다
+        # (만든 base와 함께 보관해 갱신 도중 만든 옛 인덱스가 남지 않게 함)
+        base, cached = self.base, self._index
+        if cached is None or cached[0] is not base:
+            cached = (base, CubeIndex(base))
+            self._index = cached
+        return cached[1]
+
+    @perf.timed("cube.rollup")
+    def rollup(self, by=(), filters=None, year_range=None):
+        filters = {dim: value for dim, value in (filters or {}).items() if value is not None}
+        dims = dim_key(by)
+        dim_key(filters)
+        if not filters and year_range is None:
+            return self._materialize(dims).reset_index(drop=not dims)
+
+        # 비트맵·정렬 인덱스로 큐브 행을 고른 뒤 bincount로 합산
+        index = self.index
+        return index.aggregate(dims, index.mask(filters, year_range))
+
+    def dimension_values(self, dim):
+        return list(self.index.values[dim])
+
+    def update(self, new_rows):
+        # 추가된 원본 행만 집계해 각 집계본에 더한다 (전체 재계산 없음)
+        delta = self._prepare(new_rows)
+        cuboids = {}
+        for dims, cuboid in list(self.cuboids.items()):
+            part = aggregate(delta, dims)
+            if dims:
+                merged = union_categories(cuboid.add(part, fill_value=0), cuboid, part).sort_index()
+            else:
+                merged = cuboid + part
+            # fill_value로 float이 된 정수 합계를 되돌린다 (원래 dtype이 아니라 합계용 int64로)
+            cuboids[dims] = merged.astype(sum_dtypes(cuboid, part))
+        self._swap(cuboids)
+        return self
+
+    def reset(self, df):
+        # 원본이 추가가 아닌 방식으로 바뀐 경우: 전체를 다시 집계해 같은 객체에 넣는다 (공유 참조 유지)
+        self._swap(type(self)(aggregate(self._prepare(df), DIMENSIONS)).cuboids)
+        return self
+
+    def _swap(self, cuboids):
+        # 다른 세션이 읽는 중인 집계본은 건드리지 않고, 새로 만든 dict로 한 번에 바꾼다
+        self.base = cuboids[dim_key(DIMENSIONS)]
+        self.cuboids = cuboids
+
+    @property
+    def years(self):
+        return self._materialize(("진료년도",)).index
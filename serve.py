@@ -0,0 +1,141 @@
+"""캐시를 미리 채운 뒤 Streamlit 서버를 띄운다 (새 배포·증설 인스턴스의 첫 요청도 warm 상태로).
+
+    python serve.py                                     # final_project.py
+    python serve.py dashboard_homework.py -- --server.port 8502
+    python serve.py --prewarm-only --report startup.json    # 측정만 하고 종료
+
+1) 앱이 쓰는 모듈을 순서대로 import하며 모듈별 시간을 재고
+2) 앱 스크립트를 화면마다 한 번씩 헤드리스로 실행해 이 프로세스의 st.cache_resource·st.cache_data를 채운 뒤
+3) 같은 프로세스에서 서버를 시작한다 (캐시는 프로세스 단위라 첫 방문자가 그대로 재사용).
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import importlib
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 앱별 import 측정 순서 (앞 모듈이 이미 불러온 의존성은 뒤 모듈 시간에 포함되지 않음)
+APP_IMPORTS = {
+    "final_project.py": [
+        "pandas", "pyarrow.parquet", "streamlit", "data_store", "rollup", "region", "analytics",
+        "query_backend", "figure_cache", "chart_utils", "project_charts", "plotly.express",
+    ],
+    "dashboard_homework.py": [
+        "pandas", "streamlit", "openpyxl", "excel_loader", "upload_cache", "stream_ingest", "figure_cache", "chart_utils",
+        "homework_charts", "plotly.express",
+    ],
+}
+# 화면 전환 라디오 버튼 key (없으면 기본 화면만 실행)
+VIEW_KEYS = {"final_project.py": "active_view"}
+
+
+# =========================
+# 1. import 시간
+# =========================
+def measure_imports(modules):
+    timings = {}
+    for name in modules:
+        started = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            timings[name] = {"error": str(e)}
+            continue
+        timings[name] = round(time.perf_counter() - started, 4)
+    return timings
+
+
+# =========================
+# 2. 캐시 미리 채우기 (화면별 헤드리스 실행)
+# =========================
+def view_errors(app, view):
+    # 예외 메시지만으로는 어느 화면에서 무슨 오류인지 알 수 없어 (예: KeyError의 '주상병명') 화면·예외 종류를 함께 남긴다
+    return [{"view": view, "type": e.proto.type or "Exception", "message": e.value} for e in app.exception]
+
+
+def prewarm(script, timeout=300):
+    """앱을 화면마다 한 번씩 실행한다. 반환: 첫 실행(cold)·재실행(warm)·화면별 소요 시간, 실패한 화면."""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(script, default_timeout=timeout)
+    report = {"views": {}, "errors": []}
+
+    started = time.perf_counter()
+    app.run()
+    report["first_paint_cold"] = round(time.perf_counter() - started, 3)
+
+    key = VIEW_KEYS.get(os.path.basename(script))
+    views = list(app.radio(key=key).options) if key and not app.exception else []
+    report["errors"].extend(view_errors(app, views[0] if views else "(첫 화면)"))
+    for view in views[1:]:
+        started = time.perf_counter()
+        app.radio(key=key).set_value(view).run()
+        report["views"][view] = round(time.perf_counter() - started, 3)
+        report["errors"].extend(view_errors(app, view))
+
+    # 기본 화면을 새 세션으로 다시 실행 → 첫 방문자가 받게 될 시간
+    started = time.perf_counter()
+    AppTest.from_file(script, default_timeout=timeout).run()
+    report["first_paint_warm"] = round(time.perf_counter() - started, 3)
+    return report
+
+
+# =========================
+# 3. 실행
+# =========================
+def serve(script, streamlit_args):
+    from streamlit.web import cli as stcli
+    sys.argv = ["streamlit", "run", script, *streamlit_args]
+    return stcli.main()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="캐시를 미리 채운 뒤 Streamlit 서버 실행")
+    parser.add_argument("script", nargs="?", default="final_project.py", choices=list(APP_IMPORTS))
+    parser.add_argument("--prewarm-only", action="store_true", help="미리 채우기·측정만 하고 종료")
+    parser.add_argument("--no-prewarm", action="store_true", help="측정·미리 채우기 없이 바로 서버 실행")
+    parser.add_argument("--report", help="측정 결과를 JSON으로 저장할 경로")
+    # -- 뒤의 인자는 그대로 streamlit run에 전달
+    argv = sys.argv[1:] if argv is None else list(argv)
+    split = argv.index("--") if "--" in argv else len(argv)
+    args = parser.parse_args(argv[:split])
+    args.streamlit_args = argv[split + 1:]
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    script = os.path.join(BASE_DIR, args.script)
+    if args.no_prewarm:
+        return serve(script, args.streamlit_args)
+
+    # 앱과 같은 기준으로 import·상대 경로가 풀리도록
+    os.chdir(BASE_DIR)
+    sys.path.insert(0, BASE_DIR)
+
+    started = time.perf_counter()
+    report = {"app": args.script, "imports": measure_imports(APP_IMPORTS[args.script])}
+    report["import_seconds"] = round(sum(v for v in report["imports"].values() if isinstance(v, float)), 3)
+    report.update(prewarm(script))
+    report["startup_seconds"] = round(time.perf_counter() - started, 3)
+
+    print(
+        f"🔥 {args.script}: import {report['import_seconds']:.2f}s · 첫 화면 cold {report['first_paint_cold']:.2f}s"
+        f" → warm {report['first_paint_warm']:.2f}s · 준비 {report['startup_seconds']:.2f}s",
+        file=sys.stderr,
+    )
+    for error in report["errors"]:
+        print(f"⚠️ 미리 채우기 실패 화면 [{error['view']}] {error['type']}: {error['message']}", file=sys.stderr)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.prewarm_only:
+        return 0
+    return serve(script, args.streamlit_args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+import os
+import codecs
+import warnings
+
+import numpy as np
+import pandas as pd
+
+import perf
+from chart_utils import label_sums
+
+# pyarrow가 없으면 Parquet 업로드는 받지 않는다 (CSV는 pandas만으로 처리)
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+# =========================
+# 1. 청크 단위 읽기 (CSV / Parquet)
+# =========================
+# 메모리에는 청크 하나와 차트용 집계만 유지한다 (파일 크기와 무관)
+CHUNK_ROWS = 200_000
+SAMPLE_SIZE = 5_000
+STREAM_EXTENSIONS = (".csv", ".parquet")
+
+
+def is_stream_file(filename):
+    return str(filename).lower().endswith(STREAM_EXTENSIONS)
+
+
+def is_parquet(filename):
+    return str(filename).lower().endswith(".parquet")
+
+
+def file_size(source):
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    position = source.tell()
+    source.seek(0, os.SEEK_END)
+    size = source.tell()
+    source.seek(position)
+    return size
+
+
+def iter_chunks(source, filename, columns=None, chunk_rows=CHUNK_ROWS, encoding=None):
+    """(청크 DataFrame, 진행률 0~1)을 차례로 돌려준다. source: 경로 또는 파일 객체."""
+    if is_parquet(filename):
+        if pq is None:
+            raise ImportError("Parquet 파일을 읽으려면 pyarrow가 필요합니다: pip install pyarrow")
+        parquet = pq.ParquetFile(source)
+        total = parquet.metadata.num_rows or 1
+        done = 0
+        for batch in parquet.iter_batches(batch_size=chunk_rows, columns=columns):
+            done += batch.num_rows
+            yield batch.to_pandas(), done / total
+        return
+
+    # 파일 전체 인코딩을 먼저 정해 두고 한 번만 읽는다 (중간에 인코딩을 바꿔 다시 읽으면 집계가 중복됨)
+    encoding = encoding or detect_encoding(source)
+    size = file_size(source) or 1
+    if not isinstance(source, (str, os.PathLike)):
+        source.seek(0)
+    try:
+        with pd.read_csv(source, usecols=columns, chunksize=chunk_rows, encoding=encoding) as reader:
+            for chunk in reader:
+                # 파일 객체는 읽은 위치로 진행률 계산 (경로로 열었으면 행 수만 알 수 있음)
+                position = source.tell() if hasattr(source, "tell") else size
+                yield chunk, min(position / size, 1.0)
+    except UnicodeDecodeError as e:
+        raise ValueError("CSV 인코딩을 알 수 없습니다 (utf-8 / cp949만 지원).") from e
+
+
+def detect_encoding(source, block_size=1 << 20):
+    """utf-8-sig 또는 cp949. 앞부분만 보면 뒤쪽에만 한글이 있는 cp949 파일을 놓치므로 끝까지 디코딩해 본다.
+
+    블록 단위 증분 디코딩이라 메모리는 블록 크기만큼만 쓰고, CSV 파싱보다 훨씬 빠르다.
+    """
+    # 공공데이터 CSV는 cp949가 많음
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    is_path = isinstance(source, (str, os.PathLike))
+    f = open(source, "rb") if is_path else source
+    position = None if is_path else f.tell()
+    try:
+        f.seek(0)
+        for block in iter(lambda: f.read(block_size), b""):
+            decoder.decode(block)
+        decoder.decode(b"", final=True)
+        return "utf-8-sig"
+    except UnicodeDecodeError:
+        return "cp949"
+    finally:
+        if is_path:
+            f.close()
+        else:
+            f.seek(position)
+
+
+def peek(source, filename, rows=1_000):
+    # 열 지정 기본값·미리보기용 앞부분 (매 실행마다 호출되므로 파일 전체 인코딩 검사는 하지 않음)
+    for encoding in ("utf-8-sig", "cp949"):
+        try:
+            for chunk, _ in iter_chunks(source, filename, chunk_rows=rows, encoding=encoding):
+                return chunk
+            return pd.DataFrame()
+        except ValueError:
+            continue
+    raise ValueError("CSV 인코딩을 알 수 없습니다 (utf-8 / cp949만 지원).")
+
+
+# =========================
+# 2. 열 역할 (날짜 / 값 / 범주 / 산점도 x·y)
+# =========================
+ROLE_LABELS = {
+    "date": "날짜 열 (월별 막대·시계열)",
+    "value": "값 열 (합계)",
+    "category": "범주 열 (파이·파레토)",
+    "x": "산점도 x",
+    "y": "산점도 y",
+}
+
+
+def parse_dates(series):
+    # 첫 값으로 형식을 추론해 한 번에 변환하고, 형식이 섞여 실패한 값이 있을 때만 값별 파싱
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    with warnings.catch_warnings():
+        # 날짜가 아닌 열을 검사할 때 나는 형식 추론 경고는 무시
+        warnings.simplefilter("ignore", UserWarning)
+        dates = pd.to_datetime(series, errors="coerce")
+        if dates.isna().sum() > series.isna().sum():
+            dates = pd.to_datetime(series, errors="coerce", format="mixed")
+    return dates
+
+
+def looks_like_date(series):
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return True
+    if pd.api.types.is_numeric_dtype(series):
+        return False
+    values = series.dropna().astype(str).head(200)
+    return len(values) > 0 and parse_dates(values).notna().mean() >= 0.9
+
+
+def detect_roles(sample):
+    """앞부분 표본으로 역할별 기본 열을 고른다 (없으면 None)."""
+    dates = [c for c in sample.columns if looks_like_date(sample[c])]
+    numbers = [c for c in sample.columns if pd.api.types.is_numeric_dtype(sample[c]) and c not in dates]
+    labels = [c for c in sample.columns if c not in dates and c not in numbers]
+    value = "총 매출" if "총 매출" in numbers else (numbers[0] if numbers else None)
+    return {
+        "date": dates[0] if dates else None,
+        "value": value,
+        "category": labels[0] if labels else None,
+        "x": numbers[0] if len(numbers) >= 2 else None,
+        "y": numbers[1] if len(numbers) >= 2 else None,
+    }
+
+
+# =========================
+# 3. 증분 집계기 (update(청크) → 누적)
+# =========================
+def add_sums(total, part):
+    return part if total is None else total.add(part, fill_value=0)
+
+
+class PeriodSum:
+    """날짜를 freq 단위로 잘라 값 합계를 누적 (월별 막대: "M", 시계열: "D")."""
+
+    def __init__(self, date_col, value_col, freq):
+        self.date_col = date_col
+        self.value_col = value_col
+        self.freq = freq
+        self.sums = None
+
+    def update(self, chunk):
+        dates = parse_dates(chunk[self.date_col])
+        values = pd.to_numeric(chunk[self.value_col], errors="coerce")
+        periods = dates.dt.to_period(self.freq)
+        self.sums = add_sums(self.sums, values.groupby(periods).sum())
+
+    def frame(self, x_name, y_name):
+        sums = self.sums.sort_index() if self.sums is not None else pd.Series(dtype=float)
+        return pd.DataFrame({x_name: sums.index.to_timestamp() if len(sums) else [], y_name: sums.to_numpy()})
+
+
+class CategorySum:
+    """범주별 값 합계 (범주 수만큼만 메모리 사용)."""
+
+    def __init__(self, label_col, value_col):
+        self.label_col = label_col
+        self.value_col = value_col
+        self.sums = None
+
+    def update(self, chunk):
+        values = pd.to_numeric(chunk[self.value_col], errors="coerce")
+        self.sums = add_sums(self.sums, label_sums(chunk[self.label_col], values))
+
+    def frame(self):
+        sums = self.sums if self.sums is not None else pd.Series(dtype=float)
+        return pd.DataFrame({self.label_col: sums.index, self.value_col: sums.to_numpy()})
+
+
+class Reservoir:
+    """산점도용 균등 표본 (Algorithm R). 지금까지 본 모든 행이 같은 확률로 표본에 남는다."""
+
+    def __init__(self, x_col, y_col, size=SAMPLE_SIZE, seed=0):
+        self.columns = [x_col, y_col]
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.seen = 0
+        self.sample = np.empty((0, 2))
+
+    def update(self, chunk):
+        rows = chunk[self.columns].apply(pd.to_numeric, errors="coerce").dropna().to_numpy(dtype=float)
+        fill = min(self.size - len(self.sample), len(rows))
+        if fill > 0:
+            self.sample = np.vstack([self.sample, rows[:fill]])
+        rest = rows[fill:]
+        if len(rest):
+            # 전체에서 j번째(0부터) 행은 [0, j] 중 하나를 뽑아 size보다 작으면 그 자리를 교체
+            positions = self.seen + fill + np.arange(len(rest))
+            slots = self.rng.integers(0, positions + 1)
+            keep = slots < self.size
+            self.sample[slots[keep]] = rest[keep]
+        self.seen += len(rows)
+
+    def frame(self):
+        return pd.DataFrame(self.sample, columns=self.columns)
+
+
+# =========================
+# 4. 업로드 한 건 처리
+# =========================
+class StreamIngest:
+    """CSV/Parquet을 청크로 읽으며 다섯 차트용 집계를 갱신한다.
+
+    sheets()는 엑셀 업로드와 같은 시트 이름 → DataFrame 형태라 homework_charts 빌더를 그대로 쓴다.
+    반복(for state in ingest)하면 청크마다 자기 자신을 돌려주므로 중간 결과로 부분 차트를 그릴 수 있다.
+    """
+
+    def __init__(self, source, filename, roles, chunk_rows=CHUNK_ROWS, sample_size=SAMPLE_SIZE):
+        self.source = source
+        self.filename = filename
+        self.roles = roles
+        self.chunk_rows = chunk_rows
+        self.rows = 0
+        self.chunks = 0
+        self.progress = 0.0
+
+        date, value, category, x, y = (roles.get(k) for k in ("date", "value", "category", "x", "y"))
+        self.aggregators = {}
+        if date and value:
+            self.aggregators["바차트_히스토그램"] = PeriodSum(date, value, "M")
+            self.aggregators["시계열차트"] = PeriodSum(date, value, "D")
+        if category and value:
+            self.aggregators["파이차트"] = CategorySum(category, value)
+        if x and y:
+            self.aggregators["산점도"] = Reservoir(x, y, sample_size)
+        self.columns = list(dict.fromkeys(c for c in (date, value, category, x, y) if c))
+
+    def __iter__(self):
+        for chunk, progress in iter_chunks(self.source, self.filename, self.columns or None, self.chunk_rows):
+            with perf.span("stream.chunk"):
+                date = self.roles.get("date")
+                if date in chunk.columns:
+                    # 월별·일별 집계가 같은 날짜 열을 쓰므로 청크마다 한 번만 변환
+                    chunk = chunk.assign(**{date: parse_dates(chunk[date])})
+                for aggregator in self.aggregators.values():
+                    aggregator.update(chunk)
+            self.rows += len(chunk)
+            self.chunks += 1
+            self.progress = progress
+            perf.count("stream.rows", len(chunk))
+            yield self
+        self.progress = 1.0
+
+    def run(self):
+        for _ in self:
+            pass
+        return self
+
+    def sheets(self):
+        value = self.roles.get("value")
+        sheets = {}
+        if "바차트_히스토그램" in self.aggregators:
+            sheets["바차트_히스토그램"] = self.aggregators["바차트_히스토그램"].frame("월", "총 매출")
+            sheets["시계열차트"] = self.aggregators["시계열차트"].frame(self.roles["date"], value)
+        if "파이차트" in self.aggregators:
+            # 파이·파레토는 같은 범주 합계를 공유
+            sheets["파이차트"] = sheets["파레토차트"] = self.aggregators["파이차트"].frame()
+        if "산점도" in self.aggregators:
+            sheets["산점도"] = self.aggregators["산점도"].frame()
+        return sheets
+
+    def result(self):
+        # parse_workbook과 같은 (시트별 DataFrame, 시트 이름 목록) 형태
+        sheets = self.sheets()
+        return sheets, list(sheets)
@@ -0,0 +1,151 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+
+import pandas as pd
+
+import perf
+from cache_utils import LRUCache
+from data_store import SIDECAR_ERRORS, pq
+
+logger = logging.getLogger(__name__)
+
+
+# =========================
+# 업로드 파일 파싱 결과 캐시
+# =========================
+def content_key(data):
+    # 같은 파일이면 누가 올려도 같은 키 (파일 객체가 아니라 내용 기준)
+    return hashlib.sha256(data).hexdigest()
+
+
+def sheets_bytes(value):
+    sheets, _ = value
+    return sum(int(df.memory_usage(index=True, deep=True).sum()) for df in sheets.values())
+
+
+def path_bytes(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+class UploadCache:
+    """업로드 내용 해시 → (시트별 DataFrame, 시트 이름 목록). CSV·Parquet은 차트용 집계 결과를 보관.
+
+    메모리 한도(max_bytes)를 넘으면 LRU로 내보내고, spill_dir이 있으면 시트별 Parquet으로 디스크에 옮겨 두었다가
+    같은 파일이 다시 올라오면 파싱 없이 디스크에서 읽는다. 디스크 쪽도 max_spill_bytes를 넘으면 오래된 것부터 지운다.
+    """
+
+    def __init__(self, max_bytes=512 * 1024 * 1024, spill_dir=None, max_spill_bytes=2048 * 1024 * 1024):
+        # pyarrow가 없으면 디스크로 옮기지 않는다 (임의 객체 pickle은 쓰지 않음)
+        self.spill_dir = spill_dir if pq is not None else None
+        self.max_spill_bytes = max_spill_bytes
+        if self.spill_dir:
+            os.makedirs(self.spill_dir, exist_ok=True)
+        self._cache = LRUCache(max_bytes=max_bytes, sizeof=sheets_bytes, on_evict=self._spill)
+        self.spills = 0
+        self.disk_hits = 0
+
+    def _spill_path(self, key):
+        return os.path.join(self.spill_dir, key)
+
+    def _spill(self, key, value):
+        # 키마다 폴더 하나: 시트별 .parquet + 시트 이름 목록(index.json)
+        if not self.spill_dir:
+            return
+        sheets, names = value
+        path = self._spill_path(key)
+        tmp = f"{path}.{os.getpid()}.{id(value)}.tmp"
+        try:
+            os.makedirs(tmp)
+            files = {}
+            for i, (name, df) in enumerate(sheets.items()):
+                files[name] = f"{i}.parquet"
+                df.to_parquet(os.path.join(tmp, files[name]), engine="pyarrow")
+            with open(os.path.join(tmp, "index.json"), "w", encoding="utf-8") as f:
+                json.dump({"names": names, "files": files}, f, ensure_ascii=False)
+            shutil.rmtree(path, ignore_errors=True)
+            os.replace(tmp, path)
+        except SIDECAR_ERRORS as e:
+            # Arrow로 저장할 수 없는 시트(섞인 타입 등)나 디스크 오류: 디스크에 두지 않고 버린다
+            logger.warning("업로드 캐시 디스크 저장 실패: %s (%s: %s)", key, type(e).__name__, e)
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+        self.spills += 1
+        self._trim_spill()
+
+    def _trim_spill(self):
+        # 디스크 한도를 넘으면 수정 시각이 오래된 항목부터 삭제
+        entries = []
+        for name in os.listdir(self.spill_dir):
+            path = os.path.join(self.spill_dir, name)
+            try:
+                entries.append((os.path.getmtime(path), path_bytes(path), path))
+            except OSError:
+                continue
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_spill_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path):
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _load_spilled(self, key):
+        if not self.spill_dir:
+            return None
+        path = self._spill_path(key)
+        try:
+            with open(os.path.join(path, "index.json"), encoding="utf-8") as f:
+                index = json.load(f)
+            sheets = {name: pd.read_parquet(os.path.join(path, file)) for name, file in index["files"].items()}
+        except SIDECAR_ERRORS:
+            return None
+        # 메모리로 다시 올렸으면 디스크 사본은 지운다 (또 내보내질 때 새로 저장)
+        self._remove(path)
+        return sheets, index["names"]
+
+    def get(self, key):
+        value = self._cache.get(key)
+        if value is None:
+            value = self._load_spilled(key)
+            if value is not None:
+                self.disk_hits += 1
+                self._cache.put(key, value)
+        return value
+
+    def get_or_load(self, data, loader, variant=None):
+        # variant: 같은 파일이라도 해석 방식(CSV 열 지정 등)이 다르면 따로 저장
+        with perf.span("upload.hash"):
+            key = content_key(data)
+            if variant:
+                key = hashlib.sha256(f"{key}:{variant}".encode()).hexdigest()
+        value = self.get(key)
+        if value is None:
+            perf.count("upload_cache.miss")
+            with perf.span("upload.parse"):
+                value = loader()
+            self._cache.put(key, value)
+        else:
+            perf.count("upload_cache.hit")
+        return value
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self):
+        stats = self._cache.stats()
+        stats.update(spills=self.spills, disk_hits=self.disk_hits)
+        return stats